@@ -25,11 +25,14 @@ Usage:
   # Batch (for pipeline integration)
   scores = compute_bean_scores_batch(['AAPL', 'MSFT', 'GOOGL'])
 
+  # Already-fetched inputs, scored in one batched deviation_panel call
+  scores = score_bean_panel([fetch_bean_inputs(t) for t in tickers])
+
   # Full S&P 500 snapshot (for weekly persistence)
   snapshot = weekly_bean_score_snapshot(ticker_list)
 
 Data persistence:
-  - bean_score_history.json: append-only log of weekly snapshots
+  - bean_score_history/: one partition per weekly snapshot (bean_score_history.py)
   - bean_score_latest.json: most recent scores for all tracked tickers
   - bean_score_alerts.json: log of threshold crossings (>2σ events)
 """
@@ -37,13 +40,20 @@ from __future__ import annotations
 
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+import bean_score_history
+import fundamentals_schedule
+from fetch_engine import TokenBucket, run_bounded
+from fundamentals_bundle import get_bundle, set_rate_limiter
+from price_store import bars_to_frame, load_bars
 
 
 class NumpyEncoder(json.JSONEncoder):
@@ -64,10 +74,18 @@ class NumpyEncoder(json.JSONEncoder):
 
 # Where to persist Bean Score data
 DATA_DIR = Path(__file__).parent.parent / 'assets' / 'data'
-HISTORY_FILE = DATA_DIR / 'bean_score_history.json'
 LATEST_FILE = DATA_DIR / 'bean_score_latest.json'
 ALERTS_FILE = DATA_DIR / 'bean_score_alerts.json'
 
+# Batch concurrency: fetch on threads (at most BEAN_REQUEST_RATE Yahoo
+# requests per second across all of them), score on processes.
+BEAN_FETCH_WORKERS = int(os.environ.get('FETCH_WORKERS', '8'))
+BEAN_REQUEST_RATE = float(os.environ.get('BEAN_REQUEST_RATE', '6'))
+BEAN_WORKERS = int(os.environ.get('BEAN_WORKERS', str(os.cpu_count() or 1)))
+
+# Caller-held or stored weekly bars older than this fall back to Yahoo.
+PRICE_MAX_STALENESS_DAYS = 10
+
 
 def _get_quarterly_fcf(ticker_obj) -> Optional[pd.Series]:
     """Extract quarterly Free Cash Flow series from a yfinance Ticker.
@@ -136,32 +154,52 @@ def _get_annual_fcf(ticker_obj) -> Optional[pd.Series]:
     return None
 
 
-def compute_bean_score(ticker: str, verbose: bool = False) -> Optional[dict]:
-    """Compute the Bean Score for a single ticker.
+def _weekly_closes(ticker: str, start_date, prices: Optional[dict]) -> Optional[pd.DataFrame]:
+    """Weekly closes from `start_date` as a tz-naive frame with a 'Close'
+    column, from a caller-held frame or the local price store. None when
+    neither has reasonably current bars for `ticker`."""
+    df = (prices or {}).get(ticker)
+    if df is None:
+        try:
+            bars, meta = load_bars(ticker)
+            if bars is None:
+                return None
+            df = bars_to_frame(bars, meta['tz'])
+        except Exception:
+            return None
+    if isinstance(df, pd.Series):
+        close = df
+    else:
+        col = next((c for c in ('Close', 'close', 'adjusted_close') if c in df.columns), None)
+        if col is None:
+            return None
+        close = df[col]
+    close = close.dropna()
+    if close.index.tz is not None:
+        close.index = close.index.tz_localize(None)
+    if len(close) == 0 or close.index[-1] < pd.Timestamp.now() - pd.Timedelta(days=PRICE_MAX_STALENESS_DAYS):
+        return None
+    return close[close.index >= start_date].to_frame('Close')
 
-    Returns a dict with:
-      - ticker: str
-      - bean_score: float (z-score, positive = unusually cheap)
-      - current_fcf_yield: float (current TTM FCF / market cap, as %)
-      - baseline_fcf_yield: float (yield at last quarterly report price, as %)
-      - deviation_pp: float (current - baseline, in percentage points)
-      - hist_dev_std: float (historical intra-quarter deviation σ, in pp)
-      - hist_dev_mean: float (historical mean deviation, in pp)
-      - ttm_fcf: float (trailing twelve months FCF, in dollars)
-      - n_quarters: int (number of quarterly baselines used)
-      - n_observations: int (number of weekly deviation observations)
-      - last_report_date: str (date of most recent quarterly report)
-      - percentile: float (where current yield sits in 3-year distribution)
-      - velocity_4w: float (change in FCF yield over last 4 weeks, in pp)
-      - velocity_13w: float (change in FCF yield over last 13 weeks, in pp)
-      - sector: str
-      - computed_at: str (ISO timestamp)
 
-    Returns None if insufficient data.
+def fetch_bean_inputs(ticker: str, verbose: bool = False,
+                      prices: Optional[dict] = None) -> Optional[dict]:
+    """Network half of the Bean Score: everything score_bean_inputs needs.
+
+    prices optionally maps ticker -> weekly price frame the caller already
+    holds (update_stocks.py's bars); without one the local price store is
+    tried before Yahoo. Returns a picklable dict, or None if data is short.
     """
-    try:
-        tk = yf.Ticker(ticker)
+    # Statements, .info and the calendar come from the shared bundle
+    # (usually already on disk from this week's stock update); whatever it
+    # has to fetch is written back once, on the way out.
+    with get_bundle(ticker) as tk:
+        return _bean_inputs_from(tk, ticker, verbose, prices)
+
 
+def _bean_inputs_from(tk, ticker: str, verbose: bool,
+                      prices: Optional[dict]) -> Optional[dict]:
+    try:
         # Get quarterly FCF
         fcf_quarterly = _get_quarterly_fcf(tk)
         if fcf_quarterly is None or len(fcf_quarterly) < 4:
@@ -171,14 +209,19 @@ def compute_bean_score(ticker: str, verbose: bool = False) -> Optional[dict]:
 
         fcf_dates = fcf_quarterly.index.tolist()
 
-        # Get weekly price history covering all FCF dates
+        # Get weekly price history covering all FCF dates: the pipeline's
+        # frame if it passed one, else the local price store, else Yahoo.
         start_date = fcf_dates[0] - pd.Timedelta(days=30)
-        hist = tk.history(start=start_date, interval='1wk')
+        hist = _weekly_closes(ticker, start_date, prices)
+        if hist is None:
+            hist = tk.history(start=start_date, interval='1wk')
+            if hist is not None and len(hist):
+                hist.index = hist.index.tz_localize(None)
+                hist = hist.dropna(subset=['Close'])
         if hist is None or len(hist) < 20:
             if verbose:
                 print(f"  {ticker}: insufficient price history")
             return None
-        hist.index = hist.index.tz_localize(None)
 
         # Get shares outstanding
         info = tk.info
@@ -222,52 +265,171 @@ def compute_bean_score(ticker: str, verbose: bool = False) -> Optional[dict]:
         except Exception:
             pass  # Non-critical — continue without earnings dates
 
-        # Build intra-quarter deviation distribution
-        intra_quarter_deviations = []
-        quarter_baselines = []
-
-        for i in range(3, len(fcf_dates)):
-            report_date = fcf_dates[i]
-            ttm_fcf = fcf_quarterly.iloc[i-3:i+1].sum()
-
-            # Find price at report date
-            close_prices = hist['Close']
-            mask = close_prices.index <= report_date
-            if mask.sum() == 0:
-                continue
-
-            baseline_price = float(close_prices[mask].iloc[-1])
-            baseline_mcap = baseline_price * shares
-            if baseline_mcap <= 0:
-                continue
-            baseline_fcf_yield = ttm_fcf / baseline_mcap
-
-            # Next report date boundary
-            if i + 1 < len(fcf_dates):
-                next_report = fcf_dates[i + 1]
-            else:
-                next_report = hist.index[-1]
+        return {
+            'ticker': ticker,
+            'fcf_quarterly': fcf_quarterly,
+            'hist': hist[['Close']],
+            'shares': shares,
+            'sector': info.get('sector', 'Unknown'),
+            'next_earnings_date': next_earnings_date,
+            'earnings_history': earnings_history,
+        }
 
-            # Weekly prices during this inter-quarter period
-            period_mask = (close_prices.index > report_date) & \
-                          (close_prices.index <= next_report)
-            period_prices = close_prices[period_mask]
+    except Exception as e:
+        if verbose:
+            print(f"  {ticker}: error — {e}")
+        return None
 
-            if len(period_prices) == 0:
-                continue
 
-            # FCF yield at each weekly price (FCF fixed at TTM value)
-            period_yields = ttm_fcf / (period_prices * shares)
-            deviations = (period_yields - baseline_fcf_yield) * 100  # pp
+def deviation_panel(dates, closes, report_dates, ttm, shares) -> dict:
+    """Intra-quarter FCF yield deviations for a panel of tickers in one pass.
+
+    dates         (T,)   datetime64 weekly bar dates, ascending, shared grid
+    closes        (T, N) weekly closes, NaN where a ticker has no bar
+    report_dates  (Q, N) report dates with a full TTM behind them, ascending
+                         per column, NaT-padded at the end
+    ttm           (Q, N) TTM FCF as of each report date
+    shares        (N,)   shares outstanding
+
+    Quarter q of a ticker covers bars in (report_q, report_q+1], the last
+    one running to the ticker's final bar; its baseline is the last close
+    on or before report_q. Report dates are placed on the grid once with
+    searchsorted and a cumulative count assigns every bar its quarter, so
+    there are no per-quarter masks.
+
+    Returns a dict:
+      deviation       (T, N) pp from the quarter's baseline yield, NaN outside
+                             a usable quarter
+      baseline_price  (Q, N) NaN where there is no close on/before the report
+      baseline_yield  (Q, N) TTM FCF / baseline market cap (fraction)
+      used            (Q, N) baseline is usable and the quarter has >= 1 bar
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    closes = np.asarray(closes, dtype=float)
+    report_dates = np.asarray(report_dates, dtype='datetime64[ns]')
+    ttm = np.asarray(ttm, dtype=float)
+    shares = np.asarray(shares, dtype=float)
+    T, N = closes.shape
+    Q = report_dates.shape[0]
+    cols = np.arange(N)
+
+    # Grid rows on or before each report date (T for padding).
+    has_report = ~np.isnat(report_dates)
+    pos = np.where(has_report, np.searchsorted(dates, report_dates, side='right'), T)
+
+    # Quarter of each bar: how many reports precede its row, minus one.
+    marks = np.zeros((T + 1, N), dtype=np.int64)
+    np.add.at(marks, (pos, np.broadcast_to(cols, pos.shape)), 1)
+    quarter = np.cumsum(marks, axis=0)[:T] - 1
+
+    # Baseline: the ticker's last actual bar on or before the report.
+    valid = ~np.isnan(closes)
+    last_valid = np.maximum.accumulate(
+        np.where(valid, np.arange(T)[:, None], -1), axis=0)
+    base_row = np.where(pos > 0, last_valid[np.clip(pos - 1, 0, max(T - 1, 0)), cols], -1)
+    base_row = np.where(has_report, base_row, -1)
+    baseline_price = np.where(base_row >= 0, closes[np.clip(base_row, 0, None), cols], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        baseline_mcap = baseline_price * shares
+        usable_q = baseline_mcap > 0
+        baseline_yield = np.where(usable_q, ttm / baseline_mcap, np.nan)
+
+        q = np.clip(quarter, 0, max(Q - 1, 0))
+        in_quarter = (quarter >= 0) & valid & usable_q[q, cols]
+        deviation = np.where(
+            in_quarter,
+            (ttm[q, cols] / (closes * shares) - baseline_yield[q, cols]) * 100,
+            np.nan)
+
+    counts = np.zeros((Q, N), dtype=np.int64)
+    np.add.at(counts, (q[in_quarter], np.broadcast_to(cols, q.shape)[in_quarter]), 1)
+
+    return {
+        'deviation': deviation,
+        'baseline_price': baseline_price,
+        'baseline_yield': baseline_yield,
+        'used': usable_q & (counts > 0),
+    }
 
-            intra_quarter_deviations.extend(deviations.tolist())
 
-            quarter_baselines.append({
-                'date': report_date,
-                'ttm_fcf': float(ttm_fcf),
-                'baseline_price': baseline_price,
-                'baseline_yield': float(baseline_fcf_yield * 100),
-            })
+def _panel_arrays(batch: list[dict]) -> tuple:
+    """Stack fetch_bean_inputs() dicts onto the union of their weekly dates."""
+    stamps = [pd.DatetimeIndex(x['hist'].index).as_unit('ns').asi8 for x in batch]
+    grid = np.unique(np.concatenate(stamps))
+    closes = np.full((len(grid), len(batch)), np.nan)
+    n_reports = [max(len(x['fcf_quarterly']) - 3, 0) for x in batch]
+    Q = max(n_reports + [1])
+    reports = np.full((Q, len(batch)), np.datetime64('NaT'), dtype='datetime64[ns]')
+    ttm = np.full((Q, len(batch)), np.nan)
+    for n, x in enumerate(batch):
+        closes[np.searchsorted(grid, stamps[n]), n] = x['hist']['Close'].to_numpy(dtype=float)
+        if n_reports[n]:
+            fcf = x['fcf_quarterly']
+            reports[:n_reports[n], n] = pd.DatetimeIndex(fcf.index[3:]).as_unit('ns').asi8
+            ttm[:n_reports[n], n] = np.lib.stride_tricks.sliding_window_view(
+                fcf.to_numpy(dtype=float), 4).sum(axis=1)
+    shares = np.array([float(x['shares']) for x in batch])
+    return grid.view('datetime64[ns]'), closes, reports, ttm, shares
+
+
+def score_bean_panel(batch: list[dict], verbose: bool = False) -> list[Optional[dict]]:
+    """Score many fetch_bean_inputs() dicts with one deviation_panel call.
+
+    Returns one entry per input, in order (None where score_bean_inputs
+    would return None).
+    """
+    if not batch:
+        return []
+    try:
+        arrays = _panel_arrays(batch)
+        panel = deviation_panel(*arrays)
+    except Exception as e:
+        if len(batch) == 1:
+            if verbose:
+                print(f"  {batch[0]['ticker']}: error — {e}")
+            return [None]
+        # One malformed input shouldn't sink the batch.
+        return [score_bean_panel([x], verbose)[0] for x in batch]
+    ttm = arrays[3]
+
+    results = []
+    for n, inputs in enumerate(batch):
+        dev = panel['deviation'][:, n]
+        fcf_dates = inputs['fcf_quarterly'].index.tolist()
+        quarter_baselines = [{
+            'date': fcf_dates[q + 3],
+            'ttm_fcf': float(ttm[q, n]),
+            'baseline_price': float(panel['baseline_price'][q, n]),
+            'baseline_yield': float(panel['baseline_yield'][q, n] * 100),
+        } for q in np.flatnonzero(panel['used'][:, n])]
+        results.append(_finish_bean_score(inputs, dev[~np.isnan(dev)],
+                                          quarter_baselines, verbose))
+    return results
+
+
+def score_bean_inputs(inputs: dict, verbose: bool = False) -> Optional[dict]:
+    """Pure-math half of the Bean Score; no network, safe in a worker process.
+
+    Takes fetch_bean_inputs() output and returns the score dict described in
+    compute_bean_score, or None if the deviation history is too thin or the
+    data fails the quality gates. A one-ticker score_bean_panel.
+    """
+    return score_bean_panel([inputs], verbose)[0]
+
+
+def _finish_bean_score(inputs: dict, intra_quarter_deviations: np.ndarray,
+                       quarter_baselines: list[dict],
+                       verbose: bool = False) -> Optional[dict]:
+    """Bean Score, percentile, velocities and chart for one ticker, given its
+    deviation history and usable quarterly baselines from deviation_panel."""
+    ticker = inputs['ticker']
+    try:
+        fcf_quarterly = inputs['fcf_quarterly']
+        fcf_dates = fcf_quarterly.index.tolist()
+        hist = inputs['hist']
+        shares = inputs['shares']
+        next_earnings_date = inputs['next_earnings_date']
+        earnings_history = inputs['earnings_history']
 
         if len(intra_quarter_deviations) < 8 or len(quarter_baselines) < 2:
             if verbose:
@@ -277,7 +439,7 @@ def compute_bean_score(ticker: str, verbose: bool = False) -> Optional[dict]:
             return None
 
         # Historical deviation statistics
-        dev_array = np.array(intra_quarter_deviations)
+        dev_array = intra_quarter_deviations
         dev_mean = float(dev_array.mean())
         dev_std = float(dev_array.std())
 
@@ -381,7 +543,7 @@ def compute_bean_score(ticker: str, verbose: bool = False) -> Optional[dict]:
             'percentile': round(percentile, 1),
             'velocity_4w': round(velocity_4w, 4),
             'velocity_13w': round(velocity_13w, 4),
-            'sector': info.get('sector', 'Unknown'),
+            'sector': inputs['sector'],
             'computed_at': datetime.utcnow().isoformat(),
             'quarterly_chart': quarterly_chart[-4:],  # Last 4 quarters
             'next_earnings_date': next_earnings_date,
@@ -394,25 +556,90 @@ def compute_bean_score(ticker: str, verbose: bool = False) -> Optional[dict]:
         return None
 
 
+def compute_bean_score(ticker: str, verbose: bool = False,
+                       prices: Optional[dict] = None) -> Optional[dict]:
+    """Compute the Bean Score for a single ticker.
+
+    Returns a dict with:
+      - ticker: str
+      - bean_score: float (z-score, positive = unusually cheap)
+      - current_fcf_yield: float (current TTM FCF / market cap, as %)
+      - baseline_fcf_yield: float (yield at last quarterly report price, as %)
+      - deviation_pp: float (current - baseline, in percentage points)
+      - hist_dev_std: float (historical intra-quarter deviation σ, in pp)
+      - hist_dev_mean: float (historical mean deviation, in pp)
+      - ttm_fcf: float (trailing twelve months FCF, in dollars)
+      - n_quarters: int (number of quarterly baselines used)
+      - n_observations: int (number of weekly deviation observations)
+      - last_report_date: str (date of most recent quarterly report)
+      - percentile: float (where current yield sits in 3-year distribution)
+      - velocity_4w: float (change in FCF yield over last 4 weeks, in pp)
+      - velocity_13w: float (change in FCF yield over last 13 weeks, in pp)
+      - sector: str
+      - computed_at: str (ISO timestamp)
+
+    Returns None if insufficient data.
+    """
+    inputs = fetch_bean_inputs(ticker, verbose=verbose, prices=prices)
+    if inputs is None:
+        return None
+    return score_bean_inputs(inputs, verbose=verbose)
+
+
 def compute_bean_scores_batch(tickers: list[str],
-                              verbose: bool = False) -> list[dict]:
+                              verbose: bool = False,
+                              prices: Optional[dict] = None,
+                              workers: Optional[int] = None) -> list[dict]:
     """Compute Bean Scores for a list of tickers.
 
+    Two stages: inputs are fetched on a thread pool with a shared limit on
+    Yahoo requests (network bound), then scored in batched deviation_panel
+    calls, chunks fanned out across a process pool (CPU bound). prices is
+    passed through to fetch_bean_inputs. Order follows `tickers`.
+
     Returns list of score dicts (skipping tickers with insufficient data).
     """
-    results = []
     total = len(tickers)
-    for i, ticker in enumerate(tickers):
-        if verbose and (i + 1) % 25 == 0:
-            print(f"  [{i+1}/{total}] Processing {ticker}...")
-        score = compute_bean_score(ticker, verbose=verbose)
-        if score is not None:
-            results.append(score)
-    return results
+    done = [0]
+
+    def _progress(i, ticker, result, error):
+        done[0] += 1
+        if verbose and done[0] % 25 == 0:
+            print(f"  [{done[0]}/{total}] fetched {ticker}...")
+
+    # Throttle Yahoo requests, not tickers: most inputs come from the
+    # fundamentals cache and price store and should not wait for a token.
+    set_rate_limiter(TokenBucket(rate=BEAN_REQUEST_RATE, burst=BEAN_FETCH_WORKERS))
+    try:
+        fetched = run_bounded(
+            lambda t: fetch_bean_inputs(t, verbose=verbose, prices=prices),
+            tickers, workers=BEAN_FETCH_WORKERS, on_done=_progress)
+    finally:
+        set_rate_limiter(None)
+    inputs = [r for r, err in fetched if err is None and r is not None]
+    fundamentals_schedule.print_summary()
+
+    # Score in panels: one deviation_panel call per chunk, chunks spread
+    # over worker processes when the batch is big enough to pay for them.
+    workers = workers or BEAN_WORKERS
+    if workers <= 1 or len(inputs) < 2 * workers:
+        scored = score_bean_panel(inputs, verbose)
+    else:
+        size = max(1, -(-len(inputs) // (workers * 4)))
+        chunks = [inputs[i:i + size] for i in range(0, len(inputs), size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                scored = [r for chunk in pool.map(score_bean_panel, chunks, [verbose] * len(chunks))
+                          for r in chunk]
+        except (OSError, BrokenProcessPool) as e:
+            print(f"  ⚠ Process pool unavailable ({e}); scoring serially")
+            scored = score_bean_panel(inputs, verbose)
+    return [r for r in scored if r is not None]
 
 
 def weekly_bean_score_snapshot(tickers: list[str],
-                               verbose: bool = False) -> dict:
+                               verbose: bool = False,
+                               prices: Optional[dict] = None) -> dict:
     """Generate a full weekly snapshot and persist to disk.
 
     This is meant to be called from the weekly pipeline (update_stocks.py)
@@ -420,12 +647,12 @@ def weekly_bean_score_snapshot(tickers: list[str],
 
     Persists:
       - bean_score_latest.json: current scores for all tickers
-      - bean_score_history.json: append-only weekly snapshots
+      - bean_score_history/: this week's partition (bean_score_history.py)
       - bean_score_alerts.json: append-only log of >2σ events
 
     Returns the snapshot dict.
     """
-    scores = compute_bean_scores_batch(tickers, verbose=verbose)
+    scores = compute_bean_scores_batch(tickers, verbose=verbose, prices=prices)
 
     snapshot_date = datetime.utcnow().strftime('%Y-%m-%d')
     snapshot = {
@@ -440,32 +667,18 @@ def weekly_bean_score_snapshot(tickers: list[str],
     with open(LATEST_FILE, 'w') as f:
         json.dump(snapshot, f, cls=NumpyEncoder, indent=2)
 
-    # Append to history (one entry per week)
-    history = []
-    if HISTORY_FILE.exists():
-        try:
-            with open(HISTORY_FILE) as f:
-                history = json.load(f)
-        except (json.JSONDecodeError, ValueError):
-            history = []
-
-    # Compact history entry: just ticker → bean_score mapping + date
+    # Append to history: one partition per week, nothing else rewritten.
+    # Compact entry: just ticker → bean_score mapping + date
     # Includes current_price for tracking actual returns after signals
-    compact = {
-        'date': snapshot_date,
-        'scores': {s['ticker']: {
-            'bean_score': s['bean_score'],
-            'current_fcf_yield': s['current_fcf_yield'],
-            'baseline_fcf_yield': s['baseline_fcf_yield'],
-            'deviation_pp': s['deviation_pp'],
-            'hist_dev_std': s['hist_dev_std'],
-            'velocity_13w': s['velocity_13w'],
-            'price': s.get('current_price'),
-        } for s in scores}
-    }
-    history.append(compact)
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, cls=NumpyEncoder)
+    bean_score_history.append_week(snapshot_date, {s['ticker']: {
+        'bean_score': s['bean_score'],
+        'current_fcf_yield': s['current_fcf_yield'],
+        'baseline_fcf_yield': s['baseline_fcf_yield'],
+        'deviation_pp': s['deviation_pp'],
+        'hist_dev_std': s['hist_dev_std'],
+        'velocity_13w': s['velocity_13w'],
+        'price': s.get('current_price'),
+    } for s in scores})
 
     # Log alerts (>2σ or <-2σ events)
     alerts = []
@@ -532,10 +745,7 @@ def load_latest_scores() -> Optional[dict]:
 
 def load_score_history() -> list[dict]:
     """Load the full Bean Score history from disk."""
-    if HISTORY_FILE.exists():
-        with open(HISTORY_FILE) as f:
-            return json.load(f)
-    return []
+    return bean_score_history.load_history()
 
 
 def load_alerts() -> list[dict]:
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Bean Score history store — one append-only partition per weekly snapshot.
+
+bean_score_history.json used to be a single JSON array that every run
+loaded in full, appended one week to and rewrote (several MB and growing),
+and that bean_score_levels.py and bean_score_tracking.py re-parsed just to
+count weeks or walk the snapshots. Here each week is its own file:
+
+  assets/data/bean_score_history/
+    index.json                  sidecar: fields + one entry per week
+                                {date, file, rows}, oldest first
+    weeks/YYYY-MM-DD.jsonl      one line per ticker, in snapshot order:
+                                {"ticker": "AAPL", "bean_score": ..., ...}
+    weeks/YYYY-MM-DD.offsets.json   ticker -> byte offset into the .jsonl
+
+Writing a week touches only that week's files and the small index. Readers
+pick what they need:
+
+  n_weeks() / weeks()                   index only
+  load_week(date)                       one partition
+  iter_history(start, end)              snapshots in a date range, streamed
+  load_history(start, end)              the same as a list (legacy shape:
+                                        [{'date', 'scores': {ticker: row}}])
+  ticker_series(ticker, start, end)     one ticker, one seek per week
+
+Re-running a week replaces that week's partition rather than adding a
+duplicate snapshot.
+
+Migration: the first time the store is opened without an index, an
+existing bean_score_history.json is split into partitions. The old writer
+appended a snapshot per run, so a re-run week could appear twice; the store
+keeps one snapshot per date (the later one, as a re-run week does now) and
+the migration reports how many it dropped. The legacy file is left in place and no longer
+updated; export_legacy() regenerates it on demand for the dashboard copy.
+
+Usage:
+    python bean_score_history.py info
+    python bean_score_history.py migrate
+    python bean_score_history.py export PATH
+    python bean_score_history.py ticker AAPL [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent.parent / 'assets' / 'data'
+STORE_DIR = DATA_DIR / 'bean_score_history'
+INDEX_FILE = STORE_DIR / 'index.json'
+WEEKS_DIR = STORE_DIR / 'weeks'
+LEGACY_FILE = DATA_DIR / 'bean_score_history.json'
+
+# Columns of the compact weekly entry written by weekly_bean_score_snapshot.
+FIELDS = [
+    'bean_score', 'current_fcf_yield', 'baseline_fcf_yield', 'deviation_pp',
+    'hist_dev_std', 'velocity_13w', 'price',
+]
+
+FORMAT_VERSION = 1
+
+
+def _default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ── Index ────────────────────────────────────────────────────────────────────
+
+def _read_index() -> Optional[dict]:
+    try:
+        with open(INDEX_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _index() -> dict:
+    """The store's index, migrating the legacy JSON array on first use."""
+    index = _read_index()
+    if index is None:
+        if LEGACY_FILE.exists():
+            migrate_legacy()
+            index = _read_index()
+        if index is None:
+            index = {'version': FORMAT_VERSION, 'fields': FIELDS, 'weeks': []}
+    return index
+
+
+def weeks() -> list[str]:
+    """Snapshot dates in the store, oldest first."""
+    return [w['date'] for w in _index()['weeks']]
+
+
+def n_weeks() -> int:
+    return len(_index()['weeks'])
+
+
+# ── Write ────────────────────────────────────────────────────────────────────
+
+def _write_week(index: dict, date: str, scores: dict) -> None:
+    lines, offsets, pos = [], {}, 0
+    for ticker in scores:
+        line = json.dumps({'ticker': ticker, **scores[ticker]},
+                          separators=(',', ':'), default=_default) + '\n'
+        offsets[ticker] = pos
+        pos += len(line.encode())
+        lines.append(line)
+    name = f"{date}.jsonl"
+    _write_atomic(WEEKS_DIR / name, ''.join(lines))
+    _write_atomic(WEEKS_DIR / f"{date}.offsets.json",
+                  json.dumps(offsets, separators=(',', ':')))
+    entry = {'date': date, 'file': name, 'rows': len(lines)}
+    kept = [w for w in index['weeks'] if w['date'] != date]
+    index['weeks'] = sorted(kept + [entry], key=lambda w: w['date'])
+
+
+def append_week(date: str, scores: dict) -> None:
+    """Store one weekly snapshot (ticker -> compact row), replacing any
+    snapshot already stored for `date`."""
+    index = _index()
+    _write_week(index, date, scores)
+    _write_atomic(INDEX_FILE, json.dumps(index, indent=1))
+
+
+def migrate_legacy(path: Optional[Path] = None) -> int:
+    """Split a legacy bean_score_history.json array (LEGACY_FILE by default)
+    into weekly partitions. Returns the number of weeks written."""
+    path = path or LEGACY_FILE
+    with open(path) as f:
+        history = json.load(f)
+    index = {'version': FORMAT_VERSION, 'fields': FIELDS, 'weeks': [],
+             'migrated_from': path.name}
+    by_date = {}
+    for entry in history:
+        by_date[entry['date']] = entry.get('scores', {})   # later entry wins
+    for date, scores in by_date.items():
+        _write_week(index, date, scores)
+    _write_atomic(INDEX_FILE, json.dumps(index, indent=1))
+    print(f"  ✓ Migrated {len(history)} Bean Score snapshots "
+          f"({len(by_date)} weeks) from {path.name} to {STORE_DIR.name}/")
+    dropped = len(history) - len(by_date)
+    if dropped:
+        repeated = sorted(d for d, n in Counter(e['date'] for e in history).items() if n > 1)
+        print(f"  ⚠ Dropped {dropped} repeated snapshot(s), keeping the later one for "
+              f"{len(repeated)} date(s): {', '.join(repeated)}")
+    return len(by_date)
+
+
+# ── Read ─────────────────────────────────────────────────────────────────────
+
+def _row(line: str) -> tuple[str, dict]:
+    row = json.loads(line)
+    return row.pop('ticker'), row
+
+
+def _selected(start: Optional[str], end: Optional[str]) -> list[dict]:
+    return [w for w in _index()['weeks']
+            if (start is None or w['date'] >= start) and (end is None or w['date'] <= end)]
+
+
+def load_week(date: str) -> dict:
+    """ticker -> compact row for one snapshot ({} if not stored)."""
+    path = WEEKS_DIR / f"{date}.jsonl"
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return dict(_row(line) for line in f if line.strip())
+
+
+def iter_history(start: Optional[str] = None,
+                 end: Optional[str] = None) -> Iterator[dict]:
+    """Snapshots with start <= date <= end, oldest first, one at a time."""
+    for w in _selected(start, end):
+        yield {'date': w['date'], 'scores': load_week(w['date'])}
+
+
+def load_history(start: Optional[str] = None, end: Optional[str] = None) -> list[dict]:
+    """Snapshots in the legacy list-of-dicts shape."""
+    return list(iter_history(start, end))
+
+
+def ticker_series(ticker: str, start: Optional[str] = None,
+                  end: Optional[str] = None) -> list[dict]:
+    """One ticker's rows, oldest first, as {'date', **row}. Reads one line
+    per week via the offsets sidecar instead of whole partitions."""
+    series = []
+    for w in _selected(start, end):
+        try:
+            with open(WEEKS_DIR / f"{w['date']}.offsets.json") as f:
+                offset = json.load(f).get(ticker)
+        except (OSError, ValueError):
+            offset = None
+        if offset is None:
+            continue
+        with open(WEEKS_DIR / w['file'], 'rb') as f:
+            f.seek(offset)
+            _, row = _row(f.readline().decode())
+        series.append({'date': w['date'], **row})
+    return series
+
+
+def export_legacy(path: Optional[Path] = None) -> int:
+    """Write the whole store as a legacy bean_score_history.json array (for
+    the dashboard's static copy). Returns the number of weeks written."""
+    path = path or LEGACY_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    n = 0
+    with open(tmp, 'w') as f:
+        f.write('[')
+        for snap in iter_history():
+            if n:
+                f.write(', ')
+            json.dump(snap, f, default=_default)
+            n += 1
+        f.write(']')
+    os.replace(tmp, path)
+    return n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Bean Score history store')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('info', help='Weeks and rows in the store')
+    sub.add_parser('migrate', help=f'Rebuild the store from {LEGACY_FILE.name}')
+    p_exp = sub.add_parser('export', help='Write the legacy JSON array')
+    p_exp.add_argument('path', nargs='?', default=str(LEGACY_FILE))
+    p_tk = sub.add_parser('ticker', help="Print one ticker's series")
+    p_tk.add_argument('symbol')
+    p_tk.add_argument('--start')
+    p_tk.add_argument('--end')
+    args = parser.parse_args()
+
+    if args.cmd == 'migrate':
+        if not LEGACY_FILE.exists():
+            print(f"ERROR: {LEGACY_FILE} not found.")
+            sys.exit(1)
+        migrate_legacy()
+    elif args.cmd == 'export':
+        n = export_legacy(Path(args.path))
+        print(f"  ✓ Exported {n} weeks to {args.path}")
+    elif args.cmd == 'ticker':
+        for row in ticker_series(args.symbol.upper(), args.start, args.end):
+            print(json.dumps(row))
+    else:
+        index = _index()
+        ws = index['weeks']
+        print(f"{len(ws)} weeks in {STORE_DIR}")
+        if ws:
+            print(f"  Date range: {ws[0]['date']} to {ws[-1]['date']}")
+            print(f"  Rows in latest: {ws[-1]['rows']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -38,9 +38,10 @@ from typing import Optional
 
 import numpy as np
 
+import bean_score_history
+
 DATA_DIR = Path(__file__).parent.parent / 'assets' / 'data'
 LATEST_FILE = DATA_DIR / 'bean_score_latest.json'
-HISTORY_FILE = DATA_DIR / 'bean_score_history.json'
 STOCKS_FILE = DATA_DIR / 'stocks.json'
 OUTPUT_FILE = DATA_DIR / 'bean_score_display.json'
 
@@ -145,13 +146,10 @@ def generate_bean_score_display(verbose: bool = False) -> dict:
 
     # Count weekly history snapshots for tracking progress
     history_weeks = 0
-    if HISTORY_FILE.exists():
-        try:
-            with open(HISTORY_FILE) as f:
-                history = json.load(f)
-            history_weeks = len(history)
-        except Exception:
-            pass
+    try:
+        history_weeks = bean_score_history.n_weeks()
+    except Exception:
+        pass
 
     if verbose:
         print(f"Loaded {len(scores)} Bean Scores, {len(shares_map)} share counts, {history_weeks} history weeks")
@@ -6,7 +6,8 @@ Tracks what happens to stock prices AFTER Bean Score signals trigger.
 This is the backtesting/validation layer for the Bean Score system.
 
 How it works:
-  1. Reads bean_score_history.json (weekly snapshots of scores)
+  1. Reads the weekly Bean Score snapshots (bean_score_history.py store)
+     once into dense week x ticker score and price matrices
   2. Detects "signal events" — when a stock crosses a σ threshold
   3. Tracks subsequent price changes at various horizons (1w, 4w, 13w, 26w)
   4. Computes win rates and average returns per signal type
@@ -45,8 +46,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
+import bean_score_history
+from rounding import round_half_even
+
 DATA_DIR = Path(__file__).parent.parent / 'assets' / 'data'
-HISTORY_FILE = DATA_DIR / 'bean_score_history.json'
 STOCKS_FILE = DATA_DIR / 'stocks.json'
 OUTPUT_FILE = DATA_DIR / 'bean_score_tracking.json'
 
@@ -75,152 +80,180 @@ def classify_signal(score: float) -> Optional[str]:
     return None
 
 
-def detect_signal_events(history: list) -> list:
-    """Detect threshold crossings from weekly Bean Score history.
-
-    A signal event is recorded when a stock crosses INTO a threshold zone
-    (wasn't there the previous week, is there this week).
-
-    Returns list of:
-      {ticker, signal_type, entry_date, entry_score, entry_index}
-    """
-    events = []
-
-    if len(history) < 2:
-        return events
+# Longest trajectory followed after a signal (weeks)
+MAX_TRACK_WEEKS = 52
 
-    for i in range(1, len(history)):
-        prev_snapshot = history[i - 1]
-        curr_snapshot = history[i]
-        curr_date = curr_snapshot['date']
-        prev_scores = prev_snapshot.get('scores', {})
-        curr_scores = curr_snapshot.get('scores', {})
+# Signal type per classify_signal(), as small ints for the panel (0 = neutral)
+SIGNAL_TYPES = [None, 'deep_value', 'value', 'deep_expensive', 'expensive']
 
-        for ticker, curr_data in curr_scores.items():
-            curr_score = curr_data.get('bean_score')
-            if curr_score is None:
-                continue
 
-            curr_signal = classify_signal(curr_score)
-            if curr_signal is None:
-                continue
+def classify_scores(scores: np.ndarray) -> np.ndarray:
+    """classify_signal() over an array: index into SIGNAL_TYPES (NaN -> 0)."""
+    return np.select(
+        [scores >= 2.0, scores >= 1.0, scores <= -2.0, scores <= -1.0],
+        [1, 2, 3, 4], default=0)
 
-            # Check if this is a NEW crossing (wasn't in this zone before)
-            prev_data = prev_scores.get(ticker, {})
-            prev_score = prev_data.get('bean_score')
 
-            if prev_score is not None:
-                prev_signal = classify_signal(prev_score)
-                if prev_signal == curr_signal:
-                    # Already in same zone — not a new event
-                    continue
+def load_panel(history: list) -> dict:
+    """Weekly snapshots as dense week x ticker matrices, built in one pass.
 
-            events.append({
-                'ticker': ticker,
-                'signal_type': curr_signal,
-                'entry_date': curr_date,
-                'entry_score': curr_score,
-                'entry_index': i,
-            })
+      dates      snapshot dates, oldest first (W)
+      tickers    every ticker seen, in first-seen order (N)
+      score      (W, N) bean_score, NaN where absent
+      has_score  (W, N) the snapshot holds a (non-null) score
+      price      (W, N) price, NaN where absent
+      has_price  (W, N) the snapshot holds a (non-null) price
+      order      (W, N) position of the ticker within that week's snapshot,
+                 which fixes the order events are reported in
+    """
+    cols = {}
+    w_idx, c_idx, pos_idx, scores, prices = [], [], [], [], []
+    for w, snap in enumerate(history):
+        for pos, (ticker, row) in enumerate(snap.get('scores', {}).items()):
+            w_idx.append(w)
+            c_idx.append(cols.setdefault(ticker, len(cols)))
+            pos_idx.append(pos)
+            scores.append(row.get('bean_score'))
+            prices.append(row.get('price'))
+    W, N = len(history), len(cols)
+    w_idx, c_idx = np.array(w_idx, dtype=np.int64), np.array(c_idx, dtype=np.int64)
+
+    def _matrix(values):
+        present = np.array([v is not None for v in values], dtype=bool)
+        mat = np.full((W, N), np.nan)
+        has = np.zeros((W, N), dtype=bool)
+        mat[w_idx[present], c_idx[present]] = np.array(
+            [v for v in values if v is not None], dtype=float)
+        has[w_idx[present], c_idx[present]] = True
+        return mat, has
+
+    score, has_score = _matrix(scores)
+    price, has_price = _matrix(prices)
+    order = np.full((W, N), np.iinfo(np.int64).max, dtype=np.int64)
+    order[w_idx, c_idx] = pos_idx
+    return {
+        'dates': [snap['date'] for snap in history],
+        'tickers': list(cols),
+        'score': score, 'has_score': has_score,
+        'price': price, 'has_price': has_price,
+        'order': order,
+    }
 
-    return events
 
+def detect_signal_events(panel: dict) -> dict:
+    """Detect threshold crossings from the weekly Bean Score panel.
 
-def get_price_at_snapshot(ticker: str, history: list, index: int) -> Optional[float]:
-    """Get stock price from a history snapshot.
+    A signal event is recorded when a stock crosses INTO a threshold zone
+    (wasn't there the previous week, is there this week). A missing score
+    the week before counts as "not there".
 
-    Returns the close price if stored in the snapshot (added May 2026+),
-    otherwise returns None for older snapshots that lack price data.
+    Returns parallel arrays, in week order then snapshot order:
+      week, col, signal (index into SIGNAL_TYPES), entry_score
     """
-    if index < 0 or index >= len(history):
-        return None
-    snapshot = history[index]
-    ticker_data = snapshot.get('scores', {}).get(ticker, {})
-    return ticker_data.get('price')
+    empty = np.zeros(0, dtype=np.int64)
+    if len(panel['dates']) < 2:
+        return {'week': empty, 'col': empty, 'signal': empty, 'entry_score': np.zeros(0)}
+
+    zone = classify_scores(panel['score'])
+    has = panel['has_score']
+    same_as_before = has[:-1] & (zone[:-1] == zone[1:])
+    fired = has[1:] & (zone[1:] > 0) & ~same_as_before
+    week, col = np.nonzero(fired)
+    week = week + 1
+    ranked = np.lexsort((panel['order'][week, col], week))
+    week, col = week[ranked], col[ranked]
+    return {
+        'week': week,
+        'col': col,
+        'signal': zone[week, col],
+        'entry_score': panel['score'][week, col],
+    }
 
 
-def compute_returns_from_scores(history: list, events: list) -> list:
-    """For each signal event, compute subsequent bean score at EVERY available week.
+def compute_trajectories(panel: dict, events: dict) -> dict:
+    """Every event's week-by-week path after it fires, as (E, MAX_TRACK_WEEKS)
+    arrays; column k is week k + 1.
 
     This gives us the full "response curve" — how does the score evolve
-    week by week after a signal fires? This is critical because we don't
-    know in advance what the optimal holding period is.
-
-    The continuous week-by-week data lets us chart:
-      - When mean reversion starts
-      - How fast it progresses
-      - Whether there's a "sweet spot" horizon
-      - Whether the signal is early (lag before response)
-
-    Returns events enriched with:
-      - 'trajectory': list of {week, score, score_change, date} for every
-        available subsequent week
-      - 'outcomes': dict with fixed horizon checkpoints (1w, 4w, 13w, 26w)
+    week by week after a signal fires? We don't know in advance what the
+    optimal holding period is.
+
+      length        weeks available after the event (capped at 52)
+      target        snapshot index of each week (clipped; see in_range)
+      in_range      the week exists in the history
+      scored        ... and the stock has a score that week
+      score_change  score - entry score (valid where scored)
+      has_return    entry and target prices allow a price return
+      price_return  % price change from entry (valid where has_return)
     """
-    enriched = []
-    n_snapshots = len(history)
-
-    for event in events:
-        entry_idx = event['entry_index']
-        ticker = event['ticker']
-        outcomes = {}
-        trajectory = []
-
-        # Get entry price for return calculations
-        entry_price = get_price_at_snapshot(ticker, history, entry_idx)
-        event['entry_price'] = entry_price
-
-        # Track every available week after signal
-        max_weeks = min(n_snapshots - entry_idx - 1, 52)  # Cap at 1 year
-        for week in range(1, max_weeks + 1):
-            target_idx = entry_idx + week
-            target_snapshot = history[target_idx]
-            target_scores = target_snapshot.get('scores', {})
-            target_data = target_scores.get(ticker, {})
-            target_score = target_data.get('bean_score')
-
-            if target_score is None:
-                trajectory.append({'week': week, 'score': None, 'score_change': None, 'price_return_pct': None, 'date': target_snapshot['date']})
-                continue
-
-            score_change = target_score - event['entry_score']
+    W = len(panel['dates'])
+    week, col = events['week'], events['col']
+    steps = np.arange(1, MAX_TRACK_WEEKS + 1)
+    length = np.minimum(W - week - 1, MAX_TRACK_WEEKS)
+    raw_target = week[:, None] + steps
+    in_range = steps <= length[:, None]
+    target = np.minimum(raw_target, W - 1)
+    cols = col[:, None]
+
+    scored = in_range & panel['has_score'][target, cols]
+    score_change = panel['score'][target, cols] - events['entry_score'][:, None]
+
+    # Same truthiness as `entry_price and target_price and entry_price > 0`
+    entry_price = panel['price'][week, col]
+    entry_ok = panel['has_price'][week, col] & (entry_price > 0)
+    target_price = panel['price'][target, cols]
+    target_ok = panel['has_price'][target, cols] & (target_price != 0)
+    has_return = scored & entry_ok[:, None] & target_ok
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_return = (target_price - entry_price[:, None]) / entry_price[:, None] * 100
+
+    return {
+        'length': length,
+        'target': target,
+        'in_range': in_range,
+        'scored': scored,
+        'score_change': score_change,
+        'has_return': has_return,
+        'price_return': price_return,
+    }
 
-            # Calculate actual price return if both prices available
-            target_price = target_data.get('price')
-            price_return = None
-            if entry_price and target_price and entry_price > 0:
-                price_return = round((target_price - entry_price) / entry_price * 100, 2)
 
-            point = {
-                'week': week,
-                'score': round(target_score, 3),
-                'score_change': round(score_change, 3),
-                'price_return_pct': price_return,
-                'date': target_snapshot['date'],
-            }
-            trajectory.append(point)
-
-            # Also store at fixed horizons for quick lookup
-            if week in HORIZONS:
-                outcomes[f'{week}w'] = {
-                    'score_at_horizon': round(target_score, 3),
-                    'score_change': round(score_change, 3),
-                    'price_return_pct': price_return,
-                    'date': target_snapshot['date'],
+def event_outcomes(panel: dict, events: dict, traj: dict) -> list:
+    """Fixed-horizon checkpoints (1w, 4w, 13w, 26w) per event. Horizons not
+    reached, or where the stock wasn't scored, follow as None."""
+    target_score = panel['score'][traj['target'], events['col'][:, None]]
+    dates = panel['dates']
+    columns = []
+    for h in HORIZONS:
+        k = h - 1
+        columns.append((
+            f'{h}w',
+            traj['scored'][:, k].tolist(),
+            round_half_even(target_score[:, k], 3).tolist(),
+            round_half_even(traj['score_change'][:, k], 3).tolist(),
+            round_half_even(traj['price_return'][:, k], 2).tolist(),
+            traj['has_return'][:, k].tolist(),
+            traj['target'][:, k].tolist(),
+        ))
+
+    outcomes = []
+    for e in range(len(events['week'])):
+        reached = {}
+        for key, scored, score, change, ret, has_ret, target in columns:
+            if scored[e]:
+                reached[key] = {
+                    'score_at_horizon': score[e],
+                    'score_change': change[e],
+                    'price_return_pct': ret[e] if has_ret[e] else None,
+                    'date': dates[target[e]],
                 }
+        for key, *_ in columns:
+            reached.setdefault(key, None)
+        outcomes.append(reached)
+    return outcomes
 
-        # Fill in missing fixed horizons as None
-        for h in HORIZONS:
-            if f'{h}w' not in outcomes:
-                outcomes[f'{h}w'] = None
 
-        event_enriched = {**event, 'outcomes': outcomes, 'trajectory': trajectory}
-        enriched.append(event_enriched)
-
-    return enriched
-
-
-def aggregate_results(enriched_events: list) -> dict:
+def aggregate_results(events: dict, traj: dict) -> dict:
     """Aggregate signal events into summary statistics + response curves.
 
     Returns per signal type:
@@ -231,13 +264,17 @@ def aggregate_results(enriched_events: list) -> dict:
     The response_curve answers: "On average, how does the Bean Score evolve
     each week after this signal type fires?" This reveals the TIME EFFECT —
     whether mean reversion is immediate or delayed, fast or gradual.
+
+    Score changes and returns are rounded per point (3 and 2 places) before
+    averaging, as they are in the per-event output.
     """
     results = {}
 
     for signal_type, config in SIGNAL_THRESHOLDS.items():
-        type_events = [e for e in enriched_events if e['signal_type'] == signal_type]
+        mask = events['signal'] == SIGNAL_TYPES.index(signal_type)
+        n_events = int(mask.sum())
 
-        if not type_events:
+        if not n_events:
             results[signal_type] = {
                 'label': config['label'],
                 'direction': config['direction'],
@@ -247,90 +284,81 @@ def aggregate_results(enriched_events: list) -> dict:
             }
             continue
 
+        long_signal = config['direction'] == 'long'
+        scored = traj['scored'][mask]
+        score_change = traj['score_change'][mask]
+        has_return = traj['has_return'][mask]
+        price_return = traj['price_return'][mask]
+
         # Fixed horizon stats
         horizon_stats = {}
         for horizon in HORIZONS:
             key = f'{horizon}w'
-            measured = [e for e in type_events if e['outcomes'].get(key) is not None]
-
-            if not measured:
+            measured = scored[:, horizon - 1]
+            if not measured.any():
                 horizon_stats[key] = {
                     'n_measured': 0,
-                    'n_total': len(type_events),
+                    'n_total': n_events,
                 }
                 continue
 
-            score_changes = [e['outcomes'][key]['score_change'] for e in measured]
-
-            if config['direction'] == 'long':
-                reverted = [sc for sc in score_changes if sc < 0]
+            score_changes = round_half_even(score_change[measured, horizon - 1], 3).tolist()
+            if long_signal:
+                n_reverted = sum(1 for sc in score_changes if sc < 0)
             else:
-                reverted = [sc for sc in score_changes if sc > 0]
-
-            mean_change = sum(score_changes) / len(score_changes)
-            pct_reverted = len(reverted) / len(measured) * 100
+                n_reverted = sum(1 for sc in score_changes if sc > 0)
 
             horizon_stats[key] = {
-                'n_measured': len(measured),
-                'n_total': len(type_events),
-                'mean_score_change': round(mean_change, 3),
-                'pct_mean_reverted': round(pct_reverted, 1),
+                'n_measured': len(score_changes),
+                'n_total': n_events,
+                'mean_score_change': round(sum(score_changes) / len(score_changes), 3),
+                'pct_mean_reverted': round(n_reverted / len(score_changes) * 100, 1),
                 'median_score_change': round(sorted(score_changes)[len(score_changes) // 2], 3),
             }
 
         # Build response curve: average score change at each week
         # This is the key visualization data
         response_curve = []
-        max_week = max(
-            (len(e.get('trajectory', [])) for e in type_events),
-            default=0
-        )
+        max_week = int(traj['length'][mask].max(initial=0))
 
         for week in range(1, max_week + 1):
-            week_changes = []
-            week_returns = []
-            for event in type_events:
-                traj = event.get('trajectory', [])
-                if week <= len(traj):
-                    point = traj[week - 1]
-                    if point.get('score_change') is not None:
-                        week_changes.append(point['score_change'])
-                    if point.get('price_return_pct') is not None:
-                        week_returns.append(point['price_return_pct'])
-
-            if week_changes:
-                mean_sc = sum(week_changes) / len(week_changes)
-                # For long signals: negative score_change = price rose = "correct"
-                # For short signals: positive score_change = price fell = "correct"
-                if config['direction'] == 'long':
-                    pct_correct = sum(1 for x in week_changes if x < 0) / len(week_changes) * 100
-                else:
-                    pct_correct = sum(1 for x in week_changes if x > 0) / len(week_changes) * 100
+            week_changes = round_half_even(score_change[scored[:, week - 1], week - 1], 3).tolist()
+            if not week_changes:
+                continue
+            week_returns = round_half_even(price_return[has_return[:, week - 1], week - 1], 2).tolist()
 
-                point_data = {
-                    'week': week,
-                    'n_signals': len(week_changes),
-                    'mean_score_change': round(mean_sc, 3),
-                    'pct_correct_direction': round(pct_correct, 1),
-                }
+            mean_sc = sum(week_changes) / len(week_changes)
+            # For long signals: negative score_change = price rose = "correct"
+            # For short signals: positive score_change = price fell = "correct"
+            if long_signal:
+                pct_correct = sum(1 for x in week_changes if x < 0) / len(week_changes) * 100
+            else:
+                pct_correct = sum(1 for x in week_changes if x > 0) / len(week_changes) * 100
 
-                # Add price return stats when available
-                if week_returns:
-                    mean_ret = sum(week_returns) / len(week_returns)
-                    if config['direction'] == 'long':
-                        win_rate = sum(1 for x in week_returns if x > 0) / len(week_returns) * 100
-                    else:
-                        win_rate = sum(1 for x in week_returns if x < 0) / len(week_returns) * 100
-                    point_data['n_with_price'] = len(week_returns)
-                    point_data['mean_price_return_pct'] = round(mean_ret, 2)
-                    point_data['win_rate_pct'] = round(win_rate, 1)
+            point_data = {
+                'week': week,
+                'n_signals': len(week_changes),
+                'mean_score_change': round(mean_sc, 3),
+                'pct_correct_direction': round(pct_correct, 1),
+            }
+
+            # Add price return stats when available
+            if week_returns:
+                mean_ret = sum(week_returns) / len(week_returns)
+                if long_signal:
+                    win_rate = sum(1 for x in week_returns if x > 0) / len(week_returns) * 100
+                else:
+                    win_rate = sum(1 for x in week_returns if x < 0) / len(week_returns) * 100
+                point_data['n_with_price'] = len(week_returns)
+                point_data['mean_price_return_pct'] = round(mean_ret, 2)
+                point_data['win_rate_pct'] = round(win_rate, 1)
 
-                response_curve.append(point_data)
+            response_curve.append(point_data)
 
         results[signal_type] = {
             'label': config['label'],
             'direction': config['direction'],
-            'total_events': len(type_events),
+            'total_events': n_events,
             'horizons': horizon_stats,
             'response_curve': response_curve,
         }
@@ -338,68 +366,63 @@ def aggregate_results(enriched_events: list) -> dict:
     return results
 
 
-def per_stock_tracking(enriched_events: list) -> dict:
+def per_stock_tracking(panel: dict, events: dict, outcomes: list) -> dict:
     """Group tracking data by stock for per-page display.
 
-    Returns dict keyed by ticker with signal history + summary.
+    Returns dict keyed by ticker with signal history + summary, stocks in
+    order of their first signal.
     """
     by_stock = defaultdict(list)
-    for event in enriched_events:
-        by_stock[event['ticker']].append(event)
+    for e, col in enumerate(events['col'].tolist()):
+        by_stock[panel['tickers'][col]].append(e)
 
     stock_tracking = {}
-    for ticker, events in by_stock.items():
-        signals = []
-        for e in events:
-            signals.append({
-                'date': e['entry_date'],
-                'type': e['signal_type'],
-                'score': e['entry_score'],
-                'outcomes': e['outcomes'],
-            })
+    for ticker, idx in by_stock.items():
+        signals = [{
+            'date': panel['dates'][events['week'][e]],
+            'type': SIGNAL_TYPES[events['signal'][e]],
+            'score': float(events['entry_score'][e]),
+            'outcomes': outcomes[e],
+        } for e in idx]
 
         stock_tracking[ticker] = {
-            'signal_count': len(events),
+            'signal_count': len(signals),
             'signals': signals,
         }
 
     return stock_tracking
 
 
-def main():
-    verbose = '--verbose' in sys.argv or '-v' in sys.argv
-
-    if not HISTORY_FILE.exists():
-        print(f"ERROR: {HISTORY_FILE} not found. Need weekly history data.")
-        sys.exit(1)
-
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
-
+def build_tracking(history: list, verbose: bool = False) -> dict:
+    """The bean_score_tracking.json document for a list of snapshots."""
     if verbose:
         print(f"Loaded {len(history)} weekly snapshots")
         if history:
             print(f"  Date range: {history[0]['date']} to {history[-1]['date']}")
             print(f"  Stocks in latest: {len(history[-1].get('scores', {}))}")
 
-    # Step 1: Detect signal events (threshold crossings)
-    events = detect_signal_events(history)
+    # Step 1: Load the ticker x week panel and detect signal events
+    # (threshold crossings)
+    panel = load_panel(history)
+    events = detect_signal_events(panel)
+    n_events = len(events['week'])
     if verbose:
-        print(f"\nDetected {len(events)} signal events:")
+        print(f"\nDetected {n_events} signal events:")
         by_type = defaultdict(int)
-        for e in events:
-            by_type[e['signal_type']] += 1
+        for code in events['signal'].tolist():
+            by_type[SIGNAL_TYPES[code]] += 1
         for t, c in sorted(by_type.items()):
             print(f"  {t}: {c}")
 
-    # Step 2: Compute outcomes at each horizon
-    enriched = compute_returns_from_scores(history, events)
+    # Step 2: Compute trajectories and outcomes at each horizon
+    traj = compute_trajectories(panel, events)
+    outcomes = event_outcomes(panel, events, traj)
 
     # Step 3: Aggregate results
-    aggregate = aggregate_results(enriched)
+    aggregate = aggregate_results(events, traj)
 
     # Step 4: Per-stock tracking
-    stock_tracking = per_stock_tracking(enriched)
+    stock_tracking = per_stock_tracking(panel, events, outcomes)
 
     # Step 5: Compute data sufficiency
     total_weeks = len(history)
@@ -433,13 +456,29 @@ def main():
             ],
         },
     }
+    return output
+
+
+def main():
+    verbose = '--verbose' in sys.argv or '-v' in sys.argv
+
+    history = bean_score_history.load_history()
+    if not history:
+        print(f"ERROR: no snapshots in {bean_score_history.STORE_DIR}. Need weekly history data.")
+        sys.exit(1)
+
+    output = build_tracking(history, verbose)
+    n_events = sum(s['signal_count'] for s in output['per_stock'].values())
+    stock_tracking = output['per_stock']
+    total_weeks = output['data_range']['n_weeks']
+    data_sufficient = output['data_range']['sufficient_for_analysis']
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(OUTPUT_FILE, 'w') as f:
         json.dump(output, f, indent=2)
 
     print(f"✓ Bean Score tracking written to {OUTPUT_FILE}")
-    print(f"  {len(events)} signal events across {len(stock_tracking)} stocks")
+    print(f"  {n_events} signal events across {len(stock_tracking)} stocks")
     print(f"  Data depth: {total_weeks} weeks ({'sufficient' if data_sufficient else 'INSUFFICIENT — need 13+ weeks'})")
 
     if not data_sufficient:
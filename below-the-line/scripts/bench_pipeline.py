@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the per-ticker signal pipeline.
+
+Replays recorded weekly prices, fundamentals and insider data through the same
+functions update_stocks.py runs, with no network, and reports wall time and
+peak traced memory per stage:
+
+  add_weekly_indicators        200WMA, RSI, volume columns
+  find_historical_touches
+  build_growth_chart
+  build_touch_overlay_chart
+  compute_stock_dislocation
+  calculate_stock_signals      end to end, prefetched inputs
+  apply_cross_sectional_dislocation   once over the whole set
+
+Fixtures live in scripts/.bench_fixtures/ (gitignored): one gzipped JSON per
+ticker plus spy.json.gz. Record them once with network access:
+
+    python scripts/bench_pipeline.py --record 300
+
+Without recorded fixtures the run falls back to a deterministic synthetic
+set (--synthetic N forces it), so the harness works on any machine.
+
+Timings are compared to .bench_fixtures/baseline.json; a stage slower or
+hungrier than baseline by more than --tolerance (default 25%) fails the run
+with exit code 1. Write a new baseline with --update-baseline. Baselines are
+per machine and per fixture set, which is why they sit next to the fixtures.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dislocation_scores import apply_cross_sectional_dislocation, compute_stock_dislocation
+from fundamentals_bundle import get_bundle
+from update_stocks import (
+    STOCK_UNIVERSE,
+    NumpyEncoder,
+    add_weekly_indicators,
+    build_growth_chart,
+    build_touch_overlay_chart,
+    calculate_stock_signals,
+    fetch_fundamental_data,
+    fetch_insider_data,
+    fetch_spy_monthly,
+    fetch_weekly_data,
+    find_historical_touches,
+    load_company_metadata,
+    sanitize_for_json,
+)
+
+FIXTURE_DIR = Path(__file__).parent / '.bench_fixtures'
+BASELINE_FILE = FIXTURE_DIR / 'baseline.json'
+
+DEFAULT_TOLERANCE = 0.25
+MIN_ABS_SECONDS = 0.05      # ignore regressions smaller than this (timer noise)
+MIN_ABS_BYTES = 1 << 20     # ... or than 1 MB of peak memory
+
+SYNTHETIC_SECTORS = ['Technology', 'Healthcare', 'Financial Services', 'Industrials',
+                     'Consumer Defensive', 'Energy', 'Utilities', 'Real Estate']
+
+
+# ── Fixture I/O ─────────────────────────────────────────────────────────────
+
+def _frame_to_json(df: pd.DataFrame) -> dict:
+    idx = df.index
+    tz = str(idx.tz) if idx.tz is not None else None
+    if tz:
+        idx = idx.tz_convert('UTC')
+    return {
+        'tz': tz,
+        'index': [int(v) for v in idx.as_unit('ns').asi8],
+        'columns': {c: [None if pd.isna(v) else v for v in df[c].tolist()] for c in df.columns},
+    }
+
+
+def _frame_from_json(d: dict) -> pd.DataFrame:
+    idx = pd.to_datetime(d['index'], utc=d['tz'] is not None)
+    if d['tz']:
+        idx = idx.tz_convert(d['tz'])
+    idx.name = 'Date'
+    return pd.DataFrame({c: np.array(v, dtype=float) for c, v in d['columns'].items()}, index=idx)
+
+
+def _write_gz(path: Path, obj) -> None:
+    with gzip.open(path, 'wt') as f:
+        json.dump(sanitize_for_json(obj), f, separators=(',', ':'), cls=NumpyEncoder)
+
+
+def _read_gz(path: Path):
+    with gzip.open(path, 'rt') as f:
+        return json.load(f)
+
+
+def record_fixtures(n: int) -> None:
+    """Pull live data for the first n universe tickers (network required)."""
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    spy = fetch_spy_monthly()
+    _write_gz(FIXTURE_DIR / 'spy.json.gz', {
+        'periods': [str(p) for p in spy.index], 'values': spy.tolist()})
+    meta = load_company_metadata()
+    saved = 0
+    for symbol in STOCK_UNIVERSE[:n]:
+        df = fetch_weekly_data(symbol)
+        if df is None:
+            continue
+        with get_bundle(symbol) as bundle:
+            fundamentals = fetch_fundamental_data(symbol, bundle)
+            insider = fetch_insider_data(symbol, bundle)
+        _write_gz(FIXTURE_DIR / f'{symbol}.json.gz', {
+            'symbol': symbol,
+            'sector': meta.get(symbol, {}).get('sector', ''),
+            'weekly': _frame_to_json(df),
+            'fundamentals': fundamentals,
+            'insider': insider,
+        })
+        saved += 1
+        print(f"  ✓ {symbol} ({len(df)} weeks)")
+    print(f"\nRecorded {saved} fixtures to {FIXTURE_DIR}")
+
+
+def load_fixtures() -> tuple:
+    """Returns (spy_monthly, [fixture dicts]) or (None, []) if none recorded."""
+    spy_path = FIXTURE_DIR / 'spy.json.gz'
+    if not spy_path.exists():
+        return None, []
+    raw = _read_gz(spy_path)
+    spy = pd.Series(raw['values'], index=pd.PeriodIndex(raw['periods'], freq='M'))
+    fixtures = []
+    for path in sorted(FIXTURE_DIR.glob('*.json.gz')):
+        if path.name == 'spy.json.gz':
+            continue
+        fx = _read_gz(path)
+        fx['weekly'] = _frame_from_json(fx['weekly'])
+        fixtures.append(fx)
+    return spy, fixtures
+
+
+def synthetic_fixtures(n: int, seed: int = 200) -> tuple:
+    """Deterministic stand-in: random-walk weekly bars of varied length and
+    volatility, quarterly dividends on a third of names, four fiscal years of
+    health-chart data."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp('2026-10-12', tz='America/New_York')
+    spy_idx = pd.period_range(end=end.tz_localize(None).to_period('M'), periods=400, freq='M')
+    spy = pd.Series(np.round(100 * np.exp(np.cumsum(rng.normal(0.007, 0.04, 400))), 2), index=spy_idx)
+
+    fixtures = []
+    for k in range(n):
+        weeks = int(rng.integers(120, 2600))
+        idx = pd.date_range(end=end, periods=weeks, freq='W-MON', name='Date')
+        vol = float(rng.choice([0.02, 0.04, 0.08]))
+        close = 40 * np.exp(np.cumsum(rng.normal(0.001, vol, weeks)))
+        divs = np.zeros(weeks)
+        if k % 3 == 0:
+            divs[::13] = np.round(close[::13] * 0.006, 4)
+        df = pd.DataFrame({
+            'open': close * (1 + rng.normal(0, 0.005, weeks)),
+            'high': close * 1.02, 'low': close * 0.98, 'close': close,
+            'volume': rng.integers(1e5, 5e7, weeks).astype(float),
+            'Dividends': divs, 'Stock Splits': 0.0,
+        }, index=idx)
+        df['adjusted_close'] = df['close']
+        mcap = float(rng.uniform(3e8, 5e11))
+        fcf_hist = [float(v) for v in rng.normal(mcap * 0.04, mcap * 0.01, 4)]
+        fundamentals = {
+            'market_cap': mcap, 'fcf': fcf_hist[-1], 'fcf_yield': round(fcf_hist[-1] / mcap * 100, 2),
+            'book_value': 10.0, 'price_to_book': 2.0, 'book_to_market': 0.5,
+            'profit_margin': 10.0, 'operating_margin': 15.0, 'revenue': mcap * 0.5,
+            'roe': 15.0, 'debt_to_equity': 50.0, 'gross_margin': 40.0,
+            'current_ratio': 1.5, 'dividend_yield': 2.0 if k % 3 == 0 else None,
+            'shares_outstanding': 1e8, 'shares_change_yoy': round(float(rng.normal(-1, 2)), 2),
+            'shares_change_3yr': round(float(rng.normal(-3, 5)), 2),
+            'is_small_cap': mcap < 2e9, 'has_positive_equity': True,
+            'has_positive_fcf': True, 'low_debt': True, 'high_roe': True,
+            'wide_moat': False, 'buffett_quality': False, 'dividend_aristocrat': False,
+            'yartseva_candidate': False, 'is_buying_back': True, 'is_diluting': False,
+            'is_cannibal': False, 'fcf_trend': 'stable', 'fcf_cagr_3yr': 2.0,
+            'fcf_consecutive_positive': 4, 'fcf_history': [],
+            'health_chart': {
+                'years': ['2022', '2023', '2024', '2025'],
+                'revenue': [mcap * 0.5] * 4,
+                'net_income': [v * 1.1 for v in fcf_hist],
+                'fcf': fcf_hist,
+                'total_debt': [mcap * 0.1] * 4, 'roic': [12.0] * 4,
+                'gross_margin': [40.0] * 4, 'shares': [1e8] * 4,
+                'fcf_yield': [round(v / mcap * 100, 2) for v in fcf_hist],
+            },
+        }
+        buy_total = float(rng.uniform(1e5, 5e6)) if k % 4 == 0 else 0
+        insider = {
+            'insider_buys': [], 'has_conviction_buy': False, 'has_cluster_buy': False,
+            'largest_buy_value': buy_total or None,
+            'insider_buy_count_12m': 1 if buy_total else 0,
+            'insider_buy_total_12m': buy_total,
+        }
+        fixtures.append({
+            'symbol': f'SYN{k:04d}',
+            'sector': SYNTHETIC_SECTORS[k % len(SYNTHETIC_SECTORS)],
+            'weekly': df, 'fundamentals': fundamentals, 'insider': insider,
+        })
+    return spy, fixtures
+
+
+# ── Measurement ─────────────────────────────────────────────────────────────
+
+def _stage_calls(fx: dict, spy: pd.Series) -> list:
+    """(stage name, zero-arg callable) pairs for one ticker, in pipeline order."""
+    df = add_weekly_indicators(fx['weekly'].copy())
+    df_complete = df.dropna(subset=['WMA_200'])
+    touches = find_historical_touches(df_complete.copy())
+    calls = [
+        ('add_weekly_indicators', lambda: add_weekly_indicators(fx['weekly'].copy())),
+        ('find_historical_touches', lambda: find_historical_touches(df_complete.copy())),
+        ('build_growth_chart', lambda: build_growth_chart(df_complete, spy, touches)),
+        ('build_touch_overlay_chart',
+         lambda: build_touch_overlay_chart(df_complete, spy, touches) if touches else None),
+        ('compute_stock_dislocation', lambda: compute_stock_dislocation(df_complete, fx['fundamentals'])),
+        ('calculate_stock_signals', lambda: calculate_stock_signals(
+            fx['symbol'], spy_monthly=spy, df=fx['weekly'],
+            fundamentals=fx['fundamentals'], insider=fx['insider'])),
+    ]
+    return calls if len(df_complete) else calls[-1:]
+
+
+def run_benchmark(spy: pd.Series, fixtures: list, trace: bool) -> tuple:
+    """One pass over all fixtures. Returns ({stage: seconds or peak bytes}, results)."""
+    totals = {}
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for fx in fixtures:
+            for stage, call in _stage_calls(fx, spy):
+                if trace:
+                    tracemalloc.reset_peak()
+                    base = tracemalloc.get_traced_memory()[0]
+                    out = call()
+                    peak = tracemalloc.get_traced_memory()[1] - base
+                    totals[stage] = max(totals.get(stage, 0), peak)
+                else:
+                    t0 = time.perf_counter()
+                    out = call()
+                    totals[stage] = totals.get(stage, 0.0) + time.perf_counter() - t0
+                if stage == 'calculate_stock_signals' and out:
+                    out['sector'] = fx.get('sector', '')
+                    results.append(out)
+
+        stage = 'apply_cross_sectional_dislocation'
+        if trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            apply_cross_sectional_dislocation(results)
+            totals[stage] = tracemalloc.get_traced_memory()[1] - base
+        else:
+            t0 = time.perf_counter()
+            apply_cross_sectional_dislocation(results)
+            totals[stage] = time.perf_counter() - t0
+    return totals, results
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Stages that regressed past tolerance, as printable lines."""
+    failures = []
+    for stage, cur in report.items():
+        base = baseline.get('stages', {}).get(stage)
+        if not base:
+            continue
+        for key, floor, fmt in (('seconds', MIN_ABS_SECONDS, '{:.3f}s'),
+                                ('peak_bytes', MIN_ABS_BYTES, '{:,.0f} B')):
+            b, c = base.get(key), cur.get(key)
+            if b is None or c is None:
+                continue
+            if c > b * (1 + tolerance) and c - b > floor:
+                failures.append(f"{stage} {key}: {fmt.format(c)} vs baseline "
+                                f"{fmt.format(b)} (+{(c / b - 1) * 100:.0f}%)")
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--record', type=int, metavar='N',
+                    help='record live fixtures for the first N universe tickers, then exit')
+    ap.add_argument('--synthetic', type=int, metavar='N',
+                    help='benchmark N synthetic tickers instead of recorded fixtures')
+    ap.add_argument('--limit', type=int, default=0, help='use only the first N fixtures')
+    ap.add_argument('--repeat', type=int, default=3, help='timing passes; best is kept')
+    ap.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    ap.add_argument('--update-baseline', action='store_true')
+    args = ap.parse_args()
+
+    if args.record:
+        record_fixtures(args.record)
+        return 0
+
+    source = 'recorded'
+    spy, fixtures = (None, []) if args.synthetic else load_fixtures()
+    if not fixtures:
+        source = 'synthetic'
+        spy, fixtures = synthetic_fixtures(args.synthetic or 300)
+    if args.limit:
+        fixtures = fixtures[:args.limit]
+    weeks = sum(len(fx['weekly']) for fx in fixtures)
+    print(f"Benchmarking {len(fixtures)} {source} tickers ({weeks:,} weekly bars)")
+
+    # Timing passes run untraced; tracemalloc roughly triples runtime.
+    timings = None
+    for _ in range(max(1, args.repeat)):
+        t, results = run_benchmark(spy, fixtures, trace=False)
+        timings = t if timings is None else {k: min(v, t.get(k, v)) for k, v in timings.items()}
+    tracemalloc.start()
+    peaks, _ = run_benchmark(spy, fixtures, trace=True)
+    tracemalloc.stop()
+
+    report = {stage: {'seconds': round(timings[stage], 4), 'peak_bytes': int(peaks.get(stage, 0))}
+              for stage in timings}
+    print(f"\n  {'stage':<36}{'wall (s)':>10}{'peak mem':>14}")
+    for stage, r in report.items():
+        print(f"  {stage:<36}{r['seconds']:>10.3f}{r['peak_bytes'] / 1e6:>11.2f} MB")
+    print(f"\n  {len(results)} stocks produced")
+
+    key = f"{source}:{len(fixtures)}"
+    baseline = {}
+    if BASELINE_FILE.exists():
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f).get(key, {})
+
+    if args.update_baseline or not baseline:
+        FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+        stored = {}
+        if BASELINE_FILE.exists():
+            with open(BASELINE_FILE) as f:
+                stored = json.load(f)
+        stored[key] = {'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'stages': report}
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(stored, f, indent=2)
+        print(f"\n✓ Baseline written for {key} → {BASELINE_FILE}")
+        return 0
+
+    failures = compare(report, baseline, args.tolerance)
+    if failures:
+        print(f"\n✗ {len(failures)} stage(s) regressed past {args.tolerance:.0%} "
+              f"(baseline {baseline.get('recorded_at', '?')}):")
+        for line in failures:
+            print(f"    {line}")
+        return 1
+    print(f"\n✓ Within {args.tolerance:.0%} of baseline ({baseline.get('recorded_at', '?')})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Parsed-input cache for the portfolio build (build_portfolio.py).
+
+Every build used to json-parse each data/prices/<T>.json and pd.to_datetime
+its date strings, re-read and re-parse all of them again just to find the
+newest `fetched_at`, and yaml-parse every position file and cash.yml. The
+inputs rarely change between builds, so the parsed forms are kept here and
+only files that changed are parsed again.
+
+Layout (scripts/.book_cache/, gitignored):
+
+  prices.npz       every price file's closes in one set of flat arrays:
+                     name, ticker, fetched_at    one entry per file
+                     offsets (int64)             row range of each file
+                     day (int32, days since 1970-01-01), close (float64)
+  yaml.pkl.gz      parsed YAML documents by source path
+  manifest.json    per source file: mtime_ns, size, sha1
+
+A source is reused when its mtime and size match the manifest. When either
+differs (a git checkout touches mtimes), its sha1 is compared, and only a
+changed hash means parsing it again. Files that fail to parse are never
+cached, so their warning repeats until they are fixed. The cache files are
+rewritten only when something changed.
+
+BOOK_CACHE=off parses everything directly and leaves the cache alone.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import yaml
+
+CACHE_DIR = Path(__file__).parent / '.book_cache'
+PRICES_BUNDLE = CACHE_DIR / 'prices.npz'
+YAML_BUNDLE = CACHE_DIR / 'yaml.pkl.gz'
+MANIFEST = CACHE_DIR / 'manifest.json'
+
+VERSION = 1
+
+
+def cache_enabled() -> bool:
+    return os.environ.get('BOOK_CACHE', 'on').lower() not in ('off', 'false', '0')
+
+
+# ── Manifest ────────────────────────────────────────────────────────────────
+
+def _read_manifest() -> dict:
+    try:
+        with open(MANIFEST) as f:
+            manifest = json.load(f)
+        if manifest.get('version') == VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': VERSION, 'prices': {}, 'yaml': {}}
+
+
+def _fingerprint(path: Path, known: Optional[dict]) -> tuple[dict, bool]:
+    """(manifest entry, whether the content changed since `known`)."""
+    st = path.stat()
+    if known and known.get('mtime_ns') == st.st_mtime_ns and known.get('size') == st.st_size:
+        return known, False
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    entry = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha1': digest}
+    return entry, not (known and known.get('sha1') == digest)
+
+
+def _replace(path: Path, write) -> None:
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _write_manifest(manifest: dict) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _replace(MANIFEST, lambda f: f.write(json.dumps(manifest, separators=(',', ':')).encode()))
+
+
+# ── Prices ──────────────────────────────────────────────────────────────────
+
+def _parse_price_file(path: Path) -> tuple[str, np.ndarray, np.ndarray, str]:
+    """(ticker, days, closes, fetched_at) from one data/prices JSON."""
+    d = json.loads(path.read_text())
+    s = pd.Series(d['close'], index=pd.to_datetime(d['dates']), dtype=float).sort_index()
+    days = s.index.values.astype('datetime64[D]').astype(np.int32)
+    return (str(d.get('ticker', path.stem)).upper(), days,
+            s.to_numpy(dtype=np.float64), str(d.get('fetched_at') or ''))
+
+
+def _read_price_bundle() -> dict:
+    try:
+        with np.load(PRICES_BUNDLE) as z:
+            off = z['offsets']
+            day, close = z['day'], z['close']
+            return {name: (ticker, day[off[i]:off[i + 1]], close[off[i]:off[i + 1]], fetched)
+                    for i, (name, ticker, fetched)
+                    in enumerate(zip(z['name'].tolist(), z['ticker'].tolist(), z['fetched_at'].tolist()))}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _write_price_bundle(records: dict) -> None:
+    names = sorted(records)
+    lengths = [len(records[n][1]) for n in names]
+    arrays = {
+        'name': np.array(names, dtype=str),
+        'ticker': np.array([records[n][0] for n in names], dtype=str),
+        'fetched_at': np.array([records[n][3] for n in names], dtype=str),
+        'offsets': np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64),
+        'day': np.concatenate([records[n][1] for n in names] or [np.empty(0, np.int32)]).astype(np.int32),
+        'close': np.concatenate([records[n][2] for n in names] or [np.empty(0)]).astype(np.float64),
+    }
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    _replace(PRICES_BUNDLE, lambda f: np.savez(f, **arrays))
+
+
+def load_prices(prices_dir: Path) -> tuple[dict[str, pd.Series], Optional[str]]:
+    """({TICKER: close series}, newest fetched_at) for every price file,
+    parsing only files that changed since the last build."""
+    use_cache = cache_enabled()
+    manifest = _read_manifest() if use_cache else {'prices': {}}
+    known = manifest.get('prices', {})
+    cached = _read_price_bundle() if use_cache and known else {}
+
+    records, sources, dirty = {}, {}, False
+    files = sorted(prices_dir.glob('*.json')) if prices_dir.exists() else []
+    for f in files:
+        entry, changed = _fingerprint(f, known.get(f.name)) if use_cache else (None, True)
+        rec = None if changed else cached.get(f.name)
+        if rec is None:
+            try:
+                rec = _parse_price_file(f)
+            except Exception as e:  # noqa: BLE001
+                print(f"  [!] price file {f.name}: {e}", file=sys.stderr)
+                dirty = True
+                continue
+            dirty = True
+        elif entry is not known.get(f.name):
+            dirty = True          # same content, new mtime: refresh the manifest
+        records[f.name] = rec
+        sources[f.name] = entry
+    dirty = dirty or set(sources) != set(known)
+
+    if use_cache and dirty:
+        _write_price_bundle(records)
+        manifest['prices'] = sources
+        _write_manifest(manifest)
+
+    series: dict[str, pd.Series] = {}
+    latest = None
+    for ticker, days, closes, fetched in records.values():
+        series[ticker] = pd.Series(closes, index=pd.DatetimeIndex(days.astype('datetime64[D]')
+                                                                  .astype('datetime64[us]')))
+        if fetched and (latest is None or fetched > latest):
+            latest = fetched
+    return series, latest
+
+
+# ── YAML ────────────────────────────────────────────────────────────────────
+
+def load_yaml(paths: list[Path]) -> dict[Path, object]:
+    """{path: parsed document} for each existing path, parsing only files
+    that changed. Parse errors propagate, as yaml.safe_load's would."""
+    use_cache = cache_enabled()
+    manifest = _read_manifest() if use_cache else {'yaml': {}}
+    known = manifest.get('yaml', {})
+    cached = {}
+    if use_cache and known:
+        try:
+            with gzip.open(YAML_BUNDLE, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception:  # noqa: BLE001
+            cached = {}
+
+    docs, sources, dirty = {}, {}, False
+    for path in paths:
+        if not path.exists():
+            continue
+        key = str(path)
+        entry, changed = _fingerprint(path, known.get(key)) if use_cache else (None, True)
+        if changed or key not in cached:
+            docs[key] = yaml.safe_load(path.read_text())
+            dirty = True
+        else:
+            docs[key] = cached[key]
+            dirty = dirty or entry is not known.get(key)
+        sources[key] = entry
+
+    if use_cache:
+        # Keep cached documents other callers load, if their files still exist.
+        keep = {k: v for k, v in cached.items() if k not in docs and Path(k).exists()}
+        keep_sources = {k: known[k] for k in keep if k in known}
+        if dirty or set(keep_sources) | set(sources) != set(known):
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            blob = pickle.dumps({**keep, **docs}, protocol=pickle.HIGHEST_PROTOCOL)
+            _replace(YAML_BUNDLE, lambda f: f.write(gzip.compress(blob)))
+            manifest = _read_manifest()
+            manifest['yaml'] = {**keep_sources, **sources}
+            _write_manifest(manifest)
+    return {Path(k): v for k, v in docs.items()}
@@ -22,21 +22,38 @@ Core principles (build brief §3, Rev 2 §D):
 Integrity checks fail loud: a missing benchmark is fatal; a stale option mark or
 an unresolved ticker is surfaced as a warning in the JSON and on stderr.
 
+Resolution: the curve is sampled weekly (W-FRI) by default. Daily mode
+(`resolution: daily` in portfolio_config.yml, or BOOK_RESOLUTION=daily) samples
+every SPY session and adds a `risk` block to book.json: volatility, Sharpe and
+Sortino, beta to SPY, underwater duration, rolling volatility/beta, drawdown and
+per-position contribution series. Headline numbers come from the full-resolution
+curve; the chart payload is downsampled to at most ~MAX_CHART_POINTS points.
+
+Inputs (position YAML, cash.yml, price files) are read through book_cache.py,
+which keeps their parsed forms in scripts/.book_cache and only re-parses files
+whose content changed (BOOK_CACHE=off bypasses it).
+
 Usage:
   python scripts/build_portfolio.py
+  BOOK_RESOLUTION=daily python scripts/build_portfolio.py
 """
 from __future__ import annotations
 
 import json
 import math
+import os
 import sys
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import yaml
 
+import book_cache
+from rounding import round_half_even
+
 ROOT = Path(__file__).parent.parent
 DATA_DIR = ROOT / "data"
 POSITIONS_DIR = DATA_DIR / "positions"
@@ -52,26 +69,36 @@ BENCHMARK = "SPY"
 BUY_ACTIONS = {"open", "add"}
 SELL_ACTIONS = {"trim", "close"}
 
+RESOLUTIONS = ("weekly", "daily")
+TRADING_DAYS = 252          # annualisation
+RISK_WINDOW = 21            # sessions in the rolling volatility / beta window
+MAX_CHART_POINTS = 400      # daily-mode chart payload bound
+
 
 # --------------------------------------------------------------------------- #
 # Loaders
 # --------------------------------------------------------------------------- #
 def load_config() -> dict:
-    cfg = {"refresh_mode": "A", "inception": None}
+    cfg = {"refresh_mode": "A", "inception": None, "resolution": "weekly", "risk_free_pct": 0.0}
     if CONFIG_FILE.exists():
         try:
             disk = yaml.safe_load(CONFIG_FILE.read_text()) or {}
             cfg.update({k: v for k, v in disk.items() if v is not None})
         except Exception as e:  # noqa: BLE001
             print(f"  [!] config: {e}", file=sys.stderr)
+    # env wins for the resolution toggle
+    cfg["resolution"] = str(os.environ.get("BOOK_RESOLUTION", cfg["resolution"])).lower()
+    if cfg["resolution"] not in RESOLUTIONS:
+        print(f"  [!] unknown resolution {cfg['resolution']!r}, using weekly", file=sys.stderr)
+        cfg["resolution"] = "weekly"
     return cfg
 
 
 def load_positions() -> list[dict]:
     out = []
     if POSITIONS_DIR.exists():
-        for f in sorted(POSITIONS_DIR.glob("*.yml")) + sorted(POSITIONS_DIR.glob("*.yaml")):
-            doc = yaml.safe_load(f.read_text())
+        files = sorted(POSITIONS_DIR.glob("*.yml")) + sorted(POSITIONS_DIR.glob("*.yaml"))
+        for f, doc in book_cache.load_yaml(files).items():
             if isinstance(doc, dict):
                 doc.setdefault("id", f.stem)
                 out.append(doc)
@@ -81,39 +108,17 @@ def load_positions() -> list[dict]:
 def load_cash() -> list[dict]:
     if not CASH_FILE.exists():
         return []
-    doc = yaml.safe_load(CASH_FILE.read_text()) or {}
+    doc = book_cache.load_yaml([CASH_FILE]).get(CASH_FILE) or {}
     bals = doc.get("balances") or []
     bals = [b for b in bals if b.get("date") and b.get("amount") is not None]
     bals.sort(key=lambda b: str(b["date"]))
     return bals
 
 
-def load_prices() -> dict[str, pd.Series]:
-    series: dict[str, pd.Series] = {}
-    if not PRICES_DIR.exists():
-        return series
-    for f in PRICES_DIR.glob("*.json"):
-        try:
-            d = json.loads(f.read_text())
-            idx = pd.to_datetime(d["dates"])
-            s = pd.Series(d["close"], index=idx).sort_index()
-            series[d.get("ticker", f.stem).upper()] = s
-        except Exception as e:  # noqa: BLE001
-            print(f"  [!] price file {f.name}: {e}", file=sys.stderr)
-    return series
-
-
-def price_fetched_at(prices: dict) -> Optional[str]:
-    latest = None
-    if PRICES_DIR.exists():
-        for f in PRICES_DIR.glob("*.json"):
-            try:
-                fa = json.loads(f.read_text()).get("fetched_at")
-                if fa and (latest is None or fa > latest):
-                    latest = fa
-            except Exception:  # noqa: BLE001
-                pass
-    return latest
+def load_prices() -> tuple[dict[str, pd.Series], Optional[str]]:
+    """({TICKER: daily closes}, newest fetched_at across the price files), in
+    one pass through book_cache (only changed files are parsed)."""
+    return book_cache.load_prices(PRICES_DIR)
 
 
 def asof(series: Optional[pd.Series], d) -> Optional[float]:
@@ -148,21 +153,6 @@ def committed_usd(p: dict, ev: dict) -> Optional[float]:
     return round(q * mult * float(price), 2)
 
 
-def net_qty_at(p: dict, d) -> float:
-    n = 0.0
-    for ev in p.get("events", []) or []:
-        if str(ev.get("date")) > str(d):
-            continue
-        q = event_qty(ev)
-        if q is None:
-            continue
-        if ev.get("action") in BUY_ACTIONS:
-            n += q
-        elif ev.get("action") in SELL_ACTIONS:
-            n -= q
-    return n
-
-
 def option_mark_at(p: dict, d) -> Optional[float]:
     """Stepwise per-share premium: last event price up to d; current_mark once
     we're at/after the final event."""
@@ -178,17 +168,6 @@ def option_mark_at(p: dict, d) -> Optional[float]:
     return None
 
 
-def position_value_at(p: dict, d, prices: dict) -> Optional[float]:
-    n = net_qty_at(p, d)
-    if n == 0:
-        return 0.0
-    if is_option(p):
-        mark = option_mark_at(p, d)
-        return None if mark is None else round(n * 100 * mark, 2)
-    px = asof(prices.get(str(p.get("ticker", "")).upper()), d)
-    return None if px is None else round(n * px, 2)
-
-
 def analyze_position(p: dict, prices: dict, as_of) -> dict:
     """Returns realized/unrealized economics + entry/exit facts for one position."""
     events = sorted((p.get("events") or []), key=lambda e: str(e.get("date")))
@@ -270,67 +249,187 @@ def spy_return(prices: dict, start, end) -> Optional[float]:
 # --------------------------------------------------------------------------- #
 # Equity curve (event-derived cash + reconstructed holdings)
 # --------------------------------------------------------------------------- #
-def build_cash_timeline(positions: list[dict], balances: list[dict]):
-    """Merged, date-ordered list of cash re-anchors (authored balances) and
-    flows (buys -, sells +). Returns a cash_at(d) function or None if no cash."""
-    if not balances:
-        return None
-    timeline = []
-    for b in balances:
-        timeline.append((str(b["date"]), 0, float(b["amount"])))  # 0 = anchor (sorts first)
-    for p in positions:
-        mult = 100 if is_option(p) else 1
-        for ev in p.get("events", []) or []:
-            q, price, act = event_qty(ev), ev.get("price"), ev.get("action")
-            if q is None or price is None:
-                continue
-            flow = -q * mult * float(price) if act in BUY_ACTIONS else (q * mult * float(price) if act in SELL_ACTIONS else 0)
-            if flow:
-                timeline.append((str(ev["date"]), 1, flow))  # 1 = flow
-    timeline.sort(key=lambda x: (x[0], x[1]))
-
-    def cash_at(d):
-        running = None
-        ds = str(d)
-        for date_s, kind, val in timeline:
-            if date_s > ds:
-                break
-            running = val if kind == 0 else (running or 0) + val
-        return running
+# The curve used to be sampled date by date: for every grid date, every
+# position's events were re-scanned for quantity and option mark, the cash
+# timeline was walked from the start, and each ticker was looked up with
+# Series.asof -- O(dates x positions x events). The Ledger compiles events and
+# cash anchors once into sorted step functions; every grid date is then
+# resolved with one searchsorted per position, and prices are aligned to the
+# grid as arrays with the same as-of (forward-fill) semantics. That keeps a
+# daily-resolution curve, and a longer book, cheap.
+def _days(values) -> np.ndarray:
+    """Dates (str / date / Timestamp) as datetime64[D] for searchsorted."""
+    return np.array([str(v)[:10] for v in values], dtype="datetime64[D]")
+
+
+def asof_array(series: Optional[pd.Series], grid: pd.DatetimeIndex) -> np.ndarray:
+    """asof() for every grid date at once; NaN where there is no prior close."""
+    out = np.full(len(grid), np.nan)
+    if series is None or series.empty:
+        return out
+    s = series.dropna()
+    k = s.index.searchsorted(grid, side="right")
+    hit = k > 0
+    out[hit] = s.to_numpy(dtype=float)[k[hit] - 1]
+    return out
+
 
-    return cash_at
+def _step(days: np.ndarray, values: np.ndarray, grid_days: np.ndarray, before=np.nan) -> np.ndarray:
+    """Value of the last entry dated at or before each grid day (`days` sorted)."""
+    k = np.searchsorted(days, grid_days, side="right")
+    out = np.full(len(grid_days), before, dtype=float)
+    hit = k > 0
+    out[hit] = values[k[hit] - 1]
+    return out
 
 
-def build_series(positions: list[dict], prices: dict, cash_at, inception, as_of):
-    grid = pd.date_range(start=pd.Timestamp(inception), end=pd.Timestamp(as_of), freq="W-FRI")
-    if len(grid) == 0 or grid[-1] < pd.Timestamp(as_of):
-        grid = grid.append(pd.DatetimeIndex([pd.Timestamp(as_of)]))
+class Ledger:
+    """Position events and cash anchors compiled into step functions.
 
-    dates, port, spy = [], [], []
-    spy_series = prices.get(BENCHMARK)
-    base_port = None
-    base_spy = asof(spy_series, grid[0])
+    Per position: cumulative net quantity by event date, the stepwise option
+    mark, and cumulative cash flow (buys -, sells +). For the book: the cash
+    balance after each anchor (re-anchor) or flow, in (date, anchors-first)
+    order. Evaluating any of them on a grid is a searchsorted, not a rescan.
+    """
+
+    def __init__(self, positions: list[dict], balances: list[dict]):
+        self.positions = positions
+        self.ids = [p["id"] for p in positions]
+        self.qty_steps, self.flow_steps, self.marks = [], [], []
+        timeline = [(str(b["date"]), 0, float(b["amount"])) for b in balances]  # 0 = anchor
 
-    for d in grid:
-        holdings = 0.0
         for p in positions:
-            v = position_value_at(p, d, prices)
-            holdings += v if v is not None else 0.0
-        c = cash_at(d) if cash_at else 0.0
-        total = holdings + (c if c is not None else 0.0)
-        if base_port is None and total > 0:
-            base_port = total
-        dates.append(d.strftime("%Y-%m-%d"))
-        port.append(total)
-        spy.append(asof(spy_series, d))
-
-    base_port = base_port or 1.0
-    port_norm = [round(v / base_port * 100, 2) for v in port]
+            mult = 100 if is_option(p) else 1
+            evs = [e for e in (p.get("events") or []) if e.get("date")]
+            days = _days([e["date"] for e in evs])
+            order = np.argsort(days, kind="stable")
+
+            signed, flows = np.zeros(len(evs)), np.zeros(len(evs))
+            for i, ev in enumerate(evs):
+                q, price, act = event_qty(ev), ev.get("price"), ev.get("action")
+                if q is None:
+                    continue
+                sign = 1.0 if act in BUY_ACTIONS else (-1.0 if act in SELL_ACTIONS else 0.0)
+                signed[i] = sign * q
+                if price is not None and sign:
+                    flows[i] = -sign * q * mult * float(price)
+                    timeline.append((str(ev["date"]), 1, flows[i]))  # 1 = flow
+            self.qty_steps.append((days[order], np.cumsum(signed[order])))
+            self.flow_steps.append((days[order], np.cumsum(flows[order])))
+            self.marks.append(self._compile_mark(p, evs) if is_option(p) else None)
+
+        # Running cash after each timeline entry; a flow before the first
+        # anchor runs from zero (as the old cash_at walk did).
+        timeline.sort(key=lambda x: (x[0], x[1]))
+        running, cash = None, []
+        for _, kind, val in timeline:
+            running = val if kind == 0 else (running or 0) + val
+            cash.append(running)
+        self.has_cash = bool(balances)
+        self.cash_days = _days([t[0] for t in timeline])
+        self.cash_values = np.array(cash, dtype=float)
+
+    @staticmethod
+    def _compile_mark(p: dict, evs: list[dict]):
+        """Stepwise per-share premium (option_mark_at): the last priced event,
+        in file order, dated at or before d; current_mark from the final
+        event on."""
+        priced = [e for e in evs if e.get("price") is not None]
+        current = p.get("current_mark")
+        if not priced:
+            return None, None, None, current
+        days = _days([e["date"] for e in priced])
+        order = np.argsort(days, kind="stable")
+        last_in_file = np.maximum.accumulate(order)      # latest file position so far
+        prices = np.array([float(e["price"]) for e in priced])
+        return days[order], prices[last_in_file], days.max(), current
+
+    def quantities(self, grid_days: np.ndarray) -> np.ndarray:
+        """(dates x positions) net units held."""
+        return np.column_stack([_step(d, q, grid_days, 0.0) for d, q in self.qty_steps]) \
+            if self.qty_steps else np.zeros((len(grid_days), 0))
+
+    def cash_flows(self, grid_days: np.ndarray) -> np.ndarray:
+        """(dates x positions) cumulative trade cash (buys -, sells +)."""
+        return np.column_stack([_step(d, f, grid_days, 0.0) for d, f in self.flow_steps]) \
+            if self.flow_steps else np.zeros((len(grid_days), 0))
+
+    def option_marks(self, j: int, grid_days: np.ndarray) -> np.ndarray:
+        days, prices, last_day, current = self.marks[j]
+        if days is None:
+            return np.full(len(grid_days), np.nan if current is None else float(current))
+        out = _step(days, prices, grid_days)
+        if current is not None:
+            out[grid_days >= last_day] = float(current)
+        return out
+
+    def cash(self, grid_days: np.ndarray) -> np.ndarray:
+        if not self.has_cash:
+            return np.zeros(len(grid_days))
+        return np.nan_to_num(_step(self.cash_days, self.cash_values, grid_days), nan=0.0)
+
+    def values(self, grid: pd.DatetimeIndex, prices: dict) -> np.ndarray:
+        """(dates x positions) market value, rounded to cents; 0 when flat or
+        unpriced (the curve counts a missing price as zero, as before)."""
+        grid_days = grid.values.astype("datetime64[D]")
+        qty = self.quantities(grid_days)
+        vals = np.zeros_like(qty)
+        for j, p in enumerate(self.positions):
+            if is_option(p):       # n * 100 * mark, in that order (float parity)
+                v = qty[:, j] * 100 * self.option_marks(j, grid_days)
+            else:
+                v = qty[:, j] * asof_array(prices.get(str(p.get("ticker", "")).upper()), grid)
+            v = round_half_even(v, 2)
+            vals[:, j] = np.where((qty[:, j] == 0) | np.isnan(v), 0.0, v)
+        return vals
+
+
+def build_grid(inception, as_of, prices: dict, resolution: str = "weekly") -> pd.DatetimeIndex:
+    """W-FRI sample dates, or every SPY session in daily mode; as_of is
+    always the last point."""
+    start, end = pd.Timestamp(str(inception)), pd.Timestamp(str(as_of))
+    if resolution == "daily":
+        spy = prices.get(BENCHMARK)
+        if spy is not None and not spy.empty:
+            grid = spy.index[(spy.index >= start) & (spy.index <= end)].unique()
+        else:
+            grid = pd.bdate_range(start=start, end=end)
+    else:
+        grid = pd.date_range(start=start, end=end, freq="W-FRI")
+    if len(grid) == 0 or grid[-1] < end:
+        grid = grid.append(pd.DatetimeIndex([end]))
+    return grid
+
+
+def equity_curve(ledger: Ledger, prices: dict, grid: pd.DatetimeIndex) -> dict:
+    """Full-resolution curve: position values, cash and total book value per
+    grid date, plus SPY closes."""
+    values = ledger.values(grid, prices)
+    holdings = np.zeros(len(grid))
+    for j in range(values.shape[1]):        # position order, as the old per-date sum
+        holdings += values[:, j]
+    total = holdings + ledger.cash(grid.values.astype("datetime64[D]"))
+    return {"grid": grid, "values": values, "total": total,
+            "spy": asof_array(prices.get(BENCHMARK), grid)}
+
+
+def build_series(curve: dict) -> dict:
+    """Normalised (base 100) portfolio and SPY lines for the chart."""
+    total, spy = curve["total"], curve["spy"]
+    positive = np.flatnonzero(total > 0)
+    base_port = total[positive[0]] if len(positive) else 1.0
+    port_norm = round_half_even(total / base_port * 100, 2)
+    base_spy = spy[0] if len(spy) and not np.isnan(spy[0]) else None
     if base_spy:
-        spy_norm = [round((v / base_spy * 100), 2) if v else None for v in spy]
+        spy_norm = round_half_even(spy / base_spy * 100, 2)
+        spy_list = [float(v) if (s and not np.isnan(s)) else None for v, s in zip(spy_norm, spy)]
     else:
-        spy_norm = [None] * len(dates)
-    return {"dates": dates, "portfolio": port_norm, "spy": spy_norm}
+        spy_list = [None] * len(total)
+    return {
+        "dates": [d.strftime("%Y-%m-%d") for d in curve["grid"]],
+        "portfolio": port_norm.tolist(),
+        "spy": spy_list,
+    }
 
 
 def max_drawdown(norm: list[float]) -> float:
@@ -343,6 +442,119 @@ def max_drawdown(norm: list[float]) -> float:
     return round(mdd, 1)
 
 
+# --------------------------------------------------------------------------- #
+# Daily mode: risk metrics and a bounded chart payload
+# --------------------------------------------------------------------------- #
+def _rounded(values, ndigits: int = 2) -> list:
+    return [None if not np.isfinite(v) else float(v) for v in round_half_even(values, ndigits)]
+
+
+def _underwater(values: np.ndarray) -> np.ndarray:
+    """Sessions since the last high-water mark, per date."""
+    idx = np.arange(len(values))
+    at_peak = values >= np.maximum.accumulate(values)
+    return idx - np.maximum.accumulate(np.where(at_peak, idx, 0))
+
+
+def risk_metrics(curve: dict, ledger: Ledger, risk_free_pct: float = 0.0,
+                 window: int = RISK_WINDOW) -> dict:
+    """Daily-return risk statistics for the book, all as array ops:
+
+    volatility / Sharpe / Sortino (annualised, over the whole window), beta
+    to SPY, rolling volatility and beta, drawdown and underwater duration,
+    and each position's cumulative contribution in percentage points (its
+    P&L for the session over the prior day's book value).
+    """
+    grid, total, spy = curve["grid"], curve["total"], curve["spy"]
+    prev = total[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(prev > 0, total[1:] / prev - 1, np.nan)
+        rs = spy[1:] / spy[:-1] - 1
+    excess = r - risk_free_pct / 100 / TRADING_DAYS
+    ann = math.sqrt(TRADING_DAYS)
+
+    ok = np.isfinite(excess)
+    vol = sharpe = sortino = beta = None
+    if ok.sum() >= 2:
+        sd = np.std(r[ok], ddof=1)
+        vol = sd * ann * 100
+        sharpe = np.mean(excess[ok]) / sd * ann if sd > 0 else None
+        downside = math.sqrt(np.mean(np.minimum(excess[ok], 0.0) ** 2))
+        sortino = np.mean(excess[ok]) / downside * ann if downside > 0 else None
+    both = ok & np.isfinite(rs)
+    if both.sum() >= 2 and np.var(rs[both], ddof=1) > 0:
+        beta = np.cov(r[both], rs[both])[0, 1] / np.var(rs[both], ddof=1)
+
+    ret = pd.Series(r)
+    bench = pd.Series(rs)
+    rolling_vol = ret.rolling(window, min_periods=window).std() * ann * 100
+    rolling_beta = ret.rolling(window, min_periods=window).cov(bench) \
+        / bench.rolling(window, min_periods=window).var()
+
+    peak = np.maximum.accumulate(total)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, (total / peak - 1) * 100, 0.0)
+    underwater = _underwater(total)
+    worst = int(np.argmax(underwater)) if len(underwater) else 0
+    underwater_days = (grid[worst] - grid[worst - underwater[worst]]).days if len(grid) else 0
+
+    # P&L per position per session = change in value + trade cash (a buy
+    # moves value into the position and cash out of the book, netting to 0).
+    values = curve["values"]
+    flows = ledger.cash_flows(grid.values.astype("datetime64[D]"))
+    pnl = np.diff(values, axis=0) + np.diff(flows, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        contrib = np.where(prev[:, None] > 0, pnl / prev[:, None] * 100, 0.0)
+    contrib = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(contrib, axis=0)])
+
+    lead = [np.nan]            # returns start on the second date
+    return {
+        "window_sessions": window,
+        "risk_free_pct": risk_free_pct,
+        "volatility_pct": round(vol, 1) if vol is not None else None,
+        "sharpe": round(sharpe, 2) if sharpe is not None else None,
+        "sortino": round(sortino, 2) if sortino is not None else None,
+        "beta": round(beta, 2) if beta is not None else None,
+        "max_underwater_sessions": int(underwater.max()) if len(underwater) else 0,
+        "max_underwater_days": underwater_days,
+        "current_underwater_sessions": int(underwater[-1]) if len(underwater) else 0,
+        "_series": {
+            "rolling_vol_pct": np.r_[lead, rolling_vol.to_numpy()],
+            "rolling_beta": np.r_[lead, rolling_beta.to_numpy()],
+            "drawdown_pct": drawdown,
+            "underwater_sessions": underwater.astype(float),
+        },
+        "_contribution": contrib,
+    }
+
+
+def downsample_index(n: int, max_points: int = MAX_CHART_POINTS, keep=()) -> np.ndarray:
+    """Evenly spaced indices into an n-point series (first and last always
+    kept, plus `keep`, e.g. the drawdown trough), at most ~max_points."""
+    if n <= max_points:
+        return np.arange(n)
+    idx = np.linspace(0, n - 1, max_points).round().astype(int)
+    return np.unique(np.r_[idx, np.asarray(keep, dtype=int)])
+
+
+def chart_payload(series: dict, risk: dict, ledger: Ledger, idx: np.ndarray) -> tuple[dict, dict]:
+    """(chart series, risk block) sampled at `idx`; headline statistics were
+    computed on the full-resolution curve before this."""
+    pick = idx.tolist()
+    out_series = {k: [v[i] for i in pick] for k, v in series.items()}
+    block = {k: v for k, v in risk.items() if not k.startswith("_")}
+    block["series"] = {"dates": out_series["dates"]}
+    for k, v in risk["_series"].items():
+        block["series"][k] = _rounded(v[idx], 0 if k == "underwater_sessions" else 2)
+    contrib = risk["_contribution"]
+    block["contribution"] = {
+        "dates": out_series["dates"],
+        "positions": {pid: _rounded(contrib[idx, j], 2)
+                      for j, pid in enumerate(ledger.ids) if np.any(contrib[:, j])},
+    }
+    return out_series, block
+
+
 # --------------------------------------------------------------------------- #
 # Build
 # --------------------------------------------------------------------------- #
@@ -350,7 +562,7 @@ def main() -> int:
     cfg = load_config()
     all_positions = load_positions()
     balances = load_cash()
-    prices = load_prices()
+    prices, fetched_at = load_prices()
 
     warnings: list[str] = []
     fatal: list[str] = []
@@ -365,7 +577,7 @@ def main() -> int:
     # inception / as_of
     ev_dates = [str(ev["date"]) for p in published for ev in (p.get("events") or []) if ev.get("date")]
     inception = cfg.get("inception") or (min(ev_dates) if ev_dates else None)
-    as_of = price_fetched_at(prices) or date.today().isoformat()
+    as_of = fetched_at or date.today().isoformat()
     if not inception:
         print("No published positions with events. Writing empty artifacts.")
         inception = as_of
@@ -389,9 +601,11 @@ def main() -> int:
         if is_option(p) and not a["marked"]:
             warnings.append(f"{p['id']} ({p.get('ticker')}): option has no current_mark — using last premium")
 
-    # equity curve
-    cash_at = build_cash_timeline(published, balances)
-    series = build_series(published, prices, cash_at, inception, as_of)
+    # equity curve (headline numbers from the full-resolution series)
+    resolution = cfg["resolution"]
+    ledger = Ledger(published, balances)
+    curve = equity_curve(ledger, prices, build_grid(inception, as_of, prices, resolution))
+    series = build_series(curve)
     mdd = max_drawdown(series["portfolio"])
     headline_return = round(series["portfolio"][-1] - 100, 1) if series["portfolio"] else 0.0
     spy_vals = [v for v in series["spy"] if v is not None]
@@ -399,6 +613,13 @@ def main() -> int:
     if spy_return_pct is None:
         fatal.append("benchmark series empty over window — refusing to emit unbenchmarked returns")
 
+    risk = None
+    if resolution == "daily":
+        risk = risk_metrics(curve, ledger, float(cfg.get("risk_free_pct") or 0.0))
+        trough = int(np.argmin(risk["_series"]["drawdown_pct"]))
+        series, risk = chart_payload(series, risk, ledger,
+                                     downsample_index(len(curve["grid"]), keep=[trough]))
+
     current_cash = float(balances[-1]["amount"]) if balances else None
 
     # markers (one per event)
@@ -469,6 +690,7 @@ def main() -> int:
         "inception": inception,
         "as_of": as_of,
         "refresh_mode": cfg.get("refresh_mode", "A"),
+        "resolution": resolution,
         "cash": round(current_cash, 2) if current_cash is not None else None,
         "headline": {
             "return_pct": headline_return,
@@ -486,6 +708,8 @@ def main() -> int:
         ),
         "integrity": {"ok": len(fatal) == 0, "warnings": warnings, "errors": fatal},
     }
+    if risk is not None:
+        book["risk"] = risk
 
     # ----- scoreboard ----- #
     rows = []
@@ -562,6 +786,10 @@ def main() -> int:
     print(f"\nWrote {BOOK_OUT.relative_to(ROOT)} and {SCOREBOARD_OUT.relative_to(ROOT)}")
     print(f"  inception {inception} → as_of {as_of}  |  refresh mode {cfg.get('refresh_mode')}")
     print(f"  return {headline_return}%  vs SPY {spy_return_pct}%  |  max DD {mdd}%  |  open {len(open_positions)}  |  rows {len(rows)}")
+    if risk is not None:
+        print(f"  daily: vol {risk['volatility_pct']}%  |  Sharpe {risk['sharpe']}  |  Sortino {risk['sortino']}  "
+              f"|  beta {risk['beta']}  |  longest underwater {risk['max_underwater_sessions']} sessions  "
+              f"|  chart {len(series['dates'])}/{len(curve['grid'])} points")
     return 0
 
 
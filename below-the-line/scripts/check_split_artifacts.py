@@ -30,11 +30,11 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-import time
-import urllib.request
 from datetime import datetime, timezone
 from pathlib import Path
 
+import http_client
+
 REPO = Path(__file__).resolve().parent.parent
 DATA_DIRS = [REPO / 'assets' / 'data', REPO / 'static' / 'data']
 CACHE = REPO / 'scripts' / '.split_check_cache.json'
@@ -43,9 +43,6 @@ LOOKBACK_DAYS = 45
 TOLERANCE = 0.12        # how close line/price must be to the split ratio
 TIMEOUT = 15            # hard per-request ceiling; no retries, no backoff
 
-UA = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'}
-
 
 def load(name: str):
     for d in DATA_DIRS:
@@ -60,11 +57,11 @@ def recent_splits(symbol: str) -> list[tuple[str, float, int]]:
     url = (f'https://query2.finance.yahoo.com/v8/finance/chart/'
            f'{symbol.replace(".", "-")}?interval=1d&range=3mo&events=split')
     try:
-        with urllib.request.urlopen(
-                urllib.request.Request(url, headers=UA), timeout=TIMEOUT) as r:
-            data = json.load(r)
-    except Exception as e:
-        return [('ERROR', 0.0, -1)] if 'HTTP Error 429' in str(e) else []
+        data = http_client.get_json(url, timeout=TIMEOUT, retries=0)
+    except http_client.HttpError as e:
+        return [('ERROR', 0.0, -1)] if e.status == 429 else []
+    except Exception:
+        return []
 
     events = ((data.get('chart') or {}).get('result') or [{}])[0].get('events') or {}
     now = datetime.now(timezone.utc)
@@ -111,6 +108,7 @@ def main() -> None:
 
     # Drop any ERROR entries an older build may have written, so a poisoned
     # cache re-probes instead of replaying a rate-limit failure forever.
+    http_client.set_delay(http_client.YAHOO_HOSTS, args.delay)
     cache = json.loads(CACHE.read_text()) if CACHE.exists() else {}
     cache = {k: v for k, v in cache.items()
              if not (v and isinstance(v, list) and v and v[0] and v[0][0] == 'ERROR')}
@@ -127,7 +125,6 @@ def main() -> None:
         else:
             sp = recent_splits(sym)
             cache[sym] = sp
-            time.sleep(args.delay)
             if i % 25 == 0:
                 CACHE.write_text(json.dumps(cache))
 
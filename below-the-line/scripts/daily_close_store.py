@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Local daily-close store with incremental appends, shared by the options
+screener and fetch_prices.py.
+
+options_screener.py downloaded a fresh year of daily closes for every symbol
+on every run just to feed realized_vol, and fetch_prices.py re-downloaded
+each portfolio ticker's daily history from inception. Both now read this
+store, which keeps each symbol's adjusted daily closes on disk and asks
+Yahoo only for the sessions it is missing.
+
+Layout (scripts/.daily_close_store/, gitignored):
+
+  <SYMBOL>.npy    structured NumPy array, one row per session:
+                    day (int32, days since 1970-01-01 in exchange-local
+                    date), close (float64, split/dividend adjusted)
+  <SYMBOL>.json   sidecar: first requested start, last session, when the
+                  last full fetch happened
+
+Closes come from the Yahoo chart endpoint through http_client (pooled,
+rate-limited) as `adjclose`, the same series yfinance's auto_adjust=True
+Close produces. Because they are adjusted, a dividend or split restates
+every earlier close, so the whole range is refetched when:
+
+  - the overlapping settled closes no longer match what is stored,
+  - a new session carries a dividend or split event,
+  - a caller asks for history earlier than the stored start, or
+  - the last full fetch is older than FULL_REFRESH_DAYS (safety net), or
+  - the caller passes force_full.
+
+restatement_reason() is the overlap check; fetch_prices.py applies the same
+one (and the same tolerance) to its committed JSON files.
+
+realized_vols() computes annualised realised volatility for several windows
+(20/60/120 sessions by default) in one pass over the returns.
+
+DAILY_CLOSE_STORE=off disables the store and fetches the full range every call.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import http_client
+
+STORE_DIR = Path(__file__).parent / '.daily_close_store'
+
+OVERLAP_SESSIONS = 5        # stored sessions re-fetched and compared each run
+FULL_REFRESH_DAYS = 90      # refetch the full range at least this often
+CLOSE_RTOL = 1e-5           # overlap closes must match to this tolerance
+
+VOL_WINDOWS = (20, 60, 120)
+MIN_VOL_PRICES = 20         # fewer prices than this: no vol (as realized_vol)
+
+CLOSE_DTYPE = np.dtype([('day', 'i4'), ('close', 'f8')])
+
+_CHART = 'https://query2.finance.yahoo.com/v8/finance/chart/{symbol}'
+
+
+def store_enabled() -> bool:
+    return os.environ.get('DAILY_CLOSE_STORE', 'on').lower() not in ('off', 'false', '0')
+
+
+def epoch_day(d) -> int:
+    """Session date (anything pd.Timestamp accepts) as days since 1970-01-01."""
+    return (pd.Timestamp(d).date() - date(1970, 1, 1)).days
+
+
+def day_iso(day: int) -> str:
+    return (date(1970, 1, 1) + timedelta(days=int(day))).isoformat()
+
+
+# ── Fetch ───────────────────────────────────────────────────────────────────
+
+def fetch_chart(symbol: str, start_day: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(sessions from start_day to now, days carrying a dividend or split
+    event). Raises on network failure."""
+    params = 'interval=1d&events=div%2Csplit&includeAdjustedClose=true'
+    if start_day is None:
+        params += '&range=max'
+    else:
+        now = int(datetime.now(timezone.utc).timestamp()) + 86400
+        params += f'&period1={max(0, start_day - 1) * 86400}&period2={now}'
+    d = http_client.get_json(_CHART.format(symbol=symbol.replace('.', '-')) + '?' + params)
+    res = ((d or {}).get('chart') or {}).get('result') or []
+    if not res:
+        return np.empty(0, dtype=CLOSE_DTYPE), np.empty(0, dtype='i4')
+    res = res[0]
+    ts = res.get('timestamp') or []
+    ind = res.get('indicators') or {}
+    closes = ((ind.get('adjclose') or [{}])[0].get('adjclose')
+              or ((ind.get('quote') or [{}])[0].get('close')) or [])
+    offset = int((res.get('meta') or {}).get('gmtoffset') or 0)
+    rows = [((t + offset) // 86400, c) for t, c in zip(ts, closes) if c is not None]
+    events = res.get('events') or {}
+    event_days = np.array([(int(ev['date']) + offset) // 86400
+                           for kind in ('dividends', 'splits')
+                           for ev in (events.get(kind) or {}).values() if 'date' in ev],
+                          dtype='i4')
+    if not rows:
+        return np.empty(0, dtype=CLOSE_DTYPE), event_days
+    bars = np.array(rows, dtype=CLOSE_DTYPE)
+    # The live session can arrive twice (bar + current quote): keep the last.
+    _, last = np.unique(bars['day'][::-1], return_index=True)
+    bars = bars[::-1][last]
+    if start_day is not None:
+        bars = bars[bars['day'] >= start_day]
+    return bars, event_days
+
+
+# ── On-disk format ──────────────────────────────────────────────────────────
+
+def _paths(symbol: str) -> Tuple[Path, Path]:
+    safe = symbol.replace('/', '_')
+    return STORE_DIR / f'{safe}.npy', STORE_DIR / f'{safe}.json'
+
+
+def load(symbol: str) -> Tuple[Optional[np.ndarray], dict]:
+    """Stored sessions and sidecar, or (None, {}) if absent or unreadable."""
+    npy, meta_path = _paths(symbol)
+    if not (npy.exists() and meta_path.exists()):
+        return None, {}
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        bars = np.load(npy)
+        if bars.dtype != CLOSE_DTYPE or len(bars) == 0:
+            return None, {}
+        return bars, meta
+    except Exception:
+        return None, {}
+
+
+def save(symbol: str, bars: np.ndarray, full: bool, meta: Optional[dict] = None) -> None:
+    """Write sessions + sidecar atomically (temp file, then rename)."""
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    npy, meta_path = _paths(symbol)
+    meta = dict(meta or {})
+    meta['rows'] = int(len(bars))
+    meta['last_date'] = day_iso(bars['day'][-1])
+    meta['updated_at'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    if full:
+        meta['full_fetched_at'] = meta['updated_at']
+
+    tmp = npy.with_name(npy.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.save(f, np.ascontiguousarray(bars, dtype=CLOSE_DTYPE))
+    os.replace(tmp, npy)
+    tmp = meta_path.with_name(meta_path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, separators=(',', ':'))
+    os.replace(tmp, meta_path)
+
+
+# ── Incremental update ──────────────────────────────────────────────────────
+
+def restatement_reason(stored_days: np.ndarray, stored_closes: np.ndarray,
+                       fresh: np.ndarray, event_days: np.ndarray,
+                       decimals: Optional[int] = None) -> Optional[str]:
+    """Why `fresh` (fetch_chart rows) cannot be appended to stored sessions,
+    or None. Also used by fetch_prices.py against its JSON files.
+
+    The stored last session may have been captured intraday; only the ones
+    before it are expected to be final. They must match the fresh closes to
+    CLOSE_RTOL, plus half a rounding step when they were stored rounded to
+    `decimals` places.
+    """
+    settled_days, settled = stored_days[:-1], stored_closes[:-1]
+    common, s_idx, f_idx = np.intersect1d(settled_days, fresh['day'], return_indices=True)
+    if len(common) == 0:
+        return 'no overlapping sessions'
+    atol = 0.0 if decimals is None else 0.5 * 10.0 ** -decimals
+    if not np.allclose(settled[s_idx], fresh['close'][f_idx], rtol=CLOSE_RTOL, atol=atol):
+        return 'overlapping closes restated'
+    if np.any(event_days > settled_days[-1]):
+        return 'dividend or split in new sessions'
+    return None
+
+
+def needs_full_refresh(stored: np.ndarray, fresh: np.ndarray, event_days: np.ndarray,
+                       meta: dict) -> Optional[str]:
+    """Decide whether the tail fetch can be appended. Returns a reason if not."""
+    full_at = meta.get('full_fetched_at')
+    if not full_at:
+        return 'no full fetch on record'
+    age = (datetime.now(timezone.utc)
+           - datetime.strptime(full_at, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc))
+    if age.days >= FULL_REFRESH_DAYS:
+        return f'last full fetch {age.days}d ago'
+    return restatement_reason(stored['day'], stored['close'], fresh, event_days)
+
+
+def get_daily_closes(symbol: str, start: Optional[str] = None,
+                     force_full: bool = False) -> pd.Series:
+    """Adjusted daily closes for `symbol` from `start` (YYYY-MM-DD; None =
+    full history), indexed by session date. Empty Series when Yahoo has
+    nothing. Fetches only the missing tail when the store can be trusted;
+    force_full refetches the whole range whatever the store holds (for a
+    caller that has already seen history restated)."""
+    start = pd.Timestamp(start).strftime('%Y-%m-%d') if start else None
+    start_day = epoch_day(start) if start else None
+    stored, meta = load(symbol) if store_enabled() else (None, {})
+    bars = None
+    fetch_start = start
+
+    if stored is not None:
+        stored_start = meta.get('start')           # None = full history
+        if stored_start is None or (start is not None and stored_start <= start):
+            # A refetch keeps the wider of the stored and requested ranges.
+            fetch_start = stored_start
+            if not force_full:
+                tail_from = int(stored['day'][max(0, len(stored) - OVERLAP_SESSIONS)])
+                fresh, event_days = fetch_chart(symbol, tail_from)
+                if len(fresh):
+                    reason = needs_full_refresh(stored, fresh, event_days, meta)
+                    if reason is None:
+                        bars = np.concatenate([stored[stored['day'] < fresh['day'][0]], fresh])
+                        save(symbol, bars, full=False, meta=meta)
+                    else:
+                        print(f"  ↻ {symbol}: daily closes refetched ({reason})")
+
+    if bars is None:
+        bars, _ = fetch_chart(symbol, epoch_day(fetch_start) if fetch_start else None)
+        if not len(bars):
+            return pd.Series(dtype=float)
+        if store_enabled():
+            save(symbol, bars, full=True, meta={'start': fetch_start})
+
+    if start_day is not None:
+        bars = bars[bars['day'] >= start_day]
+    index = pd.to_datetime(bars['day'].astype('datetime64[D]'))
+    return pd.Series(bars['close'], index=index, name=symbol)
+
+
+# ── Realised volatility ─────────────────────────────────────────────────────
+
+def realized_vols(closes, windows=VOL_WINDOWS) -> dict:
+    """Annualised realised volatility of daily log returns over each window
+    (in sessions), as {window: vol or None}.
+
+    Matches options_screener.realized_vol for one window: the last
+    window + 1 positive closes, sample stdev, sqrt(252), None below
+    MIN_VOL_PRICES prices. Suffix sums of the returns give every window in
+    one pass.
+    """
+    px = np.asarray(closes, dtype=float)
+    px = px[np.isfinite(px) & (px > 0)]
+    out = {w: None for w in windows}
+    if len(px) < 2:
+        return out
+    rets = np.diff(np.log(px))[::-1]                 # newest first
+    rets = rets[:max(windows)]
+    centre = rets.mean()
+    dev = rets - centre
+    s1 = np.cumsum(dev)
+    s2 = np.cumsum(dev * dev)
+    for w in windows:
+        n = min(w, len(rets))
+        if n + 1 < MIN_VOL_PRICES or n < 2:
+            continue
+        mean = s1[n - 1] / n
+        var = (s2[n - 1] - n * mean * mean) / (n - 1)
+        out[w] = math.sqrt(max(var, 0.0)) * math.sqrt(252)
+    return out
@@ -34,19 +34,35 @@ sigmas; do not present them as z-scores):
   fcf_yield_vs_hist_pp  Current FCF yield minus own recent annual mean.
                         + = cheaper on cash flow than its own recent norm.
 
+The post-pass is columnar (one pandas groupby for sector median/sd, array
+ops for percentiles and stack flags). Its universe distributions are saved
+to dislocation_sector_stats.json; a mid-week re-score of a few tickers
+(update_stocks.py --rescore) passes them back in instead of needing the
+whole universe.
+
 dislocation_stack counts aligned cheapness signals (0-6). earnings_quality is
 a gate, not a stack member: a deteriorating accrual gap sets quality_warning
 instead of adding to the stack.
 
+yield_dislocation_z and drawdown_z work on the series arrays directly;
+dislocation_history() emits both for every historical week in one
+cumulative-sum pass (rolling_zscores). The last CHART_WEEKS of it ship as
+dislocation.chart and are plotted on the stock page.
+
 Known v1 caveats:
 - Dividend yields are computed on the adjusted-price series, which slightly
   inflates older yields for long-history payers; the 10-yr window bounds this.
 - Annual-statement deltas are coarse by construction (4 data points).
 """
 
+import json
 import math
+import os
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 # Thresholds for the stack
@@ -57,8 +73,23 @@ FCF_VS_HIST_THRESHOLD = 2.0      # pp cheaper than own recent norm
 ACCRUAL_DETERIORATING = 3.0      # pp of revenue
 ACCRUAL_IMPROVING = -3.0
 
+# Cross-sectional minimums
+MIN_SECTOR_N = 8                 # stocks with pct_from_wma per sector
+MIN_INSIDER_N = 10               # stocks with insider buying
+
+# Stack members, in display order
+STACK_SIGNALS = ('yield', 'drawdown', 'sector', 'buyback', 'insider', 'value_vs_history')
+
+# Written by each full run; read back for partial re-scores
+SECTOR_STATS_FILE = Path(__file__).parent.parent / 'assets' / 'data' / 'dislocation_sector_stats.json'
+
 YIELD_WINDOW_WEEKS = 520         # 10 years
 MIN_YIELD_WEEKS = 156            # 3 years of payment history
+CHART_WEEKS = 260                # 5 years of weekly history on the stock page
+
+# rolling_zscores: variances below this fraction of the running mean square
+# are within rounding of zero and get recomputed exactly
+VAR_RTOL = 1e-6
 
 
 def _clean(vals):
@@ -66,33 +97,78 @@ def _clean(vals):
             if v is not None and not (isinstance(v, float) and math.isnan(v))]
 
 
-def _zscore(current: float, history: list, min_n: int) -> Optional[float]:
-    vals = _clean(history)
+def _zscore(current: float, history: np.ndarray, min_n: int) -> Optional[float]:
+    """`current` vs the mean / population sd of `history` (NaN ignored)."""
+    vals = np.asarray(history, dtype=float)
+    vals = vals[~np.isnan(vals)]
     if current is None or len(vals) < min_n:
         return None
-    mu = sum(vals) / len(vals)
-    var = sum((v - mu) ** 2 for v in vals) / len(vals)
-    sd = math.sqrt(var)
+    mu = vals.mean()
+    sd = math.sqrt(((vals - mu) ** 2).mean())
     if sd < 1e-9:
         return None
     return round((float(current) - mu) / sd, 2)
 
 
-def yield_dislocation_z(df: pd.DataFrame) -> Optional[float]:
-    """TTM dividend yield vs the stock's own trailing 10-yr yield distribution."""
+def rolling_zscores(values, min_n: int, window: Optional[int] = None) -> np.ndarray:
+    """z-score of every value against the `window` values before it (all
+    earlier values when None), as _zscore would compute it week by week.
+
+    One pass of cumulative sums over the centred series instead of a mean
+    and variance per week. NaN where fewer than `min_n` prior values, no
+    spread, or the value itself is NaN. `window` counts positions, so pass
+    a series with gaps already dropped.
+    """
+    x = np.asarray(values, dtype=float)
+    ok = ~np.isnan(x)
+    c = np.where(ok, x - (x[ok].mean() if ok.any() else 0.0), 0.0)
+    s1 = np.concatenate(([0.0], np.cumsum(c)))
+    s2 = np.concatenate(([0.0], np.cumsum(c * c)))
+    cnt = np.concatenate(([0], np.cumsum(ok)))
+    i = np.arange(len(x))
+    lo = np.zeros(len(x), dtype=int) if window is None else np.maximum(i - window, 0)
+    n = cnt[i] - cnt[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mu = (s1[i] - s1[lo]) / n
+        var = (s2[i] - s2[lo]) / n - mu * mu
+        # Differencing running sums leaves residue on the order of eps times
+        # everything summed so far, so a flat window can come out with a
+        # tiny positive variance (and |z| in the millions). Windows whose
+        # variance is that close to the noise floor are recomputed exactly.
+        floor = VAR_RTOL * s2[i] / np.maximum(cnt[i], 1)
+    for t in np.flatnonzero(ok & (n >= min_n) & (var <= floor)):
+        w = c[lo[t]:t][ok[lo[t]:t]]
+        mu[t] = w.mean()
+        var[t] = ((w - mu[t]) ** 2).mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sd = np.sqrt(np.maximum(var, 0.0))
+        z = (c - mu) / sd
+    z[(n < min_n) | (sd < 1e-9) | ~ok] = np.nan
+    return z
+
+
+def _dividend_yield(df: pd.DataFrame) -> Optional[pd.Series]:
+    """Weekly TTM dividend yield (%), paying weeks only."""
     if 'Dividends' not in df.columns:
         return None
+    ttm = df['Dividends'].rolling(window=52, min_periods=40).sum()
+    yld = ((ttm / df['adjusted_close']) * 100.0).dropna()
+    return yld[yld > 0]
+
+
+def yield_dislocation_z(df: pd.DataFrame) -> Optional[float]:
+    """TTM dividend yield vs the stock's own trailing 10-yr yield distribution."""
     try:
-        ttm = df['Dividends'].rolling(window=52, min_periods=40).sum()
-        yld = (ttm / df['adjusted_close']) * 100.0
-        yld = yld.dropna()
-        yld = yld[yld > 0].tail(YIELD_WINDOW_WEEKS)
-        if len(yld) < MIN_YIELD_WEEKS:
+        yld = _dividend_yield(df)
+        if yld is None:
+            return None
+        vals = yld.to_numpy()[-YIELD_WINDOW_WEEKS:]
+        if len(vals) < MIN_YIELD_WEEKS:
             return None
-        current = float(yld.iloc[-1])
+        current = float(vals[-1])
         if current <= 0:
             return None
-        return _zscore(current, list(yld.iloc[:-1]), min_n=MIN_YIELD_WEEKS - 1)
+        return _zscore(current, vals[:-1], min_n=MIN_YIELD_WEEKS - 1)
     except Exception:
         return None
 
@@ -103,16 +179,53 @@ def drawdown_z(df: pd.DataFrame) -> Optional[float]:
     Sign-flipped so positive = unusually far BELOW its own norm.
     """
     try:
-        series = df['pct_from_wma'].dropna()
-        if len(series) < 104:
+        vals = df['pct_from_wma'].dropna().to_numpy(dtype=float)
+        if len(vals) < 104:
             return None
-        current = float(series.iloc[-1])
-        z = _zscore(current, list(series.iloc[:-1]), min_n=103)
+        z = _zscore(float(vals[-1]), vals[:-1], min_n=103)
         return None if z is None else round(-z, 2)
     except Exception:
         return None
 
 
+def dislocation_history(df: pd.DataFrame) -> pd.DataFrame:
+    """yield_dislocation_z and drawdown_z as of every week in `df`, each
+    using only the data up to that week (NaN where not yet defined).
+
+    Feeds dislocation_chart(). Row t matches the point-in-time functions
+    run on df up to t (to rounding), including their carry-forward of the
+    last paying week / last non-null pct_from_wma.
+    """
+    out = pd.DataFrame(index=df.index)
+    yld = _dividend_yield(df)
+    if yld is not None and len(yld):
+        z = rolling_zscores(yld.to_numpy(), min_n=MIN_YIELD_WEEKS - 1,
+                            window=YIELD_WINDOW_WEEKS - 1)
+        out['yield_dislocation_z'] = (pd.Series(z, index=yld.index).round(2)
+                                      .reindex(df.index, method='ffill'))
+    else:
+        out['yield_dislocation_z'] = np.nan
+    pct = df['pct_from_wma'].dropna()
+    z = rolling_zscores(pct.to_numpy(dtype=float), min_n=103)
+    out['drawdown_z'] = -(pd.Series(z, index=pct.index).round(2)
+                          .reindex(df.index, method='ffill'))
+    return out
+
+
+def dislocation_chart(df: pd.DataFrame, weeks: int = CHART_WEEKS) -> Optional[dict]:
+    """Last `weeks` of dislocation_history() as a chart payload (None for
+    weeks before a score is defined), or None if neither score ever is."""
+    try:
+        hist = dislocation_history(df).iloc[-weeks:]
+    except Exception:
+        return None
+    if hist.isna().all().all():
+        return None
+    series = {col: [None if np.isnan(v) else float(v) for v in hist[col].to_numpy()]
+              for col in ('yield_dislocation_z', 'drawdown_z')}
+    return {'labels': [d.strftime('%Y-%m-%d') for d in hist.index], **series}
+
+
 def buyback_accel_pp(fundamentals: dict) -> Optional[float]:
     """YoY share-count change minus 3-yr annualized change. − = accelerating buybacks."""
     yoy = fundamentals.get('shares_change_yoy')
@@ -183,6 +296,7 @@ def compute_stock_dislocation(df: pd.DataFrame, fundamentals: dict) -> dict:
         'accrual_gap_trend_pp': trend_pp,
         'earnings_quality': quality,
         'fcf_yield_vs_hist_pp': fcf_yield_vs_hist_pp(fundamentals),
+        'chart': dislocation_chart(df),
         # Filled in post-pass:
         'sector_relative_z': None,
         'insider_intensity_pct': None,
@@ -192,76 +306,123 @@ def compute_stock_dislocation(df: pd.DataFrame, fundamentals: dict) -> dict:
     }
 
 
-def apply_cross_sectional_dislocation(all_stocks: list) -> None:
+def _column(values) -> np.ndarray:
+    """Float column with None -> NaN (NaN never passes a threshold test)."""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def cross_sectional_stats(all_stocks: list) -> dict:
+    """Universe distributions the post-pass scores against, JSON-ready.
+
+    sectors            sector -> {n, median, sd} of pct_from_wma (population
+                       sd); only sectors with n >= MIN_SECTOR_N and a real
+                       spread are used for sector_relative_z
+    insider_intensity  ascending TTM insider buy $ / market cap of every
+                       stock with insider buying
+    """
+    frame = pd.DataFrame({
+        'sector': [s.get('sector') or '' for s in all_stocks],
+        'pct': _column(s.get('pct_from_wma') for s in all_stocks),
+    })
+    frame = frame[(frame['sector'] != '') & frame['pct'].notna()]
+    grouped = frame.groupby('sector', sort=False)['pct']
+    agg = pd.DataFrame({'n': grouped.size(), 'median': grouped.median(),
+                        'sd': grouped.std(ddof=0)})
+    sectors = {sector: {'n': int(n), 'median': float(med), 'sd': float(sd)}
+               for sector, n, med, sd in zip(agg.index, agg['n'], agg['median'], agg['sd'])}
+
+    totals = np.nan_to_num(_column(s.get('insider_buy_total_12m') for s in all_stocks))
+    mcaps = _column(s.get('market_cap') for s in all_stocks)
+    buyers = (totals > 0) & (mcaps > 0)
+    return {
+        'generated_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'sectors': sectors,
+        'insider_intensity': np.sort(totals[buyers] / mcaps[buyers]).tolist(),
+    }
+
+
+def save_cross_sectional_stats(stats: dict, path: Path = SECTOR_STATS_FILE) -> None:
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(stats, f, indent=1)
+    os.replace(tmp, path)
+
+
+def load_cross_sectional_stats(path: Path = SECTOR_STATS_FILE) -> Optional[dict]:
+    """Distributions saved by the last full run (None if missing/unreadable)."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def apply_cross_sectional_dislocation(all_stocks: list, stats: Optional[dict] = None) -> dict:
     """Post-pass over the full universe. Mutates stocks in place.
 
-    Must run AFTER sector metadata has been merged onto each stock.
+    Must run AFTER sector metadata has been merged onto each stock. With
+    `stats` (e.g. load_cross_sectional_stats()) the stocks are scored against
+    those saved distributions instead of each other, so a mid-week re-score
+    of a few tickers gets the same sector and insider context as the weekly
+    run. Returns the stats used.
     """
+    full_universe = stats is None
+    if full_universe:
+        stats = cross_sectional_stats(all_stocks)
+
     # ── Sector-relative dislocation ──
-    by_sector = {}
-    for s in all_stocks:
-        sector = s.get('sector') or ''
-        if sector and s.get('pct_from_wma') is not None:
-            by_sector.setdefault(sector, []).append(float(s['pct_from_wma']))
-
-    sector_stats = {}
-    for sector, vals in by_sector.items():
-        if len(vals) < 8:
-            continue
-        srt = sorted(vals)
-        n = len(srt)
-        median = srt[n // 2] if n % 2 else (srt[n // 2 - 1] + srt[n // 2]) / 2.0
-        mu = sum(vals) / n
-        sd = math.sqrt(sum((v - mu) ** 2 for v in vals) / n)
-        if sd > 1e-9:
-            sector_stats[sector] = (median, sd)
+    usable = {sector: (st['median'], st['sd']) for sector, st in stats['sectors'].items()
+              if st['n'] >= MIN_SECTOR_N and st['sd'] > 1e-9}
+    pct = _column(s.get('pct_from_wma') for s in all_stocks)
+    sector_keys = [s.get('sector') or '' for s in all_stocks]
+    median = np.array([usable.get(k, (np.nan, np.nan))[0] for k in sector_keys])
+    sd = np.array([usable.get(k, (np.nan, np.nan))[1] for k in sector_keys])
+    sector_z = -(pct - median) / sd
 
     # ── Insider intensity percentile ──
-    candidates = []
-    for s in all_stocks:
-        total = s.get('insider_buy_total_12m') or 0
-        mcap = s.get('market_cap')
-        if total > 0 and mcap and mcap > 0:
-            candidates.append((s['symbol'], total / mcap))
-    candidates.sort(key=lambda t: t[1])
-    n_cand = len(candidates)
-    intensity_pct = {sym: round((rank + 1) / n_cand * 100.0, 1)
-                     for rank, (sym, _) in enumerate(candidates)} if n_cand >= 10 else {}
+    dist = np.asarray(stats['insider_intensity'], dtype=float)
+    totals = np.nan_to_num(_column(s.get('insider_buy_total_12m') for s in all_stocks))
+    mcaps = _column(s.get('market_cap') for s in all_stocks)
+    buyers = (totals > 0) & (mcaps > 0)
+    insider_pct = np.full(len(all_stocks), np.nan)
+    if len(dist) >= MIN_INSIDER_N and buyers.any():
+        intensity = totals[buyers] / mcaps[buyers]
+        if full_universe:
+            # Rank among this run's buyers; ties keep universe order.
+            rank = np.empty(len(intensity))
+            rank[np.argsort(intensity, kind='stable')] = np.arange(1, len(intensity) + 1)
+        else:
+            rank = np.searchsorted(dist, intensity, side='right')
+        insider_pct[buyers] = rank / len(dist) * 100.0
 
     # ── Fill per-stock + build the stack ──
-    for s in all_stocks:
-        d = s.get('dislocation')
-        if d is None:
-            continue
-
-        stats = sector_stats.get(s.get('sector') or '')
-        if stats and s.get('pct_from_wma') is not None:
-            median, sd = stats
-            d['sector_relative_z'] = round(-(float(s['pct_from_wma']) - median) / sd, 2)
-
-        d['insider_intensity_pct'] = intensity_pct.get(s['symbol'])
-
-        signals = []
-        if (d['yield_dislocation_z'] or 0) >= Z_THRESHOLD:
-            signals.append('yield')
-        if (d['drawdown_z'] or 0) >= Z_THRESHOLD:
-            signals.append('drawdown')
-        if (d['sector_relative_z'] or 0) >= Z_THRESHOLD:
-            signals.append('sector')
-        if (d['buyback_accel_pp'] is not None
-                and d['buyback_accel_pp'] <= BUYBACK_ACCEL_THRESHOLD
-                and (s.get('shares_change_yoy') or 0) < 0):
-            signals.append('buyback')
-        if (d['insider_intensity_pct'] or 0) >= INSIDER_PCTL_THRESHOLD:
-            signals.append('insider')
-        if (d['fcf_yield_vs_hist_pp'] or 0) >= FCF_VS_HIST_THRESHOLD:
-            signals.append('value_vs_history')
-
-        d['stack_signals'] = signals
-        d['dislocation_stack'] = len(signals)
+    rows = [i for i, s in enumerate(all_stocks) if s.get('dislocation') is not None]
+    for i in rows:
+        d = all_stocks[i]['dislocation']
+        if not np.isnan(sector_z[i]):
+            d['sector_relative_z'] = round(float(sector_z[i]), 2)
+        d['insider_intensity_pct'] = (None if np.isnan(insider_pct[i])
+                                      else round(float(insider_pct[i]), 1))
+
+    discs = [all_stocks[i]['dislocation'] for i in rows]
+    flags = np.column_stack([
+        _column(d['yield_dislocation_z'] for d in discs) >= Z_THRESHOLD,
+        _column(d['drawdown_z'] for d in discs) >= Z_THRESHOLD,
+        _column(d['sector_relative_z'] for d in discs) >= Z_THRESHOLD,
+        (_column(d['buyback_accel_pp'] for d in discs) <= BUYBACK_ACCEL_THRESHOLD)
+        & (_column(all_stocks[i].get('shares_change_yoy') for i in rows) < 0),
+        _column(d['insider_intensity_pct'] for d in discs) >= INSIDER_PCTL_THRESHOLD,
+        _column(d['fcf_yield_vs_hist_pp'] for d in discs) >= FCF_VS_HIST_THRESHOLD,
+    ]) if rows else np.zeros((0, len(STACK_SIGNALS)), dtype=bool)
+
+    for i, d, row in zip(rows, discs, flags):
+        d['stack_signals'] = [STACK_SIGNALS[j] for j in np.flatnonzero(row)]
+        d['dislocation_stack'] = int(row.sum())
 
         # WOW signal — computed last so all cross-sectional fields are ready
-        s['wow_signal'] = _compute_wow_signal(s)
+        all_stocks[i]['wow_signal'] = _compute_wow_signal(all_stocks[i])
+
+    return stats
 
 
 # ── WOW Signal ────────────────────────────────────────────────────────────────
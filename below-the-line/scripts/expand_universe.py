@@ -34,10 +34,10 @@ import json
 import re
 import sys
 import time
-import random
-import urllib.request
 from pathlib import Path
 
+import http_client
+
 REPO = Path(__file__).resolve().parent.parent
 UPDATE_STOCKS = REPO / 'scripts' / 'update_stocks.py'
 CACHE = REPO / 'scripts' / '.universe_probe_cache.json'
@@ -51,9 +51,6 @@ MIN_ADV_SHARES = 300_000  # thin names make the touch statistics meaningless
 # Referenced in published work, so they belong in the screener regardless of rank.
 ALWAYS_INCLUDE = ['SRAD']
 
-UA = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'}
-
 NASDAQ_LISTED = 'https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt'
 OTHER_LISTED = 'https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt'
 
@@ -76,8 +73,7 @@ CLASS_SUFFIX_OK = ('A', 'B', 'C')
 
 
 def fetch(url: str, timeout: int = 30) -> str:
-    return urllib.request.urlopen(
-        urllib.request.Request(url, headers=UA), timeout=timeout).read().decode('utf-8', 'replace')
+    return http_client.get_text(url, timeout=timeout)
 
 
 def current_universe() -> list[str]:
@@ -143,8 +139,7 @@ def probe(symbol: str) -> dict | None:
     url = (f'https://query2.finance.yahoo.com/v8/finance/chart/{y}'
            f'?range=10y&interval=1wk')
     try:
-        d = json.load(urllib.request.urlopen(
-            urllib.request.Request(url, headers=UA), timeout=25))
+        d = http_client.get_json(url, timeout=25)
         res = d['chart']['result'][0]
         meta = res['meta']
         closes = [c for c in res['indicators']['quote'][0]['close'] if c is not None]
@@ -196,6 +191,7 @@ def main() -> None:
         print('\nDry run. No Yahoo calls made.')
         return
 
+    http_client.set_delay(http_client.YAHOO_HOSTS, args.delay)
     cache = json.loads(CACHE.read_text()) if CACHE.exists() else {}
     targets = pool[:args.limit] if args.limit else pool
     print(f'\nProbing {len(targets)} symbols ({len(cache)} cached)...')
@@ -209,7 +205,6 @@ def main() -> None:
             rec = probe(s)
             cache[s] = rec
             checked += 1
-            time.sleep(args.delay + random.uniform(0, 0.2))
             if checked % 100 == 0:
                 CACHE.write_text(json.dumps(cache))
                 print(f'   {i}/{len(targets)}  ({checked} fetched)')
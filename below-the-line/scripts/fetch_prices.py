@@ -6,6 +6,22 @@ Collects the ticker set that The Book needs to value itself, then pulls daily
 adjusted-close history from Yahoo Finance and writes one JSON file per ticker
 to data/prices/{TICKER}.json.
 
+Refreshes are incremental. The committed data/prices/{TICKER}.json is the
+record: each run re-requests its last OVERLAP_SESSIONS closes plus anything
+newer and appends the new sessions. Because the closes are adjusted, a
+dividend or split restates history, so the file is re-fetched from inception
+only when
+  - an overlapping settled close no longer matches (within rounding),
+  - a dividend or split falls in the new sessions,
+  - inception moved earlier than the file's start, or
+  - the last full fetch is older than FULL_REFRESH_DAYS (safety net).
+PRICES_FULL_REFRESH=1 forces the full path for every ticker. The overlap
+check is daily_close_store.restatement_reason; full fetches go through
+daily_close_store.get_daily_closes(force_full=True), which refetches the whole
+range and refreshes that local store (shared with the options screener). All
+requests are pooled and rate-limited by http_client. Files are
+written compact and atomically.
+
 Ticker set =
   - every `ticker` (stock) / underlying (call/put) in data/positions/*.yml
   - every `call.ticker` in content/deep-dives/*.md front matter (best effort)
@@ -22,25 +38,22 @@ Either way book.json.as_of records when prices were last refreshed.
 Usage:
   python scripts/fetch_prices.py
   REFRESH_MODE=B python scripts/fetch_prices.py
+  PRICES_FULL_REFRESH=1 python scripts/fetch_prices.py
 """
 from __future__ import annotations
 
 import json
 import os
-import random
 import re
 import sys
-import time
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import yaml
 
-try:
-    import yfinance as yf
-except ImportError:  # pragma: no cover
-    yf = None
+import daily_close_store
 
 # ---- Paths -----------------------------------------------------------------
 ROOT = Path(__file__).parent.parent          # below-the-line/
@@ -52,22 +65,9 @@ CONFIG_FILE = DATA_DIR / "portfolio_config.yml"
 
 BENCHMARK = "SPY"
 
-
-# ---- Retry helper (mirrors update_stocks.py) -------------------------------
-def retry_on_rate_limit(func, *args, max_retries=3, base_delay=5, **kwargs):
-    for attempt in range(max_retries):
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:  # noqa: BLE001
-            err = str(e).lower()
-            is_rate_limit = any(s in err for s in ["429", "rate limit", "too many requests", "throttled"])
-            if is_rate_limit and attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt) + random.uniform(0, 2)
-                print(f"  [!] Rate limited, waiting {delay:.0f}s ({attempt + 1}/{max_retries})...")
-                time.sleep(delay)
-            else:
-                raise
-    return None
+OVERLAP_SESSIONS = daily_close_store.OVERLAP_SESSIONS
+FULL_REFRESH_DAYS = daily_close_store.FULL_REFRESH_DAYS
+CLOSE_DECIMALS = 4
 
 
 # ---- Config ----------------------------------------------------------------
@@ -151,34 +151,105 @@ def collect_tickers(positions: list[dict], calls: list[dict]) -> set[str]:
 
 
 # ---- Fetch -----------------------------------------------------------------
-def fetch_one(ticker: str, start: str) -> Optional[dict]:
-    if yf is None:
-        raise RuntimeError("yfinance not installed; run `pip install yfinance`")
+def load_existing(ticker: str) -> Optional[dict]:
+    f = PRICES_DIR / f"{ticker}.json"
+    if not f.exists():
+        return None
+    try:
+        data = json.loads(f.read_text())
+    except Exception:  # noqa: BLE001
+        return None
+    if not data.get("dates") or len(data["dates"]) != len(data.get("close") or []):
+        return None
+    return data
+
+
+def full_refresh_reason(existing: Optional[dict], start: str) -> Optional[str]:
+    """Why the stored file cannot simply be extended, or None if it can."""
+    if existing is None:
+        return "no stored file"
+    if os.environ.get("PRICES_FULL_REFRESH", "").lower() in ("1", "true", "yes"):
+        return "PRICES_FULL_REFRESH"
+    if str(existing.get("start") or "9999") > start:
+        return f"inception {start} is before stored start {existing.get('start')}"
+    full_at = existing.get("full_fetched_at") or existing.get("fetched_at")
+    try:
+        age = (date.today() - date.fromisoformat(str(full_at))).days
+    except ValueError:
+        return "no full fetch on record"
+    if age >= FULL_REFRESH_DAYS:
+        return f"last full fetch {age}d ago"
+    return None
 
-    def _do():
-        return yf.Ticker(ticker).history(start=start, interval="1d", auto_adjust=True)
 
-    df = retry_on_rate_limit(_do)
-    if df is None or df.empty:
-        print(f"  ✗ {ticker}: no data")
-        return None
-    closes = df["Close"].dropna()
+def append_sessions(existing: dict, fresh, event_days) -> tuple[Optional[dict], Optional[str]]:
+    """(`existing` extended with `fresh`, None) where `fresh` is daily_close_store
+    rows starting at one of the file's last OVERLAP_SESSIONS dates, or
+    (None, reason) when the adjusted history has to be re-fetched. The
+    overlap check is the store's own, with slack for CLOSE_DECIMALS rounding."""
+    stored_days = np.array([daily_close_store.epoch_day(d) for d in existing["dates"]])
+    reason = daily_close_store.restatement_reason(
+        stored_days, np.asarray(existing["close"], dtype=float), fresh, event_days,
+        decimals=CLOSE_DECIMALS)
+    if reason is not None:
+        return None, reason
+
+    fresh_dates = [daily_close_store.day_iso(d) for d in fresh["day"]]
+    fresh_vals = [round(float(v), CLOSE_DECIMALS) for v in fresh["close"]]
+    keep = sum(1 for d in existing["dates"] if d < fresh_dates[0])
+    return {
+        **existing,
+        "dates": existing["dates"][:keep] + fresh_dates,
+        "close": existing["close"][:keep] + fresh_vals,
+    }, None
+
+
+def fetch_one(ticker: str, start: str, existing: Optional[dict] = None) -> Optional[dict]:
+    # Rate limits and 429 retries are handled by http_client underneath.
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    reason = full_refresh_reason(existing, start)
+    if reason is None:
+        tail_from = existing["dates"][max(0, len(existing["dates"]) - OVERLAP_SESSIONS)]
+        fresh, event_days = daily_close_store.fetch_chart(ticker, daily_close_store.epoch_day(tail_from))
+        data, reason = (append_sessions(existing, fresh, event_days) if len(fresh)
+                        else (None, "no recent sessions returned"))
+        if data is not None:
+            added = len(data["dates"]) - len(existing["dates"])
+            print(f"  ✓ {ticker}: +{added} days (→ {data['dates'][-1]})")
+            data["fetched_at"] = today
+            data.setdefault("full_fetched_at", existing.get("fetched_at"))
+            return data
+    if existing is not None:
+        print(f"  ↻ {ticker}: full re-fetch ({reason})")
+
+    # Whatever sent us here (including a restatement the store has not seen
+    # yet) means the local store cannot be trusted for this ticker either.
+    closes = daily_close_store.get_daily_closes(ticker, start, force_full=True).dropna()
     if closes.empty:
         print(f"  ✗ {ticker}: no closes")
         return None
     dates = [d.strftime("%Y-%m-%d") for d in closes.index]
-    vals = [round(float(v), 4) for v in closes.values]
+    vals = [round(float(v), CLOSE_DECIMALS) for v in closes.values]
     print(f"  ✓ {ticker}: {len(vals)} days ({dates[0]} → {dates[-1]})")
     return {
         "ticker": ticker,
-        "source": "yfinance",
-        "fetched_at": datetime.utcnow().strftime("%Y-%m-%d"),
+        "source": "yahoo",
+        "fetched_at": today,
+        "full_fetched_at": today,
         "start": start,
         "dates": dates,
         "close": vals,
     }
 
 
+def write_prices(ticker: str, data: dict) -> None:
+    """Compact JSON, written to a temp file and renamed into place."""
+    f = PRICES_DIR / f"{ticker}.json"
+    tmp = f.with_name(f.name + ".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")))
+    os.replace(tmp, f)
+
+
 def main() -> int:
     cfg = load_config()
     positions = load_positions()
@@ -189,6 +260,7 @@ def main() -> int:
         print("No events found in data/positions/*.yml and no inception in config. Nothing to fetch.")
         # Still refresh SPY from a sane default so the benchmark exists.
         inception = date.today().replace(month=1, day=1).isoformat()
+    inception = str(inception)   # YAML may hand back a date
 
     tickers = sorted(collect_tickers(positions, calls))
     print(f"Refresh mode: {cfg['refresh_mode']}  |  inception: {inception}")
@@ -196,19 +268,17 @@ def main() -> int:
 
     PRICES_DIR.mkdir(parents=True, exist_ok=True)
     ok, failed = 0, []
-    for i, t in enumerate(tickers):
+    for t in tickers:
         data = None
         try:
-            data = fetch_one(t, inception)
+            data = fetch_one(t, inception, load_existing(t))
         except Exception as e:  # noqa: BLE001
             print(f"  ✗ {t}: {e}")
         if data:
-            (PRICES_DIR / f"{t}.json").write_text(json.dumps(data, indent=2))
+            write_prices(t, data)
             ok += 1
         else:
             failed.append(t)
-        if (i + 1) % 25 == 0:
-            time.sleep(1)  # be polite to Yahoo
 
     print(f"\nWrote {ok}/{len(tickers)} price files to {PRICES_DIR.relative_to(ROOT)}/")
     if failed:
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Per-symbol fundamentals bundle, fetched once and shared across the pipeline.
+
+Every weekly run used to build separate yf.Ticker objects for the same symbol:
+fetch_fundamental_data (.info, statements, one price window per fiscal year),
+fetch_insider_data (insider_transactions, insider_roster_holders) and later
+compute_bean_score (.info again, quarterly_cashflow, calendar,
+earnings_dates). Each attribute is its own Yahoo round trip.
+
+get_bundle(symbol) returns a FundamentalsBundle that stands in for the Ticker:
+the same attribute names, fetched lazily on first access and cached on disk
+in scripts/.fundamentals_cache/<SYMBOL>.pkl.gz (gitignored, persisted in CI
+with actions/cache). Anything not cached, notably open-ended .history()
+calls, passes straight through to a live yf.Ticker.
+
+Two freshness classes:
+
+  STATEMENT_FIELDS  Only change when the company reports. Refetched when
+                    fundamentals_schedule.py says the ticker is due (an
+                    earnings date passed since the last pull, or the cache
+                    hit its maximum age); otherwise served from disk.
+  LIVE_FIELDS       .info (market cap, price-derived ratios) and insider
+                    filings. Kept for LIVE_TTL_HOURS, long enough that the
+                    Bean Score job a few hours after the stock update reuses
+                    them, short enough that next week refetches.
+
+Price windows that closed in the past (the fiscal-year-end closes behind the
+health chart's FCF yield) are cached with the statements.
+
+Fetches only mark the bundle dirty; the file is written once by flush(),
+which the `with get_bundle(symbol) as bundle:` form calls on exit. Callers
+share one bundle per symbol rather than opening (and re-reading) their own.
+
+The Ticker-shaped surface keeps get_share_change, get_health_metrics and
+_get_quarterly_fcf unchanged. dislocation_scores.py only consumes the
+fundamentals dict built from the bundle, so it needs nothing here.
+
+FUNDAMENTALS_CACHE=off keeps the single-fetch sharing within a bundle but
+never reads or writes the disk cache.
+"""
+from __future__ import annotations
+
+import gzip
+import os
+import pickle
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import yfinance as yf
+
+import fundamentals_schedule as schedule
+
+CACHE_DIR = Path(__file__).parent / '.fundamentals_cache'
+
+STATEMENT_FIELDS = (
+    'financials', 'balance_sheet', 'cashflow', 'quarterly_cashflow',
+    'calendar', 'earnings_dates',
+)
+LIVE_FIELDS = ('info', 'insider_transactions', 'insider_roster_holders')
+
+LIVE_TTL_HOURS = 20
+
+_TS_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Optional shared rate limiter (fetch_engine.TokenBucket), taken once per
+# Yahoo request the bundle actually makes. Cache hits never wait on it.
+_limiter = None
+
+
+def set_rate_limiter(limiter) -> None:
+    """Throttle every network request made through bundles (None to clear)."""
+    global _limiter
+    _limiter = limiter
+
+
+def _throttle() -> None:
+    if _limiter is not None:
+        _limiter.acquire()
+
+
+def cache_enabled() -> bool:
+    return os.environ.get('FUNDAMENTALS_CACHE', 'on').lower() not in ('off', 'false', '0')
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _stamp(dt: datetime) -> str:
+    return dt.strftime(_TS_FORMAT)
+
+
+def _parse(ts: str) -> datetime:
+    return datetime.strptime(ts, _TS_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def next_earnings_from_calendar(cal) -> Optional[str]:
+    """First 'Earnings Date' in a yfinance calendar dict, as YYYY-MM-DD."""
+    try:
+        if cal and 'Earnings Date' in cal:
+            ed_list = cal['Earnings Date']
+            if ed_list:
+                ned = ed_list[0]
+                return ned.strftime('%Y-%m-%d') if hasattr(ned, 'strftime') else str(ned)[:10]
+    except Exception:
+        pass
+    return None
+
+
+class FundamentalsBundle:
+    """yf.Ticker stand-in that fetches each fundamentals attribute once."""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._ticker = None
+        self._fields = {}        # name -> value
+        self._fetched_at = {}    # name -> ISO timestamp
+        self._history = {}       # closed-window history calls: key -> DataFrame
+        self._due = None         # schedule decision, asked once per bundle
+        self._dirty = False      # fetched something not yet written to disk
+        self._persist = cache_enabled()
+        if self._persist:
+            self._load()
+
+    # ── Disk cache ──────────────────────────────────────────────────────────
+
+    @property
+    def _path(self) -> Path:
+        return CACHE_DIR / f"{self.symbol.replace('/', '_')}.pkl.gz"
+
+    def _load(self) -> None:
+        path = self._path
+        if not path.exists():
+            return
+        try:
+            with gzip.open(path, 'rb') as f:
+                blob = pickle.load(f)
+            self._fields = blob.get('fields', {})
+            self._fetched_at = blob.get('fetched_at', {})
+            self._history = blob.get('history', {})
+        except Exception:
+            # Unreadable (e.g. pandas upgrade changed the pickle format): refetch.
+            self._fields, self._fetched_at, self._history = {}, {}, {}
+
+    def flush(self) -> None:
+        """Write the cache file if anything was fetched since the last write."""
+        if self._dirty:
+            self._save()
+            self._dirty = False
+
+    def __enter__(self) -> 'FundamentalsBundle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def _save(self) -> None:
+        if not self._persist:
+            return
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(self._path.name + '.tmp')
+        try:
+            with gzip.open(tmp, 'wb', compresslevel=5) as f:
+                pickle.dump({
+                    'symbol': self.symbol,
+                    'fields': self._fields,
+                    'fetched_at': self._fetched_at,
+                    'history': self._history,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path)
+        except Exception as e:
+            print(f"    ⚠ {self.symbol}: fundamentals cache write failed: {e}")
+
+    # ── Freshness ───────────────────────────────────────────────────────────
+
+    @property
+    def next_earnings_date(self) -> Optional[str]:
+        return next_earnings_from_calendar(self._fields.get('calendar'))
+
+    def _statements_due(self) -> str:
+        if self._due is None:
+            self._due = schedule.due(self.symbol, have_cache='calendar' in self._fetched_at)
+        return self._due
+
+    def is_fresh(self, name: str) -> bool:
+        cached = name in self._fields and name in self._fetched_at
+        if name in LIVE_FIELDS:
+            return cached and _now() - _parse(self._fetched_at[name]) < timedelta(hours=LIVE_TTL_HOURS)
+        return not self._statements_due() and cached
+
+    # ── Ticker surface ──────────────────────────────────────────────────────
+
+    @property
+    def ticker(self) -> yf.Ticker:
+        if self._ticker is None:
+            self._ticker = yf.Ticker(self.symbol)
+        return self._ticker
+
+    def get(self, name: str):
+        """Cached attribute value, fetching from Yahoo when missing or stale."""
+        if self.is_fresh(name):
+            return self._fields[name]
+        if name in STATEMENT_FIELDS and name != 'calendar' and not self.is_fresh('calendar'):
+            # Statements are keyed to the earnings calendar; refresh it first
+            # so their expiry is computed from the current next date.
+            self.get('calendar')
+        if name == 'calendar':
+            try:
+                _throttle()
+                value = self.ticker.calendar
+            except Exception:
+                value = {}   # no calendar: the schedule falls back to age limits
+        else:
+            _throttle()
+            value = getattr(self.ticker, name)
+        self._fields[name] = value
+        self._fetched_at[name] = _stamp(_now())
+        if name == 'calendar':
+            # New earnings cycle: drop statements and closed price windows.
+            for stale in STATEMENT_FIELDS:
+                if stale != 'calendar':
+                    self._fetched_at.pop(stale, None)
+            self._history = {}
+            schedule.record_fetch(self.symbol, self.next_earnings_date)
+            self._due = ''
+        self._dirty = True
+        return value
+
+    def history(self, *args, **kwargs) -> pd.DataFrame:
+        """Price history. Windows with an explicit end in the past are cached
+        until the next statement refresh; everything else is fetched live."""
+        end = kwargs.get('end')
+        closed = False
+        if end is not None and not args:
+            try:
+                closed = pd.Timestamp(end).date() < (_now() - timedelta(days=1)).date()
+            except (ValueError, TypeError):
+                closed = False
+        if not closed:
+            _throttle()
+            return self.ticker.history(*args, **kwargs)
+        key = tuple(sorted((k, str(v)) for k, v in kwargs.items()))
+        if key in self._history and self.is_fresh('calendar'):
+            return self._history[key].copy()
+        _throttle()
+        df = self.ticker.history(**kwargs)
+        self._history[key] = df
+        self._dirty = True
+        return df.copy()
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined on the bundle itself.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in STATEMENT_FIELDS or name in LIVE_FIELDS:
+            return self.get(name)
+        return getattr(self.ticker, name)
+
+
+def get_bundle(symbol: str) -> FundamentalsBundle:
+    """The shared fundamentals handle for `symbol` (use in place of yf.Ticker).
+    Use it as a context manager, or call flush(), to persist what it fetched."""
+    return FundamentalsBundle(symbol)
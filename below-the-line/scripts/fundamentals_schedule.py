@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Earnings-calendar-aware refresh schedule for cached fundamentals.
+
+Statements only change when a company reports, so re-pulling balance sheets,
+cash flows and income statements for ~2,000 names every Saturday is mostly
+wasted round trips. This keeps a manifest, one entry per ticker:
+
+  fetched_at          when statements were last pulled
+  next_earnings_date  the calendar's next report date as of that pull
+  last_report_date    the most recent report date we have seen pass
+
+and answers one question per ticker per run: are the cached statements due?
+
+  new        no manifest entry or no cached statements
+  reported   next_earnings_date (+ grace for the filing) has passed since
+             fetched_at
+  max_age    fetched_at older than MAX_AGE_DAYS (the calendar can be wrong)
+  no_date    no earnings date on record and older than NO_DATE_MAX_AGE_DAYS
+
+Anything else is skipped. fundamentals_bundle.py asks due() the first time a
+bundle touches a statement field and calls record_fetch() when it refreshes.
+print_summary() reports the run's decisions.
+
+Manifest: scripts/.fundamentals_cache/schedule.json, next to the bundle cache
+it describes. Safe to delete; every ticker then reads as 'new'.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+SCHEDULE_FILE = Path(__file__).parent / '.fundamentals_cache' / 'schedule.json'
+
+EARNINGS_GRACE_DAYS = 3          # statements usually post a few days after the call
+MAX_AGE_DAYS = int(os.environ.get('FUNDAMENTALS_MAX_AGE_DAYS', '95'))
+NO_DATE_MAX_AGE_DAYS = 30
+SAVE_EVERY = 50                  # flush the manifest every N refreshes
+
+_DATE = '%Y-%m-%d'
+
+_lock = threading.Lock()
+_manifest: Optional[dict] = None
+_decisions: dict = {}            # symbol -> first decision this run ('' = skipped)
+_unsaved = 0
+
+
+def _today() -> datetime:
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _date(s: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(s[:10], _DATE).replace(tzinfo=timezone.utc) if s else None
+    except ValueError:
+        return None
+
+
+def _load() -> dict:
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(SCHEDULE_FILE) as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def save() -> None:
+    """Write the manifest (atomic rename). Cheap no-op when nothing changed."""
+    global _unsaved
+    with _lock:
+        if _manifest is None or _unsaved == 0:
+            return
+        SCHEDULE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = SCHEDULE_FILE.with_name(SCHEDULE_FILE.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(_manifest, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp, SCHEDULE_FILE)
+        _unsaved = 0
+
+
+atexit.register(save)
+
+
+def due(symbol: str, have_cache: bool = True) -> str:
+    """Why `symbol`'s statements need refetching, or '' if they don't."""
+    with _lock:
+        entry = _load().get(symbol)
+    if not entry or not have_cache:
+        reason = 'new'
+    else:
+        today = _today()
+        fetched = _date(entry.get('fetched_at'))
+        ned = _date(entry.get('next_earnings_date'))
+        if fetched is None:
+            reason = 'new'
+        elif ned and fetched < ned + timedelta(days=EARNINGS_GRACE_DAYS) <= today:
+            reason = 'reported'
+        elif (today - fetched).days >= MAX_AGE_DAYS:
+            reason = 'max_age'
+        elif ned is None and (today - fetched).days >= NO_DATE_MAX_AGE_DAYS:
+            reason = 'no_date'
+        else:
+            reason = ''
+    with _lock:
+        _decisions.setdefault(symbol, reason)
+    return reason
+
+
+def record_fetch(symbol: str, next_earnings_date: Optional[str]) -> None:
+    """Note a statement refresh for `symbol` made today."""
+    global _unsaved
+    today = _today()
+    with _lock:
+        manifest = _load()
+        prev = manifest.get(symbol, {})
+        last_report = prev.get('last_report_date')
+        prev_ned = _date(prev.get('next_earnings_date'))
+        if prev_ned and prev_ned <= today:
+            last_report = prev['next_earnings_date']
+        manifest[symbol] = {
+            'fetched_at': today.strftime(_DATE),
+            'next_earnings_date': next_earnings_date,
+            'last_report_date': last_report,
+        }
+        _unsaved += 1
+        flush = _unsaved >= SAVE_EVERY
+    if flush:
+        save()
+
+
+def print_summary() -> None:
+    """One block describing this run's refresh decisions."""
+    with _lock:
+        decisions = dict(_decisions)
+        manifest = dict(_load())
+    if not decisions:
+        save()
+        return
+    reasons = Counter(r for r in decisions.values() if r)
+    skipped = sum(1 for r in decisions.values() if not r)
+    refreshed = sum(reasons.values())
+    detail = ', '.join(f"{n} {r}" for r, n in reasons.most_common())
+    print(f"\n📅 Fundamentals refresh: {refreshed} refreshed"
+          + (f" ({detail})" if detail else "")
+          + f", {skipped} skipped (not due)")
+    if skipped:
+        horizon = _today() + timedelta(days=7)
+        upcoming = sum(1 for sym, r in decisions.items()
+                       if not r and (_date(manifest.get(sym, {}).get('next_earnings_date'))
+                                     or horizon + timedelta(days=1)) <= horizon)
+        if upcoming:
+            print(f"   {upcoming} of the skipped report within 7 days")
+    save()
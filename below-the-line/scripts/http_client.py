@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the raw (non-yfinance) Yahoo, SEC and FMP calls.
+
+options_screener.py, expand_universe.py, check_split_artifacts.py and
+microcap/transcript_fetcher.py each used to open a fresh urllib connection
+per request (new TCP + TLS handshake, no keep-alive, no compression) and
+pace themselves with time.sleep between calls. They now share this module:
+
+  pooling       one requests.Session with a keep-alive connection pool per
+                host; gzip/deflate negotiated by default
+  rate limits   one fetch_engine.TokenBucket per host, shared by every
+                thread, taken once per network request. Cache hits never
+                wait on it. HOST_RATES holds the defaults; scripts with a
+                --delay flag map it onto their host via set_rate(), and
+                share_rate() puts several hosts behind one bucket when a
+                provider's limit covers all of them (SEC's 10 req/s)
+  retry         429 / 5xx / connection errors are retried with exponential
+                backoff (Retry-After honoured), RETRIES times by default;
+                pass retries=0 where a hard single-shot ceiling is wanted
+  cache         successful GET bodies kept in memory for CACHE_TTL seconds
+                (HTTP_CACHE_TTL, 0 = off), bounded to CACHE_MAX_BYTES, so a
+                repeated URL within a run costs nothing
+
+fetch() returns the response or raises HttpError (final HTTP status) /
+requests.RequestException (network); get_json() and get_text() wrap it.
+stream() yields a large body chunk by chunk so the caller can stop reading
+early. Callers keep their own "None on failure" handling.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fetch_engine import TokenBucket
+
+# Browser UA the Yahoo endpoints expect; SEC/FMP callers pass their own.
+UA = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
+                    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'}
+
+TIMEOUT = 15
+RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+BACKOFF = 1.0                     # seconds, doubled per attempt
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_SIZE = 16                    # keep-alive connections per host
+STREAM_CHUNK = 64 * 1024          # bytes per chunk from stream()
+
+CACHE_TTL = float(os.environ.get('HTTP_CACHE_TTL', '900'))
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# host -> (requests per second, burst)
+YAHOO_RATE = float(os.environ.get('YAHOO_RATE', '2.5'))
+YAHOO_HOSTS = ('query1.finance.yahoo.com', 'query2.finance.yahoo.com')
+HOST_RATES = {
+    'query1.finance.yahoo.com': (YAHOO_RATE, 2),
+    'query2.finance.yahoo.com': (YAHOO_RATE, 2),
+    'data.sec.gov': (8.0, 4),            # SEC asks for at most 10/s
+    'www.sec.gov': (8.0, 4),
+    'financialmodelingprep.com': (2.0, 2),
+}
+DEFAULT_RATE = (5.0, 2)
+
+
+class HttpError(Exception):
+    """Non-success HTTP status after retries."""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP Error {status}: {url}")
+        self.status = status
+        self.url = url
+
+
+class HttpClient:
+    """Pooled, rate-limited, retrying GET client with a small response cache."""
+
+    def __init__(self, retries: int = RETRIES, cache_ttl: float = CACHE_TTL):
+        self.retries = retries
+        self.cache_ttl = cache_ttl
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._rates = dict(HOST_RATES)
+        self._limiters = {}
+        self._groups = {}                # host -> shared bucket key
+        self._cache = OrderedDict()      # key -> (expires, response)
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'retries': 0}   # under _lock
+
+    # ── Rate limits ─────────────────────────────────────────────────────────
+
+    def set_rate(self, host: str, rate: float, burst: int = 1) -> None:
+        """Requests per second allowed to `host` (replaces its bucket)."""
+        with self._lock:
+            self._groups.pop(host, None)
+            self._rates[host] = (rate, burst)
+            self._limiters.pop(host, None)
+
+    def share_rate(self, hosts, rate: float, burst: int = 1) -> None:
+        """One bucket of `rate` requests per second across all of `hosts`."""
+        key = tuple(sorted(hosts))
+        with self._lock:
+            for host in key:
+                self._groups[host] = key
+                self._limiters.pop(host, None)
+            self._rates[key] = (rate, burst)
+            self._limiters.pop(key, None)
+
+    def limiter(self, host: str) -> TokenBucket:
+        with self._lock:
+            key = self._groups.get(host, host)
+            bucket = self._limiters.get(key)
+            if bucket is None:
+                rate, burst = self._rates.get(key, DEFAULT_RATE)
+                bucket = self._limiters[key] = TokenBucket(rate=rate, burst=burst)
+            return bucket
+
+    # ── Cache ───────────────────────────────────────────────────────────────
+
+    def _cached(self, key) -> Optional[requests.Response]:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                self._evict(key)
+                return None
+            self._cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return hit[1]
+
+    def _evict(self, key) -> None:
+        _, resp = self._cache.pop(key)
+        self._cache_bytes -= len(resp.content)
+
+    def _store(self, key, resp: requests.Response, ttl: float) -> None:
+        size = len(resp.content)
+        if size > CACHE_MAX_BYTES // 4:
+            return
+        with self._lock:
+            if key in self._cache:
+                self._evict(key)
+            self._cache[key] = (time.monotonic() + ttl, resp)
+            self._cache_bytes += size
+            while self._cache_bytes > CACHE_MAX_BYTES:
+                self._evict(next(iter(self._cache)))
+
+    # ── Requests ────────────────────────────────────────────────────────────
+
+    def _count(self, key: str) -> None:
+        with self._lock:             # += on a shared dict is not atomic
+            self.stats[key] += 1
+
+    def _send(self, url: str, headers: dict, timeout: float, retries: Optional[int],
+              stream: bool = False) -> requests.Response:
+        retries = self.retries if retries is None else retries
+        bucket = self.limiter(urlsplit(url).hostname or '')
+        for attempt in range(retries + 1):
+            bucket.acquire()
+            self._count('requests')
+            wait = BACKOFF * (2 ** attempt)
+            try:
+                resp = self.session.get(url, headers=headers, timeout=timeout, stream=stream)
+            except requests.RequestException:
+                if attempt == retries:
+                    raise
+            else:
+                if resp.status_code < 400:
+                    return resp
+                resp.close()
+                if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                    raise HttpError(resp.status_code, url)
+                retry_after = resp.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    wait = max(wait, float(retry_after))
+            self._count('retries')
+            time.sleep(wait)
+        raise AssertionError('unreachable')
+
+    def fetch(self, url: str, headers: Optional[dict] = None, timeout: float = TIMEOUT,
+              retries: Optional[int] = None, cache_ttl: Optional[float] = None) -> requests.Response:
+        """GET `url`. Raises HttpError / requests.RequestException on failure."""
+        headers = UA if headers is None else headers
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        key = (url, tuple(sorted(headers.items())))
+        if ttl > 0:
+            hit = self._cached(key)
+            if hit is not None:
+                return hit
+        resp = self._send(url, headers, timeout, retries)
+        if ttl > 0:
+            self._store(key, resp, ttl)
+        return resp
+
+    def stream(self, url: str, headers: Optional[dict] = None, timeout: float = TIMEOUT,
+               retries: Optional[int] = None, chunk_size: int = STREAM_CHUNK):
+        """GET `url` and yield the (decompressed) body in chunks as it
+        arrives; never cached. Closing the generator early closes the
+        connection, so a caller that has what it needs stops the download
+        there. Same rate limit, retries and errors as fetch()."""
+        headers = UA if headers is None else headers
+        resp = self._send(url, headers, timeout, retries, stream=True)
+        with resp:
+            yield from resp.iter_content(chunk_size)
+
+    def get_json(self, url: str, **kwargs):
+        return self.fetch(url, **kwargs).json()
+
+    def get_text(self, url: str, encoding: str = 'utf-8', **kwargs) -> str:
+        return self.fetch(url, **kwargs).content.decode(encoding, 'replace')
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def client() -> HttpClient:
+    """The process-wide shared client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def fetch(url: str, **kwargs) -> requests.Response:
+    return client().fetch(url, **kwargs)
+
+
+def get_json(url: str, **kwargs):
+    return client().get_json(url, **kwargs)
+
+
+def get_text(url: str, **kwargs) -> str:
+    return client().get_text(url, **kwargs)
+
+
+def stream(url: str, **kwargs):
+    return client().stream(url, **kwargs)
+
+
+def set_rate(host: str, rate: float, burst: int = 1) -> None:
+    client().set_rate(host, rate, burst)
+
+
+def share_rate(hosts, rate: float, burst: int = 1) -> None:
+    client().share_rate(hosts, rate, burst)
+
+
+def set_delay(hosts, delay: float) -> None:
+    """Map a script's legacy --delay (seconds between calls) onto host limits."""
+    if delay > 0:
+        for host in hosts:
+            set_rate(host, 1.0 / delay)
+
@@ -9,6 +9,9 @@ The quarterly FCF chart data now comes through bean_score_levels.py
 (which reads it from bean_score_latest.json where it's persisted during
 the main bean_score.py computation — no separate yfinance call needed).
 
+Only the index's current_score and the affected per-symbol detail shards
+are rewritten (see stocks_store.py).
+
 Usage:
     python merge_bean_score_into_stocks.py
 """
@@ -16,6 +19,8 @@ import json
 import sys
 from pathlib import Path
 
+import stocks_store
+
 DATA_DIR = Path(__file__).parent.parent / 'assets' / 'data'
 STOCKS_FILE = DATA_DIR / 'stocks.json'
 DISPLAY_FILE = DATA_DIR / 'bean_score_display.json'
@@ -30,33 +35,20 @@ def main():
         print(f"ERROR: {DISPLAY_FILE} not found. Run bean_score_levels.py first.")
         sys.exit(1)
 
-    # Load both files
-    with open(STOCKS_FILE) as f:
-        stocks_data = json.load(f)
-
     with open(DISPLAY_FILE) as f:
         display_data = json.load(f)
 
     bean_stocks = display_data.get('stocks', {})
     print(f"Loaded {len(bean_stocks)} Bean Score display records")
 
-    # Merge into each stock
-    merged = 0
-    with_quarterly = 0
-    for stock in stocks_data.get('stocks', []):
-        symbol = stock.get('symbol')
-        if symbol and symbol in bean_stocks:
-            stock['bean_score_data'] = bean_stocks[symbol]
-            merged += 1
-            if bean_stocks[symbol].get('quarterly_fcf'):
-                with_quarterly += 1
+    # Merge into each stock and write back
+    merged = stocks_store.merge_field('bean_score_data', bean_stocks, STOCKS_FILE)
+    indexed = {s.get('symbol') for s in stocks_store.load_stocks(STOCKS_FILE).get('stocks', [])}
+    with_quarterly = sum(1 for sym, d in bean_stocks.items()
+                         if sym in indexed and d.get('quarterly_fcf'))
 
     print(f"Merged Bean Score data into {merged} stocks ({with_quarterly} with quarterly chart)")
 
-    # Write back
-    with open(STOCKS_FILE, 'w') as f:
-        json.dump(stocks_data, f, separators=(',', ':'))
-
     print(f"✓ Updated {STOCKS_FILE}")
 
 
@@ -539,7 +539,7 @@ def run_full_pipeline(tickers, screener_data=None, force_reanalyze=False,
     Returns:
         Dict of analysis results
     """
-    from transcript_fetcher import fetch_transcripts
+    from transcript_fetcher import fetch_transcripts_batch
 
     # Build context lookup from screener data
     context_lookup = {}
@@ -570,16 +570,8 @@ def run_full_pipeline(tickers, screener_data=None, force_reanalyze=False,
         print("All tickers already analyzed (within 30 days). Use force_reanalyze=True to refresh.")
         return existing
 
-    print(f"\nFetching transcripts for {len(tickers_to_analyze)} tickers...")
-
-    # Fetch transcripts
-    transcripts_by_ticker = {}
-    for i, ticker in enumerate(tickers_to_analyze):
-        print(f"\n[{i+1}/{len(tickers_to_analyze)}] Fetching transcripts for {ticker}...")
-        transcripts_by_ticker[ticker] = fetch_transcripts(ticker)
-
-        if (i + 1) % 5 == 0:
-            time.sleep(2)
+    # Fetch transcripts (tickers overlap; each source keeps its own rate limit)
+    transcripts_by_ticker = fetch_transcripts_batch(tickers_to_analyze)
 
     # Filter to tickers that actually have transcripts
     tickers_with_transcripts = {
@@ -9,7 +9,15 @@ for microcap companies. Two-tier sourcing:
   2. SEC EDGAR — 10-K / 10-Q filings, extracting the MD&A section.
      Universal coverage, free, no API key needed.
 
-All fetched content is cached locally to avoid re-fetching on subsequent runs.
+All fetched content is cached locally to avoid re-fetching on subsequent runs,
+in a compressed content-addressed store with a single index (see CACHE LAYER).
+
+fetch_transcripts_batch() works on several tickers at once. Each source has
+its own rate limit in the shared HTTP client (FMP at 1/FMP_DELAY; EDGAR at
+1/EDGAR_DELAY, capped at the SEC's 10 req/s across both SEC hosts), which
+every thread draws on; cache hits skip it. init_http() installs those limits
+on first fetch, not at import. Per-source throughput is printed
+at the end of a batch.
 
 SETUP:
   export FMP_API_KEY="your_key_here"        # financialmodelingprep.com
@@ -20,16 +28,27 @@ USAGE:
   transcripts = fetch_transcripts("KULR")   # returns list of transcript dicts
 """
 
+import codecs
+import gzip
+import hashlib
 import json
 import os
 import re
+import sys
+import threading
 import time
-import urllib.request
 import urllib.parse
-import urllib.error
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import http_client
+except ImportError:
+    # Run from scripts/microcap: the shared client lives one level up.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    import http_client
+from fetch_engine import run_bounded
+
 try:
     from bs4 import BeautifulSoup
     HAS_BS4 = True
@@ -50,48 +69,241 @@ SEC_USER_AGENT = "mungbeans.io research@mungbeans.io"
 # Rate limiting
 FMP_DELAY = 0.5         # seconds between FMP API calls
 EDGAR_DELAY = 0.15      # SEC asks for max 10 requests/sec
+EDGAR_MAX_RATE = 10.0   # SEC fair-access ceiling, all SEC hosts together
 MAX_TRANSCRIPTS = 4     # most recent quarters to fetch per ticker
 
+# Tickers fetched at once by fetch_transcripts_batch
+TRANSCRIPT_WORKERS = int(os.environ.get("TRANSCRIPT_WORKERS", "4"))
+
 # FMP API base
 FMP_BASE = "https://financialmodelingprep.com/api"
+FMP_HOST = "financialmodelingprep.com"
+SEC_HOSTS = ("data.sec.gov", "www.sec.gov")
+
+_http_lock = threading.Lock()
+_http_ready = False
+
+
+def init_http():
+    """Apply the delays above to the shared HTTP client, which also pools
+    connections and retries 429/5xx. Its limiters are shared by every
+    thread: FMP gets its own, and both SEC hosts draw on one EDGAR budget,
+    so concurrent tickers can never push the SEC past 10 requests/sec
+    between them. Cache hits never reach the client.
+
+    Importing this module leaves the client alone; fetch_transcripts(),
+    fetch_transcripts_batch() and the CLI call this first. Runs once.
+    """
+    global _http_ready
+    with _http_lock:
+        if _http_ready:
+            return
+        http_client.set_rate(FMP_HOST, 1 / FMP_DELAY)
+        http_client.share_rate(SEC_HOSTS, min(EDGAR_MAX_RATE, 1 / EDGAR_DELAY))
+        _http_ready = True
 
 
 # ---------------------------------------------------------------------------
-# CACHE LAYER
+# THROUGHPUT STATS
 # ---------------------------------------------------------------------------
-def _cache_path(ticker, source, period):
-    """Build cache file path: data/microcap_transcripts/KULR/2026-Q1_fmp.json"""
-    ticker_dir = CACHE_DIR / ticker.upper()
-    ticker_dir.mkdir(parents=True, exist_ok=True)
-    safe_period = period.replace("/", "-").replace(" ", "_")
-    return ticker_dir / f"{safe_period}_{source}.json"
+_stats_lock = threading.Lock()
+_STATS = {}             # source -> counters, updated by every fetch thread
+_STAT_KEYS = ("requests", "cache_hits", "documents", "chars")
 
 
-def _read_cache(ticker, source, period):
-    """Read cached transcript. Returns dict or None."""
-    path = _cache_path(ticker, source, period)
-    if path.exists():
+def _count(source, **counts):
+    with _stats_lock:
+        entry = _STATS.setdefault(source, dict.fromkeys(_STAT_KEYS, 0))
+        for key, n in counts.items():
+            entry[key] += n
+
+
+def source_stats():
+    """Snapshot of the per-source counters (requests = network requests,
+    documents = transcripts/filings fetched, chars = text received)."""
+    with _stats_lock:
+        return {source: dict(entry) for source, entry in _STATS.items()}
+
+
+def print_throughput(elapsed, before=None):
+    """One line per source for the counters accumulated since `before`."""
+    before = before or {}
+    for source, entry in sorted(source_stats().items()):
+        base = before.get(source, {})
+        requests, hits, docs, chars = (entry[k] - base.get(k, 0) for k in _STAT_KEYS)
+        if not (requests or hits):
+            continue
+        rate = requests / elapsed if elapsed > 0 else 0.0
+        print(f"  [{source.upper()}] {requests} request(s) in {elapsed:.1f}s "
+              f"({rate:.2f} req/s), {docs} fetched ({chars:,} chars), "
+              f"{hits} cache hit(s)")
+
+
+# ---------------------------------------------------------------------------
+# CACHE LAYER
+# ---------------------------------------------------------------------------
+# Content-addressed store under CACHE_DIR:
+#
+#   index.json                 one entry per ticker/source/period: every
+#                              transcript field except the text, plus
+#                              fetched_at and the text's sha256
+#   blobs/ab/<sha256>.txt.gz   the text, gzip-compressed, stored once per
+#                              distinct text however many periods share it
+#
+# A freshness check is a lookup in the index, which is read once per
+# process; a blob is only opened for a fresh hit. Blobs are written with a
+# fixed gzip mtime so identical text always gives identical bytes. Older
+# caches (one indented JSON per KULR/<period>_<source>.json) are folded in
+# the first time the index is loaded, keeping their cached_at.
+INDEX_FILE = CACHE_DIR / "index.json"
+BLOB_DIR = CACHE_DIR / "blobs"
+CACHE_MAX_AGE_DAYS = 90     # entries older than this are re-fetched
+INDEX_VERSION = 1
+
+_cache_lock = threading.Lock()
+_index = {"path": None, "entries": {}}
+
+
+def _cache_key(ticker, source, period):
+    return f"{ticker.upper()}/{source}/{period}"
+
+
+def _blob_path(digest):
+    return BLOB_DIR / digest[:2] / f"{digest}.txt.gz"
+
+
+def _replace(path, data):
+    """Write bytes to a temp file and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _save_index(entries):
+    body = json.dumps({"version": INDEX_VERSION, "entries": entries},
+                      indent=1, sort_keys=True, ensure_ascii=False)
+    _replace(INDEX_FILE, (body + "\n").encode("utf-8"))
+
+
+def _store(entries, data, fetched_at):
+    """Add one transcript dict to the store (blob + index entry; the caller
+    saves the index). Drops the old blob if nothing else refers to it."""
+    text = data.get("content", "")
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    blob = _blob_path(digest)
+    if not blob.exists():
+        _replace(blob, gzip.compress(text.encode("utf-8"), mtime=0))
+
+    key = _cache_key(data["ticker"], data["source"], data["period"])
+    old = entries.get(key, {}).get("sha256")
+    entry = {k: v for k, v in data.items() if k not in ("content", "cached_at")}
+    entry.update(fetched_at=fetched_at, sha256=digest)
+    entries[key] = entry
+    if old and old != digest and not any(e.get("sha256") == old for e in entries.values()):
+        stale = _blob_path(old)
+        stale.unlink(missing_ok=True)
+        if stale.parent.exists() and not any(stale.parent.iterdir()):
+            stale.parent.rmdir()
+
+
+def _migrate_legacy(entries):
+    """Fold per-file JSON caches from before the index into the store."""
+    moved = 0
+    for path in sorted(CACHE_DIR.glob("*/*_*.json")):
         try:
             with open(path) as f:
                 data = json.load(f)
-            # Cache entries older than 90 days are stale (re-fetch)
-            cached_at = data.get("cached_at", "")
-            if cached_at:
-                cached_date = datetime.fromisoformat(cached_at)
-                if (datetime.now() - cached_date).days > 90:
-                    return None
-            return data
-        except (json.JSONDecodeError, ValueError):
+            data.setdefault("ticker", path.parent.name)
+            data.setdefault("source", path.stem.rsplit("_", 1)[1])
+            data.setdefault("period", path.stem.rsplit("_", 1)[0])
+        except (json.JSONDecodeError, ValueError, OSError):
+            continue
+        _store(entries, data, data.get("cached_at", ""))
+        path.unlink()
+        moved += 1
+        if not any(path.parent.iterdir()):
+            path.parent.rmdir()
+    if moved:
+        _save_index(entries)
+        print(f"    [Cache] Moved {moved} legacy transcript file(s) into {INDEX_FILE.name}")
+
+
+def _load_index():
+    """The index entries, read once per process (call with _cache_lock held)."""
+    if _index["path"] != INDEX_FILE:
+        entries = {}
+        try:
+            with open(INDEX_FILE) as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+        _migrate_legacy(entries)
+        _index.update(path=INDEX_FILE, entries=entries)
+    return _index["entries"]
+
+
+def _read_cache(ticker, source, period):
+    """Read cached transcript. Returns dict or None."""
+    with _cache_lock:
+        entry = _load_index().get(_cache_key(ticker, source, period))
+    if not entry:
+        return None
+    # Cache entries older than CACHE_MAX_AGE_DAYS are stale (re-fetch)
+    fetched_at = entry.get("fetched_at", "")
+    try:
+        if fetched_at and (datetime.now() - datetime.fromisoformat(fetched_at)).days > CACHE_MAX_AGE_DAYS:
             return None
-    return None
+        content = gzip.decompress(_blob_path(entry["sha256"]).read_bytes()).decode("utf-8")
+    except (OSError, ValueError, EOFError):
+        return None
+    data = {k: v for k, v in entry.items() if k not in ("fetched_at", "sha256")}
+    data["content"] = content
+    data["cached_at"] = fetched_at
+    _count(source, cache_hits=1)
+    return data
 
 
 def _write_cache(ticker, source, period, data):
     """Write transcript data to cache."""
     data["cached_at"] = datetime.now().isoformat()
-    path = _cache_path(ticker, source, period)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    record = {**data, "ticker": ticker.upper(), "source": source, "period": period}
+    with _cache_lock:
+        entries = _load_index()
+        _store(entries, record, data["cached_at"])
+        _save_index(entries)
+
+
+def _fill_in_order(candidates, need, cached, fetch):
+    """
+    Walk `candidates` (most preferred first) until `need` results are in
+    hand, taking cached(c) where it has one and fetch(c) otherwise; both
+    return a result or None. Cache hits are taken as they come and never
+    touch a limiter. Misses are fetched concurrently in waves no larger than
+    the number still needed, so the same candidates end up used as walking
+    the list one at a time. Returns the results in candidate order.
+    """
+    results = {}
+    pos = 0
+    while len(results) < need and pos < len(candidates):
+        wave = []
+        while pos < len(candidates) and len(results) + len(wave) < need:
+            hit = cached(candidates[pos])
+            if hit:
+                results[pos] = hit
+            else:
+                wave.append(pos)
+            pos += 1
+        outcomes = run_bounded(lambda i: fetch(candidates[i]), wave, workers=len(wave))
+        for i, (result, error) in zip(wave, outcomes):
+            if error is not None:
+                raise error
+            if result:
+                results[i] = result
+    return [results[i] for i in sorted(results)]
 
 
 # ---------------------------------------------------------------------------
@@ -109,14 +321,13 @@ def _fmp_request(endpoint, params=None):
 
     url = f"{FMP_BASE}{endpoint}?{urllib.parse.urlencode(params)}"
 
+    _count("fmp", requests=1)
     try:
-        req = urllib.request.Request(url, headers={
+        return http_client.get_json(url, timeout=15, headers={
             "Accept": "application/json",
             "User-Agent": "mungbeans.io/1.0"
         })
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read())
-    except (urllib.error.HTTPError, urllib.error.URLError, Exception) as e:
+    except Exception as e:
         print(f"    [FMP] Request failed: {e}")
         return None
 
@@ -139,8 +350,6 @@ def fetch_fmp_transcripts(ticker, max_transcripts=MAX_TRANSCRIPTS):
     if not os.environ.get("FMP_API_KEY"):
         return []
 
-    transcripts = []
-
     # FMP v4 endpoint: list available transcripts
     available = _fmp_request(f"/v4/earning_call_transcript", {"symbol": ticker})
     if not available:
@@ -161,27 +370,16 @@ def fetch_fmp_transcripts(ticker, max_transcripts=MAX_TRANSCRIPTS):
                            key=lambda x: (x.get("year", 0), x.get("quarter", 0)),
                            reverse=True)
 
-    fetched = 0
+    candidates = []
     for entry in available[:max_transcripts + 2]:
-        if fetched >= max_transcripts:
-            break
-
         year = entry.get("year")
         quarter = entry.get("quarter")
-        if not year or not quarter:
-            continue
+        if year and quarter:
+            candidates.append((year, quarter))
 
+    def _fetch(candidate):
+        year, quarter = candidate
         period = f"{year}-Q{quarter}"
-
-        # Check cache first
-        cached = _read_cache(ticker, "fmp", period)
-        if cached:
-            transcripts.append(cached)
-            fetched += 1
-            continue
-
-        # Fetch from API
-        time.sleep(FMP_DELAY)
         data = _fmp_request(f"/v3/earning_call_transcript/{ticker}",
                             {"year": year, "quarter": quarter})
 
@@ -199,9 +397,16 @@ def fetch_fmp_transcripts(ticker, max_transcripts=MAX_TRANSCRIPTS):
                     "char_count": len(transcript_text),
                 }
                 _write_cache(ticker, "fmp", period, result)
-                transcripts.append(result)
-                fetched += 1
-                print(f"    [FMP] Fetched {period} ({len(transcript_text):,} chars)")
+                _count("fmp", documents=1, chars=len(transcript_text))
+                print(f"    [FMP] Fetched {ticker} {period} ({len(transcript_text):,} chars)")
+                return result
+        return None
+
+    # Cache first, then the API for the quarters still missing
+    transcripts = _fill_in_order(
+        candidates, max_transcripts,
+        lambda c: _read_cache(ticker, "fmp", f"{c[0]}-Q{c[1]}"),
+        _fetch)
 
     return transcripts
 
@@ -211,17 +416,17 @@ def fetch_fmp_transcripts(ticker, max_transcripts=MAX_TRANSCRIPTS):
 # ---------------------------------------------------------------------------
 def _edgar_request(url):
     """Make a request to SEC EDGAR with required User-Agent."""
+    _count("edgar", requests=1)
     try:
-        req = urllib.request.Request(url, headers={
+        resp = http_client.fetch(url, timeout=15, headers={
             "User-Agent": SEC_USER_AGENT,
             "Accept": "application/json",
         })
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            raw = resp.read()
-            content_type = resp.headers.get("Content-Type", "")
-            if "json" in content_type:
-                return json.loads(raw)
-            return raw.decode("utf-8", errors="replace")
+        raw = resp.content
+        content_type = resp.headers.get("Content-Type", "")
+        if "json" in content_type:
+            return json.loads(raw)
+        return raw.decode("utf-8", errors="replace")
     except Exception as e:
         print(f"    [EDGAR] Request failed for {url}: {e}")
         return None
@@ -263,176 +468,268 @@ def _load_cik_lookup():
     return lookup
 
 
+_cik_lock = threading.Lock()
+_cik_lookup = None      # loaded once per process, by the first ticker that needs it
+
+
 def _get_cik(ticker):
     """Get CIK number for a ticker."""
-    lookup = _load_cik_lookup()
+    global _cik_lookup
+    with _cik_lock:
+        if not _cik_lookup:
+            _cik_lookup = _load_cik_lookup()
+        lookup = _cik_lookup
     return lookup.get(ticker.upper())
 
 
-def _extract_mda_section(html_text):
-    """
-    Extract the Management's Discussion and Analysis section from a
-    10-K or 10-Q HTML filing.
-
-    Modern iXBRL filings use anchor IDs and HTML entities. This function
-    handles both legacy plain-text and modern iXBRL formats.
-
-    Strategy:
-      1. Try anchor-based extraction (modern filings use IDs like
-         #ITEM7MANAGEMENTSDISCUSSION...)
-      2. Fall back to regex on extracted text
-
-    Returns extracted text or None.
-    """
-    if not html_text:
-        return None
-
-    # ------------------------------------------------------------------
-    # STEP 1: Try anchor-based extraction for modern iXBRL filings
-    # ------------------------------------------------------------------
-    # Look for anchor IDs that mark the MD&A section
-    anchor_patterns = [
-        r'(?i)id\s*=\s*["\']?(ITEM7MANAGEMENT[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item7management[^"\'>\s]*)',
-        r'(?i)name\s*=\s*["\']?(ITEM7MANAGEMENT[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item_7_management[^"\'>\s]*)',
-        # 10-Q uses Item 2 for MD&A
-        r'(?i)id\s*=\s*["\']?(ITEM2MANAGEMENT[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item2management[^"\'>\s]*)',
-    ]
-
-    end_anchor_patterns = [
-        r'(?i)id\s*=\s*["\']?(ITEM7A[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(ITEM8[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item7a[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item8[^"\'>\s]*)',
-        # 10-Q end markers
-        r'(?i)id\s*=\s*["\']?(ITEM3[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(ITEM4[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item3[^"\'>\s]*)',
-        r'(?i)id\s*=\s*["\']?(item4[^"\'>\s]*)',
-    ]
-
-    anchor_start = None
-    for pattern in anchor_patterns:
-        match = re.search(pattern, html_text)
-        if match:
-            anchor_start = match.start()
-            break
-
-    if anchor_start is not None:
-        # Find the end anchor
-        anchor_end = None
-        search_from = anchor_start + 100
-        for pattern in end_anchor_patterns:
-            match = re.search(pattern, html_text[search_from:])
-            if match:
-                candidate = search_from + match.start()
-                if anchor_end is None or candidate < anchor_end:
-                    anchor_end = candidate
+# MD&A section markers, compiled once. Each scanner is a single lookahead
+# alternation, so one pass over the text reports every alternative's matches
+# (overlapping ones included), with the group name saying which matched.
+# Priority and "first"/"last" rules are applied to those results exactly as
+# the old one-regex-at-a-time loops did.
+#
+# Anchor IDs of modern iXBRL filings, in priority order (10-K Item 7 first;
+# 10-Q uses Item 2 for MD&A):
+_ANCHOR_START = re.compile(
+    r'(?i)(?=(?:'
+    r'id\s*=\s*["\']?(?P<a0>ITEM7MANAGEMENT)'
+    r'|name\s*=\s*["\']?(?P<a1>ITEM7MANAGEMENT)'
+    r'|id\s*=\s*["\']?(?P<a2>item_7_management)'
+    r'|id\s*=\s*["\']?(?P<a3>ITEM2MANAGEMENT)'
+    r'))'
+)
+_ANCHOR_GROUPS = ("a0", "a1", "a2", "a3")
+# Earliest of these after the start ends the section (10-K: Item 7A / 8;
+# 10-Q: Item 3 / 4).
+_ANCHOR_END = re.compile(r'(?i)id\s*=\s*["\']?(?:ITEM7A|ITEM8|ITEM3|ITEM4)')
+
+# Text headers for filings without usable anchors.
+_TEXT_START = re.compile(
+    r"(?i)(?=(?:"
+    r"(?P<t0>item\s*7[\.\s]*[\-—–]?\s*management'?s?\s*discussion\s*and\s*analysis)"
+    r"|(?P<t1>management'?s?\s*discussion\s*and\s*analysis\s*of\s*(?:financial|results))"
+    r"|(?P<t2>item\s*2[\.\s]*[\-—–]?\s*management'?s?\s*discussion\s*and\s*analysis)"
+    r"))"
+)
+_TEXT_GROUPS = ("t0", "t1", "t2")
+_TEXT_END = re.compile(
+    r"(?i)item\s*7\s*a[\.\s]*[\-—–]?\s*quantitative\s*and\s*qualitative"
+    r"|item\s*8[\.\s]*[\-—–]?\s*financial\s*statements"
+    r"|item\s*3[\.\s]*[\-—–]?\s*quantitative\s*and\s*qualitative"
+    r"|item\s*4[\.\s]*[\-—–]?\s*controls\s*and\s*procedures"
+)
+# Table-of-contents entries have page numbers right after the header.
+_TOC_DOTS = re.compile(r'\s*\.{2,}\s*\d+')
+_TOC_PAGE = re.compile(r'\s+\d+\s*$')
+
+_TAGS = re.compile(r'<[^>]+>')
+_NBSP = re.compile(r'&nbsp;')
+_NUM_ENTITY = re.compile(r'&#\d+;')
+_NAMED_ENTITY = re.compile(r'&\w+;')
+_ANCHOR_REMNANT = re.compile(r'^id="[^"]*">\s*')
+_BLANK_LINES = re.compile(r'\n{3,}')
+_SPACES = re.compile(r' {2,}')
+_WHITESPACE = re.compile(r'\s+')
+
+MDA_MIN_CHARS = 1000
+MDA_MAX_CHARS = 60000
+ANCHOR_SPAN_CAP = 500000    # html chars kept when no end anchor exists
+TEXT_SPAN_CAP = 80000       # text chars kept when no end header exists
+_SCAN_OVERLAP = 512         # chars re-scanned across chunk boundaries
+
+
+def _cap(text):
+    if len(text) > MDA_MAX_CHARS:
+        text = text[:MDA_MAX_CHARS] + "\n\n[... truncated for analysis ...]"
+    return text
+
+
+def _anchor_mda(html_chunk):
+    """Text of the anchored MD&A html, or None if too short to trust."""
+    if HAS_BS4:
+        soup = BeautifulSoup(html_chunk, "html.parser")
+        text = soup.get_text(separator="\n")
+    else:
+        text = _TAGS.sub(' ', html_chunk)
+        text = _NBSP.sub(' ', text)
+        text = _NUM_ENTITY.sub(' ', text)
+        text = _NAMED_ENTITY.sub(' ', text)
 
-        if anchor_end is None:
-            anchor_end = min(anchor_start + 500000, len(html_text))
+    # Strip leading anchor ID remnant (e.g. 'id="ITEM7MANAGE..."')
+    text = _ANCHOR_REMNANT.sub('', text)
+    text = _BLANK_LINES.sub('\n\n', text)
+    text = _SPACES.sub(' ', text)
+    text = text.strip()
+    return _cap(text) if len(text) >= MDA_MIN_CHARS else None
 
-        html_chunk = html_text[anchor_start:anchor_end]
 
-        # Extract text from this HTML chunk
-        if HAS_BS4:
-            soup = BeautifulSoup(html_chunk, "html.parser")
-            text = soup.get_text(separator="\n")
-        else:
-            text = re.sub(r'<[^>]+>', ' ', html_chunk)
-            text = re.sub(r'&nbsp;', ' ', text)
-            text = re.sub(r'&#\d+;', ' ', text)
-            text = re.sub(r'&\w+;', ' ', text)
-
-        # Strip leading anchor ID remnant (e.g. 'id="ITEM7MANAGE..."')
-        text = re.sub(r'^id="[^"]*">\s*', '', text)
-
-        # Clean up
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
-        text = text.strip()
-
-        if len(text) >= 1000:
-            # Cap at 60K chars
-            if len(text) > 60000:
-                text = text[:60000] + "\n\n[... truncated for analysis ...]"
-            return text
-
-    # ------------------------------------------------------------------
-    # STEP 2: Fall back to text-based extraction
-    # ------------------------------------------------------------------
+def _text_mda(html_text):
+    """Fallback: locate the MD&A by its headers in the full document text."""
     if HAS_BS4:
         soup = BeautifulSoup(html_text, "html.parser")
         text = soup.get_text(separator="\n")
     else:
-        text = re.sub(r'<[^>]+>', ' ', html_text)
-        text = re.sub(r'&nbsp;', ' ', text)
-        text = re.sub(r'&#\d+;', ' ', text)
-        text = re.sub(r'&\w+;', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
+        text = _TAGS.sub(' ', html_text)
+        text = _NBSP.sub(' ', text)
+        text = _NUM_ENTITY.sub(' ', text)
+        text = _NAMED_ENTITY.sub(' ', text)
+        text = _WHITESPACE.sub(' ', text)
 
     # Normalize quotes/apostrophes for matching
     # Unicode right single quote (U+2019), left single quote (U+2018)
     text_normalized = text.replace(''', "'").replace(''', "'")
     text_normalized = text_normalized.replace('"', '"').replace('"', '"')
 
-    # MD&A header patterns (match on normalized text, use positions on original)
-    mda_start_patterns = [
-        r"(?i)item\s*7[\.\s]*[\-—–]?\s*management'?s?\s*discussion\s*and\s*analysis",
-        r"(?i)management'?s?\s*discussion\s*and\s*analysis\s*of\s*(?:financial|results)",
-        r"(?i)item\s*2[\.\s]*[\-—–]?\s*management'?s?\s*discussion\s*and\s*analysis",
-    ]
-
-    mda_end_patterns = [
-        r"(?i)item\s*7\s*a[\.\s]*[\-—–]?\s*quantitative\s*and\s*qualitative",
-        r"(?i)item\s*8[\.\s]*[\-—–]?\s*financial\s*statements",
-        r"(?i)item\s*3[\.\s]*[\-—–]?\s*quantitative\s*and\s*qualitative",
-        r"(?i)item\s*4[\.\s]*[\-—–]?\s*controls\s*and\s*procedures",
-    ]
-
-    # Find the LAST occurrence of MD&A header (skip table of contents entries)
-    mda_start = None
-    for pattern in mda_start_patterns:
-        for match in re.finditer(pattern, text_normalized):
-            # Skip if this looks like a table of contents entry (short context)
-            context_after = text_normalized[match.end():match.end()+200]
-            # TOC entries typically have page numbers right after
-            if re.match(r'\s*\.{2,}\s*\d+', context_after):
-                continue
-            if re.match(r'\s+\d+\s*$', context_after[:30]):
-                continue
-            mda_start = match.start()
-
+    # The LAST non-TOC occurrence of the last header pattern that has one.
+    last = {}
+    for match in _TEXT_START.finditer(text_normalized):
+        group = match.lastgroup
+        context_after = text_normalized[match.end(group):match.end(group) + 200]
+        if _TOC_DOTS.match(context_after) or _TOC_PAGE.match(context_after[:30]):
+            continue
+        last[group] = match.start()
+    mda_start = next((last[g] for g in reversed(_TEXT_GROUPS) if g in last), None)
     if mda_start is None:
         return None
 
-    mda_end = None
-    search_text = text_normalized[mda_start + 100:]
-    for pattern in mda_end_patterns:
-        match = re.search(pattern, search_text)
-        if match:
-            candidate = mda_start + 100 + match.start()
-            if mda_end is None or candidate < mda_end:
-                mda_end = candidate
-
-    if mda_end is None:
-        mda_end = min(mda_start + 80000, len(text))
+    match = _TEXT_END.search(text_normalized, mda_start + 100)
+    mda_end = match.start() if match else min(mda_start + TEXT_SPAN_CAP, len(text))
 
     mda_text = text[mda_start:mda_end].strip()
+    mda_text = _BLANK_LINES.sub('\n\n', mda_text)
+    mda_text = _SPACES.sub(' ', mda_text)
+    if len(mda_text) < MDA_MIN_CHARS:
+        return None
+    return _cap(mda_text)
 
-    # Clean up
-    mda_text = re.sub(r'\n{3,}', '\n\n', mda_text)
-    mda_text = re.sub(r' {2,}', ' ', mda_text)
 
-    if len(mda_text) < 1000:
-        return None
+class MdaScanner:
+    """
+    Incremental MD&A extraction over a filing as it downloads.
+
+    feed() takes decoded text chunks and returns True once the result is
+    settled, at which point the caller can stop downloading: the anchor
+    start is known (the top-priority anchor has appeared), the first end
+    anchor after it has arrived, and the section between them is long
+    enough. Anything else (lower-priority anchors, no end anchor, a section
+    too short, no anchors at all) needs the whole document, and finish()
+    resolves it. Either way the text equals _extract_mda_section's.
+
+    Each chunk is scanned once (plus a short overlap for markers split
+    across chunks); the document is joined at most twice.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._length = 0
+        self._tail = ""
+        self._first = {}          # anchor group -> first position
+        self._start = None
+        self._end = None
+        self.result = None
+        self.done = False
+
+    @property
+    def chars_read(self):
+        return self._length
+
+    def feed(self, chunk):
+        if self.done or not chunk:
+            return self.done
+        window = self._tail + chunk
+        offset = self._length - len(self._tail)
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        self._tail = window[-_SCAN_OVERLAP:]
+
+        if self._start is None:
+            for match in _ANCHOR_START.finditer(window):
+                self._first.setdefault(match.lastgroup, offset + match.start())
+            if _ANCHOR_GROUPS[0] in self._first:
+                self._start = self._first[_ANCHOR_GROUPS[0]]
+
+        if self._start is not None and self._end is None:
+            match = _ANCHOR_END.search(window, max(self._start + 100 - offset, 0))
+            if match:
+                self._end = offset + match.start()
+                text = _anchor_mda("".join(self._chunks)[self._start:self._end])
+                if text is not None:
+                    self.result, self.done = text, True
+                else:
+                    self._end = -1      # anchored section too short: fall back at the end
+        return self.done
+
+    def finish(self):
+        """Result once the whole document has been fed."""
+        if self.done:
+            return self.result
+        self.done = True
+        html_text = "".join(self._chunks)
+        if not html_text:
+            return None
+        if self._start is None:
+            self._start = next((self._first[g] for g in _ANCHOR_GROUPS if g in self._first), None)
+        if self._start is not None and self._end is None:
+            match = _ANCHOR_END.search(html_text, self._start + 100)
+            end = match.start() if match else min(self._start + ANCHOR_SPAN_CAP, len(html_text))
+            self.result = _anchor_mda(html_text[self._start:end])
+        if self.result is None:
+            self.result = _text_mda(html_text)
+        return self.result
+
+
+def _extract_mda_section(html_text):
+    """
+    Extract the Management's Discussion and Analysis section from a
+    10-K or 10-Q HTML filing.
 
-    if len(mda_text) > 60000:
-        mda_text = mda_text[:60000] + "\n\n[... truncated for analysis ...]"
+    Modern iXBRL filings use anchor IDs and HTML entities. This function
+    handles both legacy plain-text and modern iXBRL formats.
+
+    Strategy:
+      1. Try anchor-based extraction (modern filings use IDs like
+         #ITEM7MANAGEMENTSDISCUSSION...)
+      2. Fall back to regex on extracted text
 
-    return mda_text
+    Returns extracted text or None. fetch_edgar_filings streams filings
+    through MdaScanner directly; this is the same scan over a whole string.
+    """
+    if not html_text:
+        return None
+    scanner = MdaScanner()
+    scanner.feed(html_text)
+    return scanner.finish()
+
+
+def _edgar_stream_mda(url):
+    """Stream a filing document into an MdaScanner, closing the connection
+    once the MD&A is settled. Returns (fetched, mda_text or None, chars read,
+    whether the download stopped early)."""
+    scanner = MdaScanner()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stopped = False
+    _count("edgar", requests=1)
+    try:
+        chunks = http_client.stream(url, timeout=15, headers={
+            "User-Agent": SEC_USER_AGENT,
+            "Accept": "application/json",
+        })
+        try:
+            for raw in chunks:
+                if scanner.feed(decoder.decode(raw)):
+                    stopped = True
+                    break
+        finally:
+            chunks.close()
+        if not stopped:
+            scanner.feed(decoder.decode(b"", final=True))
+    except Exception as e:
+        print(f"    [EDGAR] Request failed for {url}: {e}")
+        return False, None, scanner.chars_read, False
+    if not scanner.chars_read:
+        return False, None, 0, False
+    _count("edgar", chars=scanner.chars_read)
+    return True, scanner.finish(), scanner.chars_read, stopped
 
 
 def fetch_edgar_filings(ticker, filing_types=("10-K", "10-Q"),
@@ -461,7 +758,6 @@ def fetch_edgar_filings(ticker, filing_types=("10-K", "10-Q"),
     cik_padded = cik.zfill(10)
 
     # Get submissions (filing list)
-    time.sleep(EDGAR_DELAY)
     submissions_url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
     subs = _edgar_request(submissions_url)
     if not subs or not isinstance(subs, dict):
@@ -476,16 +772,14 @@ def fetch_edgar_filings(ticker, filing_types=("10-K", "10-Q"),
     accessions = recent.get("accessionNumber", [])
     primary_docs = recent.get("primaryDocument", [])
 
-    results = []
     # Only look at the most recent 10 filings of each type
     # to avoid fetching decades of old filings
     cutoff_date = (datetime.now() - timedelta(days=3*365)).strftime("%Y-%m-%d")
 
+    candidates = []
     for form_type in filing_types:
         type_count = 0
         for i, form in enumerate(forms):
-            if len(results) >= max_filings:
-                break
             if form != form_type:
                 continue
             # Skip filings older than 3 years
@@ -514,42 +808,44 @@ def fetch_edgar_filings(ticker, filing_types=("10-K", "10-Q"),
                 quarter = q_map.get(month, "")
                 period = f"{form_type}_{year}-{quarter}" if quarter else f"{form_type}_{year}-{month}"
 
-            # Check cache
-            cached = _read_cache(ticker, "edgar", period)
-            if cached:
-                results.append(cached)
-                continue
-
-            # Fetch the filing document
             accession_clean = accession.replace("-", "")
             doc_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_clean}/{primary_doc}"
+            candidates.append((form_type, filing_date, period, doc_url))
+
+    def _fetch(candidate):
+        form_type, filing_date, period, doc_url = candidate
+        print(f"    [EDGAR] Fetching {ticker} {form_type} ({filing_date})...")
+        # Stream the document through the MD&A scanner; the download
+        # stops once the section's end marker has arrived.
+        fetched, mda_text, chars_read, stopped = _edgar_stream_mda(doc_url)
+        if not fetched:
+            return None
+        if not mda_text:
+            print(f"    [EDGAR] Could not extract MD&A from {ticker} {form_type} ({filing_date})")
+            return None
 
-            time.sleep(EDGAR_DELAY)
-            print(f"    [EDGAR] Fetching {form_type} ({filing_date})...")
-            html = _edgar_request(doc_url)
-
-            if not html or not isinstance(html, str):
-                continue
-
-            # Extract MD&A
-            mda_text = _extract_mda_section(html)
-            if not mda_text:
-                print(f"    [EDGAR] Could not extract MD&A from {form_type} ({filing_date})")
-                continue
-
-            result = {
-                "source": "edgar",
-                "ticker": ticker.upper(),
-                "period": period,
-                "date": filing_date,
-                "content": mda_text,
-                "filing_type": form_type,
-                "filing_url": doc_url,
-                "char_count": len(mda_text),
-            }
-            _write_cache(ticker, "edgar", period, result)
-            results.append(result)
-            print(f"    [EDGAR] Extracted MD&A: {len(mda_text):,} chars")
+        result = {
+            "source": "edgar",
+            "ticker": ticker.upper(),
+            "period": period,
+            "date": filing_date,
+            "content": mda_text,
+            "filing_type": form_type,
+            "filing_url": doc_url,
+            "char_count": len(mda_text),
+        }
+        _write_cache(ticker, "edgar", period, result)
+        _count("edgar", documents=1)
+        print(f"    [EDGAR] Extracted {ticker} MD&A: {len(mda_text):,} chars"
+              + (f" (stopped after {chars_read:,} chars of the filing)" if stopped else ""))
+        return result
+
+    # Cache first, then the filings still missing (several downloads at a
+    # time, within the shared EDGAR rate)
+    results = _fill_in_order(
+        candidates, max_filings,
+        lambda c: _read_cache(ticker, "edgar", c[2]),
+        _fetch)
 
     return results
 
@@ -571,6 +867,7 @@ def fetch_transcripts(ticker, prefer_calls=True, max_total=MAX_TRANSCRIPTS):
         List of transcript dicts sorted by date (most recent first).
         Each dict has: source, ticker, period, date, content, char_count
     """
+    init_http()
     ticker = ticker.upper()
     all_transcripts = []
 
@@ -609,21 +906,43 @@ def fetch_transcripts(ticker, prefer_calls=True, max_total=MAX_TRANSCRIPTS):
     return all_transcripts
 
 
-def fetch_transcripts_batch(tickers, max_per_ticker=MAX_TRANSCRIPTS):
+def fetch_transcripts_batch(tickers, max_per_ticker=MAX_TRANSCRIPTS,
+                            workers=TRANSCRIPT_WORKERS):
     """
-    Fetch transcripts for multiple tickers with rate limiting.
-    Returns dict: {ticker: [transcript_dicts]}
+    Fetch transcripts for multiple tickers concurrently.
+    Returns dict: {ticker: [transcript_dicts]}, in input order.
+
+    Up to `workers` tickers are in flight at once (TRANSCRIPT_WORKERS).
+    Pacing comes from the per-source limiters (init_http) rather than a
+    pause every few tickers, so one ticker's EDGAR downloads overlap
+    another's FMP calls without either source exceeding its rate. Prints
+    per-source throughput at the end.
     """
-    results = {}
-    for i, ticker in enumerate(tickers):
-        print(f"\n[{i+1}/{len(tickers)}] Fetching transcripts for {ticker}...")
-        results[ticker] = fetch_transcripts(ticker, max_total=max_per_ticker)
-
-        # Batch pause every 5 tickers
-        if (i + 1) % 5 == 0 and i + 1 < len(tickers):
-            print(f"  -- Batch pause (3s) --")
-            time.sleep(3)
+    init_http()
+    total = len(tickers)
+    before = source_stats()
+    start = time.time()
+    done = [0]
+
+    def _progress(i, ticker, result, error):
+        done[0] += 1
+        found = f"{len(result)} transcript(s)" if result else "none"
+        print(f"\n  -- [{done[0]}/{total}] {ticker.upper()}: {found} --")
+
+    print(f"\nFetching transcripts for {total} tickers ({workers} workers)")
+    outcomes = run_bounded(
+        lambda ticker: fetch_transcripts(ticker, max_total=max_per_ticker),
+        tickers, workers=workers, on_done=_progress)
 
+    results = {}
+    for ticker, (result, error) in zip(tickers, outcomes):
+        if error is not None:
+            print(f"  [Transcripts] {ticker.upper()} failed: {error}")
+        results[ticker] = result or []
+
+    elapsed = time.time() - start
+    print(f"\nTranscript throughput ({elapsed:.1f}s):")
+    print_throughput(elapsed, before)
     return results
 
 
@@ -637,13 +956,14 @@ if __name__ == "__main__":
         print("Usage: python transcript_fetcher.py TICKER [TICKER2 ...]")
         print("\nEnvironment variables:")
         print("  FMP_API_KEY  — Financial Modeling Prep API key (optional)")
+        print(f"  TRANSCRIPT_WORKERS — tickers fetched at once (default {TRANSCRIPT_WORKERS})")
         print(f"\nCache directory: {CACHE_DIR}")
         sys.exit(1)
 
     tickers = [t.upper() for t in sys.argv[1:]]
+    init_http()
 
-    for ticker in tickers:
-        transcripts = fetch_transcripts(ticker)
+    for ticker, transcripts in fetch_transcripts_batch(tickers).items():
         if transcripts:
             print(f"\n{'='*60}")
             print(f"RESULTS FOR {ticker}: {len(transcripts)} transcript(s)")
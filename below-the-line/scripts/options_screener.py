@@ -50,21 +50,29 @@ USAGE
     python3 scripts/options_screener.py --discover      # find optionable names, cache the list
     python3 scripts/options_screener.py                 # screen them, write data/options.json
     python3 scripts/options_screener.py --symbols GENI  # one name, verbose
+    python3 scripts/options_screener.py --concurrency 8 --rate 5   # async fan-out
     python3 scripts/options_screener.py --selftest      # math only, no network
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import math
+import random
 import re
 import statistics
 import sys
-import time
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
+import numpy as np
+
+import daily_close_store
+import http_client
+from rounding import round_half_even
+
 REPO = Path(__file__).resolve().parent.parent
 STOCKS = REPO / 'assets' / 'data' / 'stocks.json'
 OUT = REPO / 'assets' / 'data' / 'options.json'
@@ -77,8 +85,8 @@ MAX_SPREAD_PCT = 0.15        # ask-bid as a fraction of mid
 MIN_DAYS = 21                # nothing about to expire
 MAX_DAYS = 900               # ~2.5 years, covers LEAPS
 TIMEOUT = 15
-UA = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                    'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36'}
+CLOSE_HISTORY_DAYS = 366     # daily closes read for realized vol
+VOL_WINDOWS = (20, 60, 120)  # sessions; the IV comparison uses 60
 
 
 # --- pure functions: no network, covered by --selftest -----------------------
@@ -206,13 +214,142 @@ def annotate_iv(rows: list[dict], rv: float | None) -> None:
             r['realized_vol'] = round(rv * 100, 1)
 
 
+# --- columnar scoring ---------------------------------------------------------
+#
+# The same screen as score_contract + annotate_iv, over a whole chain at once:
+# one pass to pull the fields into arrays, the gates as masks, the arithmetic
+# on the survivors as array ops. --selftest checks it against the scalar path.
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _parse_contract(c: dict):
+    try:
+        return (float(c['strike']), float(c.get('bid') or 0), float(c.get('ask') or 0),
+                int(c.get('openInterest') or 0), int(c.get('volume') or 0),
+                math.floor(float(c['expiration']) / 86400))
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+
+
+def chain_columns(contracts: list[dict], spot: float, div_yield: float | None,
+                  today: date) -> dict:
+    """Contracts as arrays plus the `keep` mask of those passing every gate."""
+    parsed = [_parse_contract(c) for c in contracts]
+    ok = np.array([p is not None for p in parsed], dtype=bool)
+    vals = np.array([p if p is not None else (0, 0, 0, 0, 0, 0) for p in parsed],
+                    dtype=float).reshape(-1, 6)
+    strike, bid, ask, oi, vol, exp_day = vals.T
+    days = exp_day - (today.toordinal() - _EPOCH_ORDINAL)
+    exp_d = exp_day.astype('datetime64[D]')
+    weekday = (exp_day.astype(np.int64) + 3) % 7                  # 1970-01-01 was a Thursday
+    dom = (exp_d - exp_d.astype('datetime64[M]')).astype(np.int64) + 1
+    mid = (bid + ask) / 2
+    spread = ask - bid
+    with np.errstate(invalid='ignore', divide='ignore'):
+        spread_pct = np.where(mid > 0, spread / mid, 1.0)
+        keep = (ok & (MIN_DAYS <= days) & (days <= MAX_DAYS)
+                & (weekday == 4) & (15 <= dom) & (dom <= 21)
+                & (oi >= MIN_OPEN_INTEREST) & (vol >= MIN_VOLUME)
+                & ~(ask <= 0) & ~(bid <= 0) & ~(ask < bid)
+                & ~(spread_pct > MAX_SPREAD_PCT))
+    return {'contracts': contracts, 'keep': keep, 'spot': spot, 'div_yield': div_yield,
+            'strike': strike, 'bid': bid, 'ask': ask, 'oi': oi, 'vol': vol,
+            'exp_day': exp_day, 'days': days, 'mid': mid, 'spread': spread,
+            'spread_pct': spread_pct}
+
+
+def chain_rows(cols: dict, rv: float | None = None) -> list[dict]:
+    """score_contract rows (annotated as annotate_iv would) for the kept
+    contracts, in input order."""
+    idx = np.flatnonzero(cols['keep'])
+    if not len(idx):
+        return []
+    contracts = [cols['contracts'][i] for i in idx]
+    spot, div_yield = cols['spot'], cols['div_yield']
+    strike, bid, ask = cols['strike'][idx], cols['bid'][idx], cols['ask'][idx]
+    days, mid, spread = cols['days'][idx], cols['mid'][idx], cols['spread'][idx]
+    spread_pct = cols['spread_pct'][idx]
+
+    is_call = np.array([(c.get('contract_type') or 'call') == 'call' for c in contracts])
+    # where(x > 0, x, 0), not np.maximum: max(0.0, nan) is 0.0 in Python
+    call_iv, put_iv = spot - strike, strike - spot
+    intrinsic = np.where(is_call, np.where(call_iv > 0, call_iv, 0.0),
+                         np.where(put_iv > 0, put_iv, 0.0))
+    time_value = ask - intrinsic
+    if not div_yield or div_yield <= 0 or spot <= 0:
+        divs = np.zeros(len(idx))
+    else:
+        divs = spot * (div_yield / 100.0) * (days / 365.0)
+    parity_gap = (ask + strike) - (spot - divs)
+    discount_pct = -parity_gap / spot * 100 if spot > 0 else np.full(len(idx), np.nan)
+
+    ivs = []
+    for c in contracts:
+        iv = c.get('impliedVolatility')
+        try:
+            ivs.append(float(iv) if iv is not None else None)
+        except (TypeError, ValueError):
+            ivs.append(None)
+    has_iv = np.array([bool(v) for v in ivs])
+    iv = np.array([v if v else np.nan for v in ivs], dtype=float)
+    iv_pct = round_half_even(iv * 100, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        moneyness = round_half_even(np.where(strike != 0, spot / strike, np.nan), 3)
+        iv_ratio = (round_half_even((iv_pct / 100.0) / rv, 2) if rv and rv > 0 else None)
+
+    expiries = (cols['exp_day'][idx].astype('datetime64[D]')).astype(str).tolist()
+    columns = zip(
+        contracts, is_call.tolist(),
+        round_half_even(strike, 2).tolist(), expiries, days.astype(int).tolist(),
+        round_half_even(bid, 2).tolist(), round_half_even(ask, 2).tolist(),
+        round_half_even(mid, 2).tolist(), round_half_even(spread, 2).tolist(),
+        round_half_even(spread_pct * 100, 1).tolist(),
+        cols['vol'][idx].astype(int).tolist(), cols['oi'][idx].astype(int).tolist(),
+        round_half_even(intrinsic, 2).tolist(), round_half_even(time_value, 3).tolist(),
+        round_half_even(time_value / days, 4).tolist(), round_half_even(divs, 3).tolist(),
+        round_half_even(parity_gap, 3).tolist(), (parity_gap < 0).tolist(),
+        round_half_even(discount_pct, 2).tolist(), has_iv.tolist(), iv_pct.tolist(),
+        (strike != 0).tolist(), moneyness.tolist(),
+        iv_ratio.tolist() if iv_ratio is not None else [None] * len(idx),
+    )
+    realized = round(rv * 100, 1) if rv and rv > 0 else None
+    rows = []
+    for (c, call, k, exp, d, b, a, m, sp, spp, v, o, intr, tv, tvd, dv, pg, below,
+         disc, hiv, ivp, nonzero, mny, ratio) in columns:
+        row = {
+            'contract': c.get('contractSymbol'),
+            'type': 'call' if call else 'put',
+            'strike': k, 'expiry': exp, 'days': d,
+            'bid': b, 'ask': a, 'mid': m, 'spread': sp, 'spread_pct': spp,
+            'volume': v, 'open_interest': o,
+            'intrinsic': intr, 'time_value': tv, 'time_value_per_day': tvd,
+            'expected_dividends': dv,
+            'parity_gap': pg if call else None,
+            'below_parity': bool(call and below),
+            'discount_pct': disc if (call and spot > 0) else None,
+            'iv': ivp if hiv else None,
+            'moneyness': mny if nonzero else None,
+        }
+        if realized is not None and hiv and ivp:
+            row['iv_vs_realized'] = ratio
+            row['realized_vol'] = realized
+        rows.append(row)
+    return rows
+
+
+def score_chain(contracts: list[dict], spot: float, div_yield: float | None,
+                today: date, rv: float | None = None) -> list[dict]:
+    """Columnar equivalent of score_contract over `contracts` followed by
+    annotate_iv(rows, rv)."""
+    return chain_rows(chain_columns(contracts, spot, div_yield, today), rv)
+
+
 # --- network -----------------------------------------------------------------
 
 def get(url: str):
     try:
-        with urllib.request.urlopen(
-                urllib.request.Request(url, headers=UA), timeout=TIMEOUT) as r:
-            return json.load(r)
+        return http_client.get_json(url, timeout=TIMEOUT)
     except Exception:
         return None
 
@@ -227,13 +364,98 @@ def fetch_chain(symbol: str, expiry_ts: int | None = None) -> dict | None:
 
 
 def fetch_daily_closes(symbol: str) -> list[float]:
-    d = get(f'https://query2.finance.yahoo.com/v8/finance/chart/'
-            f'{symbol.replace(".", "-")}?interval=1d&range=1y')
-    res = ((d or {}).get('chart') or {}).get('result') or []
-    if not res:
+    """About a year of adjusted daily closes from the shared daily-close
+    store, which only asks Yahoo for sessions it does not have yet."""
+    start = date.today() - timedelta(days=CLOSE_HISTORY_DAYS)
+    try:
+        return daily_close_store.get_daily_closes(symbol, start.isoformat()).tolist()
+    except Exception:
         return []
-    q = (res[0].get('indicators') or {}).get('quote') or [{}]
-    return [c for c in (q[0].get('close') or []) if c]
+
+
+# --- fan-out -----------------------------------------------------------------
+#
+# A symbol needs its head chain, then every wanted monthly expiry, then a year
+# of daily closes. Only the expiries are independent of each other, but whole
+# symbols are too. screen_all runs both concurrently on asyncio: each call goes
+# to the shared HTTP client on a worker thread (keeping its own TIMEOUT), a
+# semaphore bounds the calls in flight, and the client's per-host token bucket
+# caps the request rate globally. With concurrency 1 the calls run one at a
+# time in the old order.
+
+async def _call(inflight: asyncio.Semaphore, fn, *args):
+    async with inflight:
+        return await asyncio.to_thread(fn, *args)
+
+
+async def screen_symbol(sym: str, stocks: dict, today: date,
+                        inflight: asyncio.Semaphore) -> tuple[str, dict | None]:
+    """(progress note, options.json entry or None) for one symbol."""
+    head = await _call(inflight, fetch_chain, sym)
+    if not head or not head.get('expirationDates'):
+        return ' no chain', None
+
+    spot = ((head.get('quote') or {}).get('regularMarketPrice')
+            or stocks.get(sym, {}).get('close'))
+    if not spot:
+        return ' no price', None
+
+    div_yield = stocks.get(sym, {}).get('dividend_yield')
+
+    # Monthlies and LEAPS only, so most listed expirations are skipped.
+    wanted = []
+    for ts in head['expirationDates']:
+        ed = datetime.fromtimestamp(ts, tz=timezone.utc).date()
+        if is_monthly(ed) and MIN_DAYS <= (ed - today).days <= MAX_DAYS:
+            wanted.append(ts)
+    chains = await asyncio.gather(*(_call(inflight, fetch_chain, sym, ts) for ts in wanted))
+    contracts = []
+    for chain in chains:
+        if not chain or not chain.get('options'):
+            continue
+        opt = chain['options'][0]
+        for kind in ('calls', 'puts'):
+            for c in opt.get(kind) or []:
+                c['contract_type'] = kind[:-1]
+                contracts.append(c)
+
+    cols = chain_columns(contracts, spot, div_yield, today)
+    if not cols['keep'].any():
+        return f' {len(wanted)} expiries, nothing passed the gates', None
+
+    closes = await _call(inflight, fetch_daily_closes, sym)
+    vols = daily_close_store.realized_vols(closes, VOL_WINDOWS)
+    rows = chain_rows(cols, vols[60])
+
+    rows.sort(key=lambda r: (r['discount_pct'] is None, -(r['discount_pct'] or 0)))
+    cheap = sum(1 for r in rows if r['below_parity'])
+    return (f' {len(rows)} contracts, {cheap} below parity',
+            {'spot': round(float(spot), 2),
+             'realized_vol': {f'{w}d': round(v * 100, 1) if v else None
+                              for w, v in vols.items()},
+             'contracts': rows})
+
+
+async def screen_all(targets: list[str], stocks: dict, today: date,
+                     concurrency: int = 1) -> dict:
+    """symbol -> options.json entry for every target that screened, in
+    target order regardless of completion order."""
+    concurrency = max(1, concurrency)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=concurrency))
+    inflight = asyncio.Semaphore(concurrency)
+    symbols = asyncio.Semaphore(concurrency)
+    done = [0]
+
+    async def one(sym):
+        async with symbols:
+            note, entry = await screen_symbol(sym, stocks, today, inflight)
+        done[0] += 1
+        print(f'  [{done[0]}/{len(targets)}] {sym:<6}{note}', flush=True)
+        return entry
+
+    entries = await asyncio.gather(*(one(sym) for sym in targets))
+    return {sym: e for sym, e in zip(targets, entries) if e is not None}
 
 
 # --- selftest ----------------------------------------------------------------
@@ -316,6 +538,47 @@ def selftest() -> int:
     flat = [100.0] * 90
     check('flat series has ~zero vol', (realized_vol(flat) or 0) < 1e-9, True)
     check('short series returns None', realized_vol([100, 101]) is None, True)
+    walk = [100.0]
+    vrng = random.Random(3)
+    for _ in range(300):
+        walk.append(walk[-1] * math.exp(vrng.gauss(0, 0.02)))
+    for n in (30, 80, 301):
+        vols = daily_close_store.realized_vols(walk[:n], VOL_WINDOWS)
+        check(f'20/60/120d on {n} closes match realized_vol',
+              all((vols[w] is None and realized_vol(walk[:n], w) is None)
+                  or abs(vols[w] - realized_vol(walk[:n], w)) < 1e-12 for w in VOL_WINDOWS),
+              True)
+    check('short series returns None (all windows)',
+          set(daily_close_store.realized_vols([100, 101]).values()), {None})
+
+    print('\ncolumnar chain scoring matches score_contract + annotate_iv')
+    rng = random.Random(7)
+    t = date(2026, 8, 15)
+    fridays = [datetime(2026, m, d, tzinfo=timezone.utc).timestamp()
+               for m, d in ((9, 18), (10, 16), (11, 20), (12, 11), (12, 18))]
+    fridays += [datetime(2027 + y, 1, 15, tzinfo=timezone.utc).timestamp() for y in range(3)]
+    fridays += [datetime(2026, 9, 18, 23, 59, tzinfo=timezone.utc).timestamp(), 'bad']
+    chain = []
+    for _ in range(3000):
+        strike = rng.choice([rng.uniform(1, 120), 50.0, 0.0])
+        bid = rng.choice([rng.uniform(0, 40)] * 6 + [0, None, float('nan')])
+        c = {'strike': strike, 'bid': bid,
+             'ask': (bid or 0) + rng.choice([0.05, 0.3, 0.3, 2.0, -0.1]) if bid == bid else 1.0,
+             'openInterest': rng.choice([0, 99, 100, 5000, 5000, None]),
+             'volume': rng.choice([0, 9, 10, 300, 300, None]),
+             'expiration': rng.choice(fridays),
+             'impliedVolatility': rng.choice([None, 0.0, 0.0004, rng.uniform(0.05, 1.5), 'x']),
+             'contract_type': rng.choice(['call', 'put', None]),
+             'contractSymbol': f'T{rng.randrange(10 ** 6)}'}
+        if rng.random() < 0.02:
+            del c['strike']
+        chain.append(c)
+    for spot, dy, rv in ((55.0, None, 0.31), (55.0, 2.75, None), (12.3, 0.8, 0.9)):
+        scalar = [r for r in (score_contract(dict(c), spot, dy, t) for c in chain) if r]
+        annotate_iv(scalar, rv)
+        columnar = score_chain([dict(c) for c in chain], spot, dy, t, rv)
+        check(f'spot {spot} yield {dy} rv {rv} ({len(scalar)} rows)',
+              json.dumps(columnar) == json.dumps(scalar), True)
 
     print(f"\n{'PASS' if not fails else str(fails) + ' FAILURES'}")
     return fails
@@ -326,7 +589,12 @@ def main() -> None:
     ap.add_argument('--selftest', action='store_true')
     ap.add_argument('--discover', action='store_true')
     ap.add_argument('--symbols', nargs='*')
-    ap.add_argument('--delay', type=float, default=0.4)
+    ap.add_argument('--delay', type=float, default=0.4,
+                    help='seconds between Yahoo requests (global cap)')
+    ap.add_argument('--rate', type=float, default=0,
+                    help='Yahoo requests per second; overrides --delay')
+    ap.add_argument('--concurrency', type=int, default=1,
+                    help='requests in flight across symbols and expiries (1 = sequential)')
     ap.add_argument('--limit', type=int, default=0)
     args = ap.parse_args()
 
@@ -346,58 +614,18 @@ def main() -> None:
     if args.limit:
         targets = targets[:args.limit]
 
-    print(f'{len(targets)} symbols, {TIMEOUT}s timeout each\n')
-
-    results, optionable = {}, []
-    for i, sym in enumerate(targets, 1):
-        print(f'  [{i}/{len(targets)}] {sym:<6}', end='', flush=True)
-        head = fetch_chain(sym)
-        time.sleep(args.delay)
-        if not head or not head.get('expirationDates'):
-            print(' no chain')
-            continue
-
-        spot = ((head.get('quote') or {}).get('regularMarketPrice')
-                or stocks.get(sym, {}).get('close'))
-        if not spot:
-            print(' no price')
-            continue
-
-        div_yield = stocks.get(sym, {}).get('dividend_yield')
-
-        # Monthlies and LEAPS only, so most listed expirations are skipped.
-        wanted = []
-        for ts in head['expirationDates']:
-            ed = datetime.fromtimestamp(ts, tz=timezone.utc).date()
-            if is_monthly(ed) and MIN_DAYS <= (ed - today).days <= MAX_DAYS:
-                wanted.append(ts)
-        rows = []
-        for ts in wanted:
-            chain = fetch_chain(sym, ts)
-            time.sleep(args.delay)
-            if not chain or not chain.get('options'):
-                continue
-            opt = chain['options'][0]
-            for kind in ('calls', 'puts'):
-                for c in opt.get(kind) or []:
-                    c['contract_type'] = kind[:-1]
-                    r = score_contract(c, spot, div_yield, today)
-                    if r:
-                        rows.append(r)
-
-        if not rows:
-            print(f' {len(wanted)} expiries, nothing passed the gates')
-            continue
-
-        closes = fetch_daily_closes(sym)
-        time.sleep(args.delay)
-        annotate_iv(rows, realized_vol(closes))
-
-        rows.sort(key=lambda r: (r['discount_pct'] is None, -(r['discount_pct'] or 0)))
-        results[sym] = {'spot': round(float(spot), 2), 'contracts': rows}
-        optionable.append(sym)
-        cheap = sum(1 for r in rows if r['below_parity'])
-        print(f' {len(rows)} contracts, {cheap} below parity')
+    # One Yahoo request per --delay seconds (or --rate per second), enforced
+    # by the shared client's per-host bucket however many calls are in flight.
+    rate = args.rate or (1.0 / args.delay if args.delay > 0 else 0)
+    if rate > 0:
+        for host in http_client.YAHOO_HOSTS:
+            http_client.set_rate(host, rate)
+    mode = (f'{args.concurrency} requests in flight' if args.concurrency > 1
+            else 'sequential')
+    print(f'{len(targets)} symbols, {TIMEOUT}s timeout each, {mode}\n')
+
+    results = asyncio.run(screen_all(targets, stocks, today, args.concurrency))
+    optionable = list(results)
 
     if args.discover or not OPTIONABLE.exists():
         OPTIONABLE.write_text(json.dumps({'generated': today.isoformat(),
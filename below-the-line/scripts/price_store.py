@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Local weekly price-history store with incremental appends.
+
+fetch_weekly_data used to ask Yahoo for period="max" on every run, which
+re-downloads decades of bars per ticker to pick up one new week. This keeps
+each symbol's weekly history on disk and only asks for the tail.
+
+Layout (scripts/.price_store/, gitignored, persisted in CI with actions/cache):
+
+  <SYMBOL>.npy        structured NumPy array, one row per weekly bar:
+                        ts (int64, UTC ns), open, high, low, close, volume,
+                        dividends, splits
+                      np.load(..., mmap_mode='r') reads it without a copy.
+  <SYMBOL>.json       sidecar: exchange tz, last bar date, when the last full
+                      fetch happened.
+
+Each run fetches from a few stored bars back (OVERLAP_BARS) to the present
+and splices the result on. Yahoo's Close is split- and dividend-adjusted, so
+any corporate action restates every earlier bar. A full period="max"
+refetch is therefore requested when:
+
+  - the overlapping closes no longer match what is stored (history was
+    restated upstream),
+  - a new bar carries a dividend or split (the restatement is coming even
+    if Yahoo hasn't applied it to the overlap yet),
+  - the newest bar shows the split signature against the stored 200-week
+    line (same test main() uses on stocks.json, see split_signature), or
+  - the last full fetch is older than FULL_REFRESH_DAYS (safety net).
+
+PRICE_STORE=off disables the store and falls back to a full fetch every run.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+STORE_DIR = Path(__file__).parent / '.price_store'
+
+OVERLAP_BARS = 4            # stored bars re-fetched and compared each run
+FULL_REFRESH_DAYS = 90      # force a period="max" refetch at least this often
+CLOSE_RTOL = 1e-5           # overlap closes must match to this tolerance
+
+# Split signature (shared with main()'s stocks.json integrity check).
+SPLIT_CRASH = -0.35         # weekly move beyond which a flat line is suspect
+SPLIT_FLAT = 0.005          # line movement small enough to call unmoved
+LINE_WINDOW = 200           # the 200-week line
+
+BAR_DTYPE = np.dtype([
+    ('ts', 'i8'),
+    ('open', 'f8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8'),
+    ('volume', 'i8'),
+    ('dividends', 'f8'), ('splits', 'f8'),
+])
+
+_YF_COLUMNS = {
+    'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close',
+    'volume': 'Volume', 'dividends': 'Dividends', 'splits': 'Stock Splits',
+}
+
+
+def store_enabled() -> bool:
+    return os.environ.get('PRICE_STORE', 'on').lower() not in ('off', 'false', '0')
+
+
+def split_signature(prev_close, close, prev_line, line) -> Optional[Tuple[float, float, float]]:
+    """Return (px_chg, line_chg, implied_ratio) if a move looks like an
+    unrestated split, else None.
+
+    A split restates the newest bar into post-split dollars while the bars
+    under the 200-week line stay pre-split, so price gaps down by the split
+    ratio and the line does not move. A real decline of the same size drags
+    the line with it.
+    """
+    if not (prev_close and close and prev_line and line) or prev_close <= 0 or prev_line <= 0:
+        return None
+    px_chg = close / prev_close - 1
+    line_chg = abs(line / prev_line - 1)
+    if px_chg <= SPLIT_CRASH and line_chg < SPLIT_FLAT:
+        return px_chg, line_chg, prev_close / close
+    return None
+
+
+# ── On-disk format ──────────────────────────────────────────────────────────
+
+def _paths(symbol: str) -> Tuple[Path, Path]:
+    safe = symbol.replace('/', '_')
+    return STORE_DIR / f'{safe}.npy', STORE_DIR / f'{safe}.json'
+
+
+def _frame_to_bars(df: pd.DataFrame) -> np.ndarray:
+    bars = np.empty(len(df), dtype=BAR_DTYPE)
+    idx = df.index
+    if idx.tz is None:
+        idx = idx.tz_localize('UTC')
+    bars['ts'] = idx.tz_convert('UTC').as_unit('ns').asi8
+    for field, col in _YF_COLUMNS.items():
+        if col in df.columns:
+            vals = df[col].to_numpy()
+            if field == 'volume':
+                vals = np.nan_to_num(vals.astype('f8'), nan=0.0)
+            bars[field] = vals
+        else:
+            bars[field] = 0
+    return bars
+
+
+def bars_to_frame(bars: np.ndarray, tz: str) -> pd.DataFrame:
+    """Rebuild the frame yfinance's weekly history would have returned."""
+    index = pd.DatetimeIndex(pd.to_datetime(np.asarray(bars['ts']), utc=True)).tz_convert(tz)
+    index.name = 'Date'
+    return pd.DataFrame(
+        {col: np.array(bars[field]) for field, col in _YF_COLUMNS.items()},
+        index=index,
+    )
+
+
+def load_bars(symbol: str) -> Tuple[Optional[np.ndarray], dict]:
+    """Memory-map a symbol's stored bars. Returns (None, {}) if absent or unreadable."""
+    npy, meta_path = _paths(symbol)
+    if not (npy.exists() and meta_path.exists()):
+        return None, {}
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        bars = np.load(npy, mmap_mode='r')
+        if bars.dtype != BAR_DTYPE or len(bars) == 0:
+            return None, {}
+        return bars, meta
+    except Exception:
+        return None, {}
+
+
+def save_bars(symbol: str, bars: np.ndarray, tz: str, full: bool, meta: Optional[dict] = None) -> None:
+    """Write bars + sidecar atomically (temp file, then rename)."""
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    npy, meta_path = _paths(symbol)
+    meta = dict(meta or {})
+    meta['tz'] = tz
+    meta['rows'] = int(len(bars))
+    meta['last_date'] = pd.Timestamp(int(bars['ts'][-1]), tz='UTC').tz_convert(tz).strftime('%Y-%m-%d')
+    meta['updated_at'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    if full:
+        meta['full_fetched_at'] = meta['updated_at']
+
+    tmp = npy.with_name(npy.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.save(f, np.ascontiguousarray(bars, dtype=BAR_DTYPE))
+    os.replace(tmp, npy)
+    tmp = meta_path.with_name(meta_path.name + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, separators=(',', ':'))
+    os.replace(tmp, meta_path)
+
+
+# ── Incremental update ──────────────────────────────────────────────────────
+
+def _needs_full_refresh(stored: np.ndarray, fresh: np.ndarray, meta: dict) -> Optional[str]:
+    """Decide whether the tail fetch can be spliced on. Returns a reason if not."""
+    full_at = meta.get('full_fetched_at')
+    if not full_at:
+        return 'no full fetch on record'
+    age = (datetime.now(timezone.utc)
+           - datetime.strptime(full_at, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc))
+    if age.days >= FULL_REFRESH_DAYS:
+        return f'last full fetch {age.days}d ago'
+
+    # Overlap check. The stored last bar may have been a partial week, so
+    # only bars before it are expected to be final.
+    settled = stored[:-1]
+    common, s_idx, f_idx = np.intersect1d(settled['ts'], fresh['ts'], return_indices=True)
+    if len(common) == 0:
+        return 'no overlapping bars'
+    if not np.allclose(settled['close'][s_idx], fresh['close'][f_idx], rtol=CLOSE_RTOL, atol=0):
+        return 'overlapping closes restated'
+
+    # Corporate actions not yet seen: anything on a bar past the stored tail,
+    # or a change on the (possibly partial) stored last bar.
+    new = fresh[fresh['ts'] > settled['ts'][-1]]
+    unseen = fresh[fresh['ts'] > stored['ts'][-1]]
+    last = fresh[fresh['ts'] == stored['ts'][-1]]
+    if np.any(unseen['splits'] != 0) or np.any(last['splits'] != stored['splits'][-1]):
+        return 'split in new bars'
+    if np.any(unseen['dividends'] != 0) or np.any(last['dividends'] != stored['dividends'][-1]):
+        return 'dividend in new bars'
+
+    # Split signature on the newest bar vs. the stored line.
+    if len(new) and len(settled) >= LINE_WINDOW:
+        prev_close = float(settled['close'][-1])
+        prev_line = float(np.mean(settled['close'][-LINE_WINDOW:]))
+        closes = np.concatenate([settled['close'], new['close']])
+        line = float(np.mean(closes[-LINE_WINDOW:]))
+        if split_signature(prev_close, float(new['close'][-1]), prev_line, line):
+            return 'split signature on newest bar'
+    return None
+
+
+def get_weekly_history(symbol: str) -> pd.DataFrame:
+    """Weekly history for `symbol`, shaped like yf.Ticker.history(period="max", interval="1wk").
+
+    Uses the local store when possible and fetches only the tail. Returns an
+    empty DataFrame when Yahoo has nothing.
+    """
+    ticker = yf.Ticker(symbol)
+    if not store_enabled():
+        return ticker.history(period="max", interval="1wk")
+
+    stored, meta = load_bars(symbol)
+    if stored is not None:
+        tz = meta['tz']
+        start = pd.Timestamp(int(stored['ts'][max(0, len(stored) - OVERLAP_BARS)]), tz='UTC').tz_convert(tz)
+        tail = ticker.history(start=start.strftime('%Y-%m-%d'), interval="1wk")
+        if not tail.empty:
+            fresh = _frame_to_bars(tail)
+            reason = _needs_full_refresh(stored, fresh, meta)
+            if reason is None:
+                first_new = fresh['ts'][0]
+                merged = np.concatenate([stored[stored['ts'] < first_new], fresh])
+                save_bars(symbol, merged, tz, full=False, meta=meta)
+                return bars_to_frame(merged, tz)
+            print(f"  ↻ {symbol}: full history refetch ({reason})")
+
+    df = ticker.history(period="max", interval="1wk")
+    if df.empty:
+        return df
+    tz = str(df.index.tz) if df.index.tz is not None else 'UTC'
+    bars = _frame_to_bars(df)
+    save_bars(symbol, bars, tz, full=True, meta=meta)
+    return bars_to_frame(bars, tz)
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Vectorized rounding that matches Python's round() exactly.
+
+The tracking, portfolio and options scripts build their JSON from NumPy
+arrays but used to round value by value with round(), and their outputs
+are diffed week to week. np.round alone can differ from round() at .5
+ties (e.g. round(2.675, 2) == 2.67, np.round gives 2.68), so
+round_half_even() rounds the whole array with NumPy and hands only the
+near-tie values back to round().
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def round_half_even(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Python round() of every value, vectorized.
+
+    np.round scales, rounds to an integer and scales back, which picks the
+    same integer as Python's exact decimal rounding unless the scaled value
+    lies within float error of a .5 tie. Only those are rounded in Python.
+    """
+    values = np.asarray(values, dtype=float)
+    scaled = values * 10.0 ** ndigits
+    out = np.round(values, ndigits)
+    with np.errstate(invalid='ignore'):
+        tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6 + 1e-12 * np.abs(scaled)
+    if tie.any():
+        out[tie] = [round(v, ndigits) for v in values[tie].tolist()]
+    return out
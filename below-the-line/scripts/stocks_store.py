@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Sharded stocks.json: a slim index plus one detail file per symbol.
+
+update_stocks.py used to write every stock's chart payloads (growth, touch
+and health charts, insider buys, Bean Score levels, dislocation detail)
+inline in one stocks.json, twice per run, and every Hugo template that
+needed the list of symbols parsed all of it. Now:
+
+  assets/data/stocks.json          index: summary, generated_*, and per
+                                   stock every field the list page and
+                                   homepage render (same shape as before,
+                                   minus DETAIL_FIELDS)
+  assets/data/stocks/<SYMBOL>.json detail shard: DETAIL_FIELDS for one
+                                   symbol, read only by that stock's page
+
+bean_score_data keeps its list-page field (current_score) in the index; the
+full record lives in the shard. content/stocks/_content.gotmpl merges each
+shard back over its index entry, so the stock page template sees the same
+params as before. Scripts that read stocks.json (bean_score_levels,
+options_screener, check_split_artifacts, the microcap screener) only use
+index fields and are unaffected.
+
+Shards are only rewritten when their bytes change and shards for symbols
+that left the universe are removed, so the second write after the Bean
+Score merge touches just the shards whose levels moved.
+
+Encoding uses json's C encoder with allow_nan=False: a tree with no NaN/inf
+is encoded in one pass, and only one that has them is sanitized (NaN/inf to
+null) and encoded again. NumPy/pandas scalars are converted by the default
+hook. The index is written to a temp file that is renamed into place, and
+copy_index() writes stocks_baseline.json from those same bytes.
+
+STOCKS_JSON_FORMAT=legacy writes the old monolithic stocks.json instead
+(the content adapter falls back to inline fields when a shard is missing).
+`python stocks_store.py join OUT` assembles a monolithic file from an
+index and its shards on request; `split` does the reverse.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent.parent / 'assets' / 'data'
+STOCKS_FILE = DATA_DIR / 'stocks.json'
+DETAIL_DIR = DATA_DIR / 'stocks'
+
+# Rendered only on the stock's own page.
+DETAIL_FIELDS = (
+    'growth_chart', 'touch_chart', 'health_chart', 'insider_buys',
+    'bean_score_data', 'dislocation',
+)
+# Detail fields with a few keys the list page needs, kept in the index too.
+INDEX_SUBFIELDS = {'bean_score_data': ('current_score',)}
+
+# Index marker: tells readers (and merge_field) the shards exist.
+FORMAT_KEY = 'detail_dir'
+
+
+def legacy_format() -> bool:
+    return os.environ.get('STOCKS_JSON_FORMAT', 'sharded').lower() == 'legacy'
+
+
+def detail_path(symbol: str, detail_dir: Path = DETAIL_DIR) -> Path:
+    return detail_dir / f"{symbol.replace('/', '_')}.json"
+
+
+def split_stock(stock: dict) -> tuple[dict, dict]:
+    """(index entry, detail shard) for one stock dict."""
+    entry, detail = {}, {}
+    for k, v in stock.items():
+        if k not in DETAIL_FIELDS:
+            entry[k] = v
+            continue
+        detail[k] = v
+        keep = INDEX_SUBFIELDS.get(k)
+        if keep and isinstance(v, dict):
+            entry[k] = {sk: v[sk] for sk in keep if sk in v}
+    return entry, detail
+
+
+def _finite(obj):
+    """Copy of `obj` with NaN/inf floats as None. NaN/inf are invalid JSON;
+    Hugo rejects them with "invalid character 'N'"."""
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def _default(obj):
+    """NumPy scalars/arrays and timestamps, for json.dumps(default=...)."""
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        v = float(obj)
+        return v if math.isfinite(v) else None
+    if isinstance(obj, np.ndarray):
+        return _finite(obj.tolist())
+    if isinstance(obj, (datetime, date)):   # includes pd.Timestamp
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> str:
+    """Compact JSON from the C encoder. A tree without NaN/inf encodes in
+    one pass; one that has them (allow_nan=False raises) is sanitized once
+    with _finite and encoded again."""
+    try:
+        return json.dumps(obj, separators=(',', ':'), allow_nan=False, default=_default)
+    except ValueError:
+        return json.dumps(_finite(obj), separators=(',', ':'), allow_nan=False,
+                          default=_default)
+
+
+def dump_atomic(obj, path: Path) -> None:
+    """Write `obj` as compact JSON to `path`; readers never see a
+    half-written file."""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(_dumps(obj))
+    os.replace(tmp, path)
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    try:
+        if path.read_text() == text:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text)
+    os.replace(tmp, path)
+    return True
+
+
+def copy_index(dest: Path, path: Path = STOCKS_FILE) -> None:
+    """Copy the bytes of the last written stocks.json to `dest` (the
+    crossing baseline) without encoding anything again."""
+    tmp = dest.with_name(dest.name + '.tmp')
+    tmp.write_bytes(path.read_bytes())
+    os.replace(tmp, dest)
+
+
+def write_stocks(output: dict, path: Path = STOCKS_FILE,
+                 detail_dir: Path = DETAIL_DIR,
+                 legacy: Optional[bool] = None) -> dict:
+    """Write `output` ({summary, stocks, generated_*}) as index + shards, or
+    monolithic when `legacy` (default: STOCKS_JSON_FORMAT=legacy). NaN,
+    inf and NumPy values are handled by the encoder.
+
+    Returns {'shards_written', 'shards_unchanged', 'shards_removed'}.
+    """
+    stats = {'shards_written': 0, 'shards_unchanged': 0, 'shards_removed': 0}
+    if legacy_format() if legacy is None else legacy:
+        dump_atomic(output, path)
+        return stats
+
+    detail_dir.mkdir(parents=True, exist_ok=True)
+    entries, keep = [], set()
+    for stock in output.get('stocks', []):
+        entry, detail = split_stock(stock)
+        entries.append(entry)
+        shard = detail_path(stock['symbol'], detail_dir)
+        keep.add(shard.name)
+        if _write_if_changed(shard, _dumps(detail)):
+            stats['shards_written'] += 1
+        else:
+            stats['shards_unchanged'] += 1
+    for stale in detail_dir.glob('*.json'):
+        if stale.name not in keep:
+            stale.unlink()
+            stats['shards_removed'] += 1
+
+    dump_atomic({**output, 'stocks': entries, FORMAT_KEY: detail_dir.name}, path)
+    return stats
+
+
+def load_detail(symbol: str, detail_dir: Path = DETAIL_DIR) -> dict:
+    try:
+        with open(detail_path(symbol, detail_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _read(path: Path, with_details: bool) -> tuple[dict, Optional[Path]]:
+    with open(path) as f:
+        data = json.load(f)
+    detail_name = data.pop(FORMAT_KEY, None)
+    detail_dir = path.parent / detail_name if detail_name else None
+    if with_details and detail_dir:
+        data['stocks'] = [_join(s, load_detail(s['symbol'], detail_dir))
+                          for s in data.get('stocks', [])]
+    return data, detail_dir
+
+
+def _join(entry: dict, detail: dict) -> dict:
+    """Index entry + shard. The shard's fields follow the entry's in shard
+    order (replacing index stubs such as bean_score_data), so splitting the
+    result again reproduces the same shard bytes."""
+    return {**{k: v for k, v in entry.items() if k not in detail}, **detail}
+
+
+def load_stocks(path: Path = STOCKS_FILE, with_details: bool = False) -> dict:
+    """stocks.json as a dict. with_details joins each stock's shard back in,
+    giving the legacy monolithic shape either way."""
+    return _read(path, with_details)[0]
+
+
+def rewrite_stocks(output: dict, path: Path = STOCKS_FILE) -> dict:
+    """write_stocks() over an existing file in the layout it already has:
+    index + its shard directory, or monolithic."""
+    with open(path) as f:
+        detail_name = json.load(f).get(FORMAT_KEY)
+    if detail_name is None:
+        return write_stocks(output, path, legacy=True)
+    return write_stocks(output, path, path.parent / detail_name, legacy=False)
+
+
+def merge_field(field: str, values: dict, path: Path = STOCKS_FILE) -> int:
+    """Set stock[field] = values[symbol] for every indexed symbol in
+    `values`, keeping the file's current layout: the index and only the
+    affected shards, or the monolithic file. Returns the number merged."""
+    full, detail_dir = _read(path, with_details=True)
+    merged = 0
+    for stock in full.get('stocks', []):
+        if stock.get('symbol') in values:
+            stock[field] = values[stock['symbol']]
+            merged += 1
+    write_stocks(full, path, detail_dir or DETAIL_DIR, legacy=detail_dir is None)
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='stocks.json index + detail shards')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p_join = sub.add_parser('join', help='Write a monolithic (legacy) stocks.json')
+    p_join.add_argument('out', nargs='?', default=str(DATA_DIR / 'stocks_full.json'))
+    sub.add_parser('split', help='Convert a monolithic stocks.json to index + shards')
+    sub.add_parser('info', help='Index and shard sizes')
+    args = parser.parse_args()
+
+    if not STOCKS_FILE.exists():
+        print(f"ERROR: {STOCKS_FILE} not found")
+        sys.exit(1)
+
+    if args.cmd == 'join':
+        data = load_stocks(with_details=True)
+        dump_atomic(data, Path(args.out))
+        print(f"✓ Wrote {args.out} ({len(data.get('stocks', []))} stocks)")
+    elif args.cmd == 'split':
+        data = load_stocks(with_details=True)
+        stats = write_stocks(data, legacy=False)
+        print(f"✓ Split {STOCKS_FILE.name}: {stats['shards_written']} shards written, "
+              f"{stats['shards_unchanged']} unchanged, {stats['shards_removed']} removed")
+    else:
+        shards = list(DETAIL_DIR.glob('*.json')) if DETAIL_DIR.exists() else []
+        size = sum(p.stat().st_size for p in shards)
+        print(f"{STOCKS_FILE.name}: {STOCKS_FILE.stat().st_size / 1e6:.2f} MB")
+        print(f"{DETAIL_DIR.name}/: {len(shards)} shards, {size / 1e6:.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
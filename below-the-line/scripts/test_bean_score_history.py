@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Offline checks for the Bean Score history store's legacy migration.
+
+Tracking (bean_score_tracking.build_tracking) must come out the same whether
+it reads the legacy bean_score_history.json array or the partitions that
+migrate_legacy() splits it into. Run with pytest from scripts/.
+"""
+import json
+import random
+
+import pytest
+
+import bean_score_history
+import bean_score_tracking
+
+
+def _legacy_history(weeks=30, tickers=12, seed=7):
+    """Synthetic legacy array: scores wandering through every σ zone, some
+    tickers missing some weeks, some rows without a price."""
+    rng = random.Random(seed)
+    names = [f"T{i:02d}" for i in range(tickers)]
+    level = {t: rng.uniform(-2.5, 2.5) for t in names}
+    history = []
+    for w in range(weeks):
+        scores = {}
+        for t in rng.sample(names, len(names)):          # snapshot order varies
+            if rng.random() < 0.1:
+                continue
+            level[t] += rng.gauss(0, 0.8)
+            scores[t] = {
+                'bean_score': round(level[t], 2),
+                'deviation_pp': round(rng.gauss(0, 2), 2),
+                'price': None if rng.random() < 0.05 else round(rng.uniform(5, 500), 2),
+            }
+        history.append({'date': f"2026-{1 + w // 4:02d}-{1 + (w % 4) * 7:02d}", 'scores': scores})
+    return history
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    root = tmp_path / 'bean_score_history'
+    monkeypatch.setattr(bean_score_history, 'STORE_DIR', root)
+    monkeypatch.setattr(bean_score_history, 'INDEX_FILE', root / 'index.json')
+    monkeypatch.setattr(bean_score_history, 'WEEKS_DIR', root / 'weeks')
+    legacy = tmp_path / 'bean_score_history.json'
+    monkeypatch.setattr(bean_score_history, 'LEGACY_FILE', legacy)
+    return legacy
+
+
+def _tracking(history):
+    out = bean_score_tracking.build_tracking(history)
+    out.pop('generated_at')
+    return out
+
+
+def test_migration_keeps_history_and_tracking(store):
+    history = _legacy_history()
+    store.write_text(json.dumps(history))
+
+    migrated = bean_score_history.load_history()        # migrates on first use
+
+    assert migrated == history
+    assert _tracking(migrated) == _tracking(history)
+    assert _tracking(history)['per_stock']                 # the fixture fires signals
+
+
+def test_repeated_dates_keep_the_later_snapshot_and_are_reported(store, capsys):
+    history = _legacy_history()
+    rerun = {'date': history[10]['date'],
+             'scores': {t: {**row, 'bean_score': -row['bean_score']}
+                        for t, row in history[10]['scores'].items()}}
+    legacy = history[:11] + [rerun] + history[11:]
+    store.write_text(json.dumps(legacy))
+
+    migrated = bean_score_history.load_history()
+
+    deduped = history[:10] + [rerun] + history[11:]
+    assert migrated == deduped
+    assert _tracking(migrated) == _tracking(deduped)
+    assert "Dropped 1 repeated snapshot(s)" in capsys.readouterr().out
+    assert bean_score_history.n_weeks() == len(history)
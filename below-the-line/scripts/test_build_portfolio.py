@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Offline checks for the Ledger-based equity curve and the daily-mode risk
+block in build_portfolio.py.
+
+The weekly series must match the per-date walk it replaced (kept below as a
+reference); risk_metrics / chart_payload / downsample_index are checked on a
+small synthetic book whose numbers can be worked out by hand.
+Run with pytest from scripts/.
+"""
+import math
+import statistics
+
+import numpy as np
+import pandas as pd
+
+import build_portfolio as bp
+from build_portfolio import BENCHMARK, Ledger
+
+
+# --------------------------------------------------------------------------- #
+# Reference: the per-date walk the Ledger replaced
+# --------------------------------------------------------------------------- #
+def _ref_net_qty_at(p, d):
+    n = 0.0
+    for ev in p.get("events", []) or []:
+        if str(ev.get("date")) > str(d):
+            continue
+        q = bp.event_qty(ev)
+        if q is None:
+            continue
+        if ev.get("action") in bp.BUY_ACTIONS:
+            n += q
+        elif ev.get("action") in bp.SELL_ACTIONS:
+            n -= q
+    return n
+
+
+def _ref_option_mark_at(p, d):
+    evs = [e for e in (p.get("events") or []) if e.get("price") is not None]
+    if not evs:
+        return p.get("current_mark")
+    prior = [e for e in evs if str(e.get("date")) <= str(d)]
+    if str(d) >= max(str(e["date"]) for e in evs) and p.get("current_mark") is not None:
+        return float(p["current_mark"])
+    return float(prior[-1]["price"]) if prior else None
+
+
+def _ref_position_value_at(p, d, prices):
+    n = _ref_net_qty_at(p, d)
+    if n == 0:
+        return 0.0
+    if bp.is_option(p):
+        mark = _ref_option_mark_at(p, d)
+        return None if mark is None else round(n * 100 * mark, 2)
+    px = bp.asof(prices.get(str(p.get("ticker", "")).upper()), d)
+    return None if px is None else round(n * px, 2)
+
+
+def _ref_cash_at(positions, balances):
+    if not balances:
+        return None
+    timeline = [(str(b["date"]), 0, float(b["amount"])) for b in balances]
+    for p in positions:
+        mult = 100 if bp.is_option(p) else 1
+        for ev in p.get("events", []) or []:
+            q, price, act = bp.event_qty(ev), ev.get("price"), ev.get("action")
+            if q is None or price is None:
+                continue
+            flow = (-q * mult * float(price) if act in bp.BUY_ACTIONS
+                    else (q * mult * float(price) if act in bp.SELL_ACTIONS else 0))
+            if flow:
+                timeline.append((str(ev["date"]), 1, flow))
+    timeline.sort(key=lambda x: (x[0], x[1]))
+
+    def cash_at(d):
+        running = None
+        for date_s, kind, val in timeline:
+            if date_s > str(d):
+                break
+            running = val if kind == 0 else (running or 0) + val
+        return running
+
+    return cash_at
+
+
+def _ref_build_series(positions, prices, cash_at, inception, as_of):
+    grid = pd.date_range(start=pd.Timestamp(inception), end=pd.Timestamp(as_of), freq="W-FRI")
+    if len(grid) == 0 or grid[-1] < pd.Timestamp(as_of):
+        grid = grid.append(pd.DatetimeIndex([pd.Timestamp(as_of)]))
+    dates, port, spy = [], [], []
+    spy_series = prices.get(BENCHMARK)
+    base_port, base_spy = None, bp.asof(spy_series, grid[0])
+    for d in grid:
+        holdings = 0.0
+        for p in positions:
+            v = _ref_position_value_at(p, d, prices)
+            holdings += v if v is not None else 0.0
+        c = cash_at(d) if cash_at else 0.0
+        total = holdings + (c if c is not None else 0.0)
+        if base_port is None and total > 0:
+            base_port = total
+        dates.append(d.strftime("%Y-%m-%d"))
+        port.append(total)
+        spy.append(bp.asof(spy_series, d))
+    base_port = base_port or 1.0
+    port_norm = [round(v / base_port * 100, 2) for v in port]
+    spy_norm = ([round(v / base_spy * 100, 2) if v else None for v in spy] if base_spy
+                else [None] * len(dates))
+    return {"dates": dates, "portfolio": port_norm, "spy": spy_norm}
+
+
+# --------------------------------------------------------------------------- #
+# Weekly parity
+# --------------------------------------------------------------------------- #
+def _prices(rng, tickers, start, end):
+    idx = pd.bdate_range(start, end)
+    out = {}
+    for t in tickers:
+        px = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, len(idx))))
+        out[t] = pd.Series(np.round(px, 2), index=idx)
+    return out
+
+
+def _random_book(rng, start, end):
+    days = pd.bdate_range(start, end)
+    pick = lambda: days[int(rng.integers(0, len(days)))].strftime("%Y-%m-%d")   # noqa: E731
+    positions = []
+    for j, (ticker, kind) in enumerate([("AAA", "stock"), ("BBB", "stock"), ("ZZZ", "stock"),
+                                        ("AAA", "call"), ("BBB", "put")]):
+        dates = sorted(pick() for _ in range(int(rng.integers(1, 6))))
+        qty = "contracts" if kind in ("call", "put") else "shares"
+        events, held = [], 0
+        for k, d in enumerate(dates):
+            if k == 0 or held == 0:
+                act, n = "open", int(rng.integers(1, 20))
+            else:
+                act = rng.choice(["add", "trim", "close"])
+                n = held if act == "close" else (int(rng.integers(1, held + 1)) if act == "trim"
+                                                 else int(rng.integers(1, 10)))
+            held += n if act in bp.BUY_ACTIONS else -n
+            price = None if rng.random() < 0.1 else round(float(rng.uniform(1, 80)), 2)
+            events.append({"date": d, "action": act, qty: n, "price": price})
+        if kind in ("call", "put"):                 # file order != date order
+            events[1:] = [events[1:][i] for i in rng.permutation(len(events) - 1)]
+        p = {"id": f"p{j}", "ticker": ticker, "asset_type": kind, "events": events}
+        if kind in ("call", "put") and rng.random() < 0.7:
+            p["current_mark"] = round(float(rng.uniform(0.5, 9)), 2)
+        positions.append(p)
+    # ZZZ has no price file; a flow can precede the first cash anchor.
+    balances = sorted(({"date": pick(), "amount": round(float(rng.uniform(1e3, 5e4)), 2)}
+                       for _ in range(int(rng.integers(1, 4)))), key=lambda b: b["date"])
+    return positions, balances
+
+
+def test_weekly_series_matches_per_date_walk():
+    for seed in range(40):
+        rng = np.random.default_rng(seed)
+        inception, as_of = "2023-01-04", "2024-06-12"
+        prices = _prices(rng, [BENCHMARK, "AAA", "BBB"], "2022-12-01", as_of)
+        positions, balances = _random_book(rng, inception, as_of)
+
+        ledger = Ledger(positions, balances)
+        got = bp.build_series(bp.equity_curve(
+            ledger, prices, bp.build_grid(inception, as_of, prices, "weekly")))
+        ref = _ref_build_series(positions, prices, _ref_cash_at(positions, balances),
+                                inception, as_of)
+        assert got == ref, seed
+
+
+# --------------------------------------------------------------------------- #
+# Daily risk block
+# --------------------------------------------------------------------------- #
+SPY_MOVES = [0.01, -0.02, 0.015, 0.0, 0.012, -0.03, -0.01, 0.02, 0.025, 0.005,
+             -0.004, 0.018, -0.012, 0.007, 0.011, -0.006, 0.009, 0.003, -0.015, 0.02]
+
+
+def _daily_book():
+    """$1,000 cash from day 0; 10 AAA bought on day 3 with all of it, 4
+    trimmed on day 12 at the close. AAA moves exactly twice SPY."""
+    idx = pd.bdate_range("2024-01-02", periods=len(SPY_MOVES) + 1)
+    spy = 400 * np.cumprod(np.r_[1.0, 1 + np.array(SPY_MOVES)])
+    aaa = 100 * np.cumprod(np.r_[1.0, 1 + 2 * np.array(SPY_MOVES)])
+    aaa = aaa / aaa[3] * 100                        # $100 on the buy day
+    prices = {BENCHMARK: pd.Series(spy, index=idx), "AAA": pd.Series(aaa, index=idx)}
+    d = [x.strftime("%Y-%m-%d") for x in idx]
+    positions = [
+        {"id": "aaa", "ticker": "AAA", "asset_type": "stock", "events": [
+            {"date": d[3], "action": "open", "shares": 10, "price": 100.0},
+            {"date": d[12], "action": "trim", "shares": 4, "price": float(aaa[12])}]},
+        {"id": "idle", "ticker": "BBB", "asset_type": "stock", "events": []},
+    ]
+    ledger = Ledger(positions, [{"date": d[0], "amount": 1000.0}])
+    curve = bp.equity_curve(ledger, prices, bp.build_grid(d[0], d[-1], prices, "daily"))
+    return ledger, curve, aaa
+
+
+def test_risk_metrics_by_hand():
+    ledger, curve, aaa = _daily_book()
+    risk = bp.risk_metrics(curve, ledger, risk_free_pct=2.52, window=5)
+    total = curve["total"]
+    r = [total[t] / total[t - 1] - 1 for t in range(1, len(total))]
+    excess = [x - 0.0252 / 252 for x in r]
+
+    sd = statistics.stdev(r)
+    downside = math.sqrt(sum(min(x, 0.0) ** 2 for x in excess) / len(excess))
+    assert risk["volatility_pct"] == round(sd * math.sqrt(252) * 100, 1)
+    assert risk["sharpe"] == round(statistics.mean(excess) / sd * math.sqrt(252), 2)
+    assert risk["sortino"] == round(statistics.mean(excess) / downside * math.sqrt(252), 2)
+    # Cash until day 3, all AAA (2x SPY) until the trim, then part cash:
+    # whole-window beta is between 1 and 2, and a 5-session window inside
+    # days 4-12 sees beta 2.
+    assert 1.0 < risk["beta"] < 2.0
+    assert np.allclose(risk["_series"]["rolling_beta"][8:13], 2.0, atol=1e-3)
+
+    # Underwater: sessions since the running high, longest stretch and its
+    # calendar length.
+    peak, since, longest = -math.inf, 0, (0, 0)
+    for t, v in enumerate(total):
+        since = 0 if v >= peak else since + 1
+        peak = max(peak, v)
+        longest = max(longest, (since, t))
+    sessions, end = longest
+    grid = curve["grid"]
+    assert risk["max_underwater_sessions"] == sessions > 0
+    assert risk["max_underwater_days"] == (grid[end] - grid[end - sessions]).days
+    assert risk["current_underwater_sessions"] == since
+
+
+def test_contribution_is_net_of_trade_cash():
+    ledger, curve, aaa = _daily_book()
+    contrib = bp.risk_metrics(curve, ledger)["_contribution"]
+    total = curve["total"]
+    held = [0] * 3 + [10] * 9 + [6] * (len(total) - 12)
+    steps = np.diff(contrib[:, 0])
+    for t in range(1, len(total)):
+        # P&L is yesterday's holding times today's move: the buy (day 3) and
+        # the trim at the close (day 12) add nothing by themselves.
+        want = held[t - 1] * (aaa[t] - aaa[t - 1]) / total[t - 1] * 100
+        assert abs(steps[t - 1] - want) < 1e-3, t
+    assert contrib[3, 0] == 0.0
+    # Cash earns nothing, so contributions add up to the book's daily returns.
+    r = np.diff(total) / total[:-1] * 100
+    assert abs(contrib[-1].sum() - r.sum()) < 1e-3
+    assert not contrib[:, 1].any()
+
+
+def test_downsample_keeps_ends_and_trough():
+    assert bp.downsample_index(10, max_points=20).tolist() == list(range(10))
+    idx = bp.downsample_index(1000, max_points=50, keep=[333])
+    assert idx[0] == 0 and idx[-1] == 999 and 333 in idx
+    assert len(idx) <= 51 and np.all(np.diff(idx) > 0)
+
+
+def test_chart_payload_samples_the_full_series():
+    ledger, curve, _ = _daily_book()
+    series = bp.build_series(curve)
+    risk = bp.risk_metrics(curve, ledger, window=5)
+    trough = int(np.argmin(risk["_series"]["drawdown_pct"]))
+    idx = bp.downsample_index(len(curve["grid"]), max_points=6, keep=[trough])
+    out, block = bp.chart_payload(series, risk, ledger, idx)
+
+    assert out["dates"] == [series["dates"][i] for i in idx]
+    assert block["series"]["dates"] == block["contribution"]["dates"] == out["dates"]
+    assert min(block["series"]["drawdown_pct"]) == \
+        round(float(risk["_series"]["drawdown_pct"].min()), 2)
+    assert block["series"]["rolling_vol_pct"][0] is None           # no return on day 0
+    assert list(block["contribution"]["positions"]) == ["aaa"]      # idle position omitted
+    assert block["sharpe"] == risk["sharpe"]
+    assert not any(k.startswith("_") for k in block)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Offline checks for the daily-close store (daily_close_store.py) and the
+price files fetch_prices.py keeps on top of it. fetch_chart is replaced by a
+fake Yahoo, so nothing touches the network. Run with pytest from scripts/.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import daily_close_store as dcs
+import fetch_prices
+
+START = '2024-01-02'
+
+
+def _bars(n=300, first=START, scale=1.0):
+    day0 = dcs.epoch_day(first)
+    closes = 100 * np.exp(np.cumsum(np.full(n, 0.001))) * scale
+    return np.array(list(zip(range(day0, day0 + n), closes)), dtype=dcs.CLOSE_DTYPE)
+
+
+class FakeYahoo:
+    """fetch_chart stand-in serving `bars`; records the start of every call."""
+
+    def __init__(self, bars, event_days=()):
+        self.bars, self.event_days, self.calls = bars, np.array(event_days, dtype='i4'), []
+
+    def __call__(self, symbol, start_day=None):
+        self.calls.append(start_day)
+        rows = self.bars if start_day is None else self.bars[self.bars['day'] >= start_day]
+        return rows, self.event_days
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(dcs, 'STORE_DIR', tmp_path / 'store')
+    monkeypatch.setattr(fetch_prices, 'PRICES_DIR', tmp_path / 'prices')
+    monkeypatch.delenv('PRICES_FULL_REFRESH', raising=False)
+    monkeypatch.delenv('DAILY_CLOSE_STORE', raising=False)
+    return tmp_path
+
+
+def test_restatement_reason_allows_rounding_only():
+    bars = _bars(scale=0.01)                              # ~$1: rounding > CLOSE_RTOL
+    rounded = np.round(bars['close'], 4)
+    fresh = bars[-5:]
+    assert dcs.restatement_reason(bars['day'], rounded, fresh, np.array([]), decimals=4) is None
+    assert (dcs.restatement_reason(bars['day'], rounded, fresh, np.array([]))
+            == 'overlapping closes restated')             # full precision expected
+    bars = _bars()
+    rounded, fresh = np.round(bars['close'], 4), bars[-5:]
+    restated = _bars(scale=0.99)[-5:]                     # a dividend adjusts every close
+    assert (dcs.restatement_reason(bars['day'], rounded, restated, np.array([]), decimals=4)
+            == 'overlapping closes restated')
+    event = np.array([bars['day'][-1]])
+    assert (dcs.restatement_reason(bars['day'], bars['close'], fresh, event)
+            == 'dividend or split in new sessions')
+
+
+def test_force_full_ignores_a_store_that_looks_current(store, monkeypatch):
+    monkeypatch.setattr(dcs, 'fetch_chart', FakeYahoo(_bars()))
+    dcs.get_daily_closes('ABC', START)                     # fills the store
+
+    # Yahoo restates; the store's own overlap check cannot see it when
+    # only older sessions moved.
+    restated = _bars()
+    restated['close'][:-10] *= 0.98
+    yahoo = FakeYahoo(restated)
+    monkeypatch.setattr(dcs, 'fetch_chart', yahoo)
+
+    tail = dcs.get_daily_closes('ABC', START)
+    assert yahoo.calls[-1] > dcs.epoch_day(START)          # tail only: stale history
+    assert tail.iloc[0] != pytest.approx(restated['close'][0])
+
+    full = dcs.get_daily_closes('ABC', START, force_full=True)
+    assert yahoo.calls[-1] == dcs.epoch_day(START)
+    assert np.allclose(full.to_numpy(), restated['close'])
+    assert np.allclose(dcs.load('ABC')[0]['close'], restated['close'])
+
+
+def test_price_file_full_refetch_bypasses_the_store(store, monkeypatch):
+    fetch_prices.PRICES_DIR.mkdir()
+    monkeypatch.setattr(dcs, 'fetch_chart', FakeYahoo(_bars()))
+    data = fetch_prices.fetch_one('ABC', START)
+    dcs.get_daily_closes('ABC', START)                     # options screener keeps it warm
+
+    # The file is due its periodic full fetch; the store is not, and only
+    # history older than its overlap window was restated.
+    restated = _bars()
+    restated['close'][:-10] *= 0.98
+    yahoo = FakeYahoo(restated)
+    monkeypatch.setattr(dcs, 'fetch_chart', yahoo)
+    data['full_fetched_at'] = (date.today()
+                               - timedelta(days=fetch_prices.FULL_REFRESH_DAYS)).isoformat()
+
+    again = fetch_prices.fetch_one('ABC', START, data)
+    assert again['close'] == [round(float(v), fetch_prices.CLOSE_DECIMALS)
+                              for v in restated['close']]
+    assert yahoo.calls[-1] == dcs.epoch_day(START)
+
+
+def test_price_file_appends_when_nothing_moved(store, monkeypatch):
+    bars = _bars()
+    monkeypatch.setattr(dcs, 'fetch_chart', FakeYahoo(bars[:-3]))
+    data = fetch_prices.fetch_one('ABC', START)
+    monkeypatch.setattr(dcs, 'fetch_chart', FakeYahoo(bars))
+    again = fetch_prices.fetch_one('ABC', START, data)
+    assert len(again['dates']) == len(bars)
+    assert again['dates'][-1] == dcs.day_iso(bars['day'][-1])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Offline checks for the cumulative-sum z-scores in dislocation_scores.py.
+
+rolling_zscores() and dislocation_history() must agree with _zscore() and
+the point-in-time scores computed week by week, flat stretches included.
+Run with pytest from scripts/.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+import dislocation_scores as ds
+
+
+def _series(rng, n, flat_runs=3):
+    x = rng.normal(rng.uniform(-50, 200), rng.choice([1e-4, 1.0, 30.0]), n)
+    for _ in range(flat_runs):
+        a = int(rng.integers(0, n))
+        x[a:a + int(rng.integers(5, 120))] = x[a]
+    return x
+
+
+def _assert_matches(z, ref):
+    """`ref` is _zscore's rounded value (or None)."""
+    if ref is None:
+        assert math.isnan(z)
+    else:
+        assert abs(z - ref) <= 0.005 + 1e-9
+
+
+def test_rolling_zscores_match_zscore():
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        x = _series(rng, int(rng.integers(20, 400)))
+        x[rng.random(len(x)) < 0.05] = np.nan
+        if trial % 2:
+            x = x[~np.isnan(x)]
+        window = None if trial % 3 else int(rng.integers(10, 60))
+        min_n = int(rng.integers(3, 15))
+        z = ds.rolling_zscores(x, min_n, window)
+        for t in range(len(x)):
+            lo = 0 if window is None else max(t - window, 0)
+            ref = None if np.isnan(x[t]) else ds._zscore(x[t], x[lo:t], min_n)
+            _assert_matches(z[t], ref)
+
+
+def test_flat_window_has_no_zscore():
+    # A move after 51 identical weeks: residue in the running sums used to
+    # leave a tiny sd for the flat window and |z| in the hundreds of thousands.
+    rng = np.random.default_rng(4)
+    x = np.concatenate([rng.normal(-8, 20, 400), np.full(51, -31.7), [-29.7]])
+    assert ds._zscore(x[-1], x[-52:-1], min_n=5) is None
+    assert math.isnan(ds.rolling_zscores(x, min_n=5, window=51)[-1])
+
+
+def _weekly_frame(weeks=700, seed=5):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range('2012-01-02', periods=weeks, freq='W-MON')
+    close = 50 * np.exp(np.cumsum(rng.normal(0.001, 0.03, weeks)))
+    divs = np.where(np.arange(weeks) % 13 == 0, 0.25, 0.0)
+    divs[:150] = 0.0                                   # starts paying later
+    pct = rng.normal(5, 15, weeks)
+    pct[300:360] = pct[300]                            # a flat stretch
+    pct[rng.random(weeks) < 0.03] = np.nan
+    return pd.DataFrame({'adjusted_close': close, 'Dividends': divs,
+                         'pct_from_wma': pct}, index=idx)
+
+
+def test_history_matches_point_in_time_scores():
+    df = _weekly_frame()
+    hist = ds.dislocation_history(df)
+    for t in range(100, len(df), 7):
+        upto = df.iloc[:t + 1]
+        for col, fn in (('yield_dislocation_z', ds.yield_dislocation_z),
+                        ('drawdown_z', ds.drawdown_z)):
+            got, ref = hist[col].iloc[t], fn(upto)
+            if ref is None:
+                assert math.isnan(got), (col, t)
+            else:
+                assert abs(got - ref) <= 0.01 + 1e-9, (col, t, got, ref)
+
+
+def test_chart_payload_is_last_weeks_of_history():
+    df = _weekly_frame()
+    chart = ds.dislocation_chart(df, weeks=52)
+    hist = ds.dislocation_history(df).iloc[-52:]
+    assert chart['labels'] == [d.strftime('%Y-%m-%d') for d in hist.index]
+    assert chart['drawdown_z'][-1] == ds.drawdown_z(df)
+    assert ds.dislocation_chart(df.iloc[:50]) is None
+
+
+def _universe(n=120, seed=9):
+    rng = np.random.default_rng(seed)
+    stocks = []
+    for i in range(n):
+        buys = float(rng.uniform(1e4, 5e6)) if rng.random() < 0.4 else 0.0
+        sector = 'Tiny' if i < 5 else ('Tech', 'Energy', 'Health')[i % 3]   # Tiny < MIN_SECTOR_N
+        stocks.append({
+            'symbol': f'S{i:03d}', 'sector': sector,
+            'pct_from_wma': float(rng.normal(0, 20)), 'market_cap': float(rng.uniform(1e8, 1e11)),
+            'insider_buy_total_12m': buys, 'shares_change_yoy': float(rng.normal(0, 3)),
+            'dislocation': {'yield_dislocation_z': float(rng.normal(0, 1.5)),
+                            'drawdown_z': float(rng.normal(0, 1.5)), 'sector_relative_z': None,
+                            'buyback_accel_pp': float(rng.normal(0, 3)),
+                            'insider_intensity_pct': None,
+                            'fcf_yield_vs_hist_pp': float(rng.normal(0, 3))},
+        })
+    return stocks
+
+
+def test_saved_stats_rescore_matches_full_run(tmp_path):
+    full = _universe()
+    stats = ds.apply_cross_sectional_dislocation(full)
+    ds.save_cross_sectional_stats(stats, tmp_path / 'stats.json')
+
+    # Mid-week: a handful of tickers scored alone against the saved stats.
+    few = [{**s, 'dislocation': {**s['dislocation'], 'sector_relative_z': None,
+                                 'insider_intensity_pct': None}}
+           for s in _universe()[::17]]              # includes a Tiny-sector stock
+    ds.apply_cross_sectional_dislocation(
+        few, stats=ds.load_cross_sectional_stats(tmp_path / 'stats.json'))
+
+    for s in few:
+        ref = next(r for r in full if r['symbol'] == s['symbol'])
+        for key in ('sector_relative_z', 'insider_intensity_pct', 'dislocation_stack',
+                    'stack_signals'):
+            assert s['dislocation'][key] == ref['dislocation'][key], (s['symbol'], key)
+    assert any(s['dislocation']['sector_relative_z'] is not None for s in few)
+    assert any(s['dislocation']['insider_intensity_pct'] is not None for s in few)
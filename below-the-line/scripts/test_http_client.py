@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Offline checks for the shared HTTP client's bookkeeping (http_client.py).
+No network: the session's get() is replaced. Run with pytest from scripts/.
+"""
+import threading
+
+import http_client
+
+
+class _Resp:
+    def __init__(self, status):
+        self.status_code = status
+        self.headers = {}
+        self.content = b'{}'
+
+    def close(self):
+        pass
+
+
+def test_request_counters_survive_many_threads(monkeypatch):
+    monkeypatch.setattr(http_client, 'BACKOFF', 0.0)
+    client = http_client.HttpClient(retries=1, cache_ttl=0)
+    client.set_rate('example.test', 1e9, burst=1000)
+    calls, seen = [0], set()
+    calls_lock = threading.Lock()
+
+    def get(url, **kwargs):
+        with calls_lock:
+            calls[0] += 1
+            first = url not in seen
+            seen.add(url)
+        return _Resp(503 if first else 200)            # each URL retried once
+
+    client.session.get = get
+    threads = [threading.Thread(target=lambda t=t: [client.fetch(f'https://example.test/{t}/{i}')
+                                                    for i in range(200)])
+               for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert client.stats['requests'] == calls[0]
+    assert client.stats['retries'] == 8 * 200
+    assert client.stats['requests'] == 2 * 8 * 200
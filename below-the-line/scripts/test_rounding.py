@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Offline checks for rounding.round_half_even: element-for-element the
+same as Python's round(). Run with pytest from scripts/."""
+import math
+
+import numpy as np
+
+from rounding import round_half_even
+
+
+def _assert_same_as_round(values, ndigits):
+    got = round_half_even(values, ndigits)
+    for v, g in zip(np.asarray(values, dtype=float).tolist(), got.tolist()):
+        if math.isfinite(v):
+            assert g == round(v, ndigits), (v, ndigits, g)
+        else:
+            assert g == v or (math.isnan(g) and math.isnan(v))
+
+
+def test_matches_round_on_ties():
+    # Decimal .5 ties that float storage puts just above or below the tie.
+    ties = [2.675, 1.005, 0.125, 0.375, -2.5, 0.5, 1.5, 2.5, 1234.5675, -0.0450, 99.995]
+    for ndigits in range(0, 5):
+        _assert_same_as_round(ties, ndigits)
+        _assert_same_as_round([k / 2 / 10 ** ndigits for k in range(-400, 400)], ndigits)
+
+
+def test_matches_round_on_random_values():
+    rng = np.random.default_rng(11)
+    values = np.concatenate([rng.normal(0, 100, 20000), rng.uniform(-1, 1, 20000),
+                             np.round(rng.uniform(-500, 500, 20000), 3),
+                             [np.nan, np.inf, -np.inf, 0.0, -0.0]])
+    for ndigits in (1, 2, 3, 4):
+        _assert_same_as_round(values, ndigits)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Offline checks for the sharded stocks.json (stocks_store.py) and the
+stale carry-forward in update_stocks.py that writes through it.
+Run with pytest from scripts/.
+"""
+import json
+import random
+
+import numpy as np
+import pandas as pd
+
+import stocks_store
+import update_stocks
+from update_stocks import (NumpyEncoder, carry_forward_stale, load_previous_records,
+                           sanitize_for_json)
+
+
+def _stock(symbol, close):
+    return {
+        'symbol': symbol, 'name': f'{symbol} Inc', 'sector': 'Tech',
+        'close': close, 'wma_200': close * 0.9, 'pct_from_wma': 11.1,
+        'below_line': False, 'approaching': False, 'rsi_14': 50.0,
+        'growth_chart': {'labels': ['2024-01', '2024-02'], 'price': [close, close * 1.1]},
+        'touch_chart': {'points': [[1, 2.5], [2, float('nan')]]},
+        'health_chart': {'fcf_yield': [0.031, 0.042]},
+        'insider_buys': [{'name': 'CEO', 'value': 1_250_000}],
+        'bean_score_data': {'current_score': 1.4, 'levels': {'fair': close * 1.2}},
+        'dislocation': {'dislocation_stack': 2, 'sector_z': -1.7},
+    }
+
+
+def _output(stocks):
+    return {'summary': {'count': len(stocks)}, 'stocks': stocks,
+            'generated_readable': 'January 1, 2026', 'generated_iso': '2026-01-01'}
+
+
+def test_carried_record_keeps_its_detail_shard(tmp_path):
+    index, shards = tmp_path / 'stocks.json', tmp_path / 'stocks'
+    stocks_store.write_stocks(_output([_stock('AAA', 10.0), _stock('BBB', 20.0)]),
+                              index, shards, legacy=False)
+    before = stocks_store.detail_path('BBB', shards).read_bytes()
+
+    # Next run: BBB's fetch fails and its last record is carried forward.
+    all_stocks, errors = [_stock('AAA', 10.5)], ['BBB']
+    carried = carry_forward_stale(all_stocks, errors, load_previous_records(index))
+    stats = stocks_store.write_stocks(_output(all_stocks), index, shards, legacy=False)
+
+    assert carried == ['BBB']
+    assert stocks_store.detail_path('BBB', shards).read_bytes() == before
+    assert stats['shards_removed'] == 0
+    entry = next(s for s in stocks_store.load_stocks(index)['stocks'] if s['symbol'] == 'BBB')
+    assert entry['stale'] is True
+    full = next(s for s in stocks_store.load_stocks(index, with_details=True)['stocks']
+                if s['symbol'] == 'BBB')
+    assert full['growth_chart'] == _stock('BBB', 20.0)['growth_chart']
+
+
+def test_no_previous_file_carries_nothing(tmp_path):
+    all_stocks = [_stock('AAA', 10.0)]
+    assert carry_forward_stale(all_stocks, ['BBB'],
+                               load_previous_records(tmp_path / 'stocks.json')) == []
+    assert len(all_stocks) == 1
+
+
+def _fresh(symbol, close, pct):
+    """What calculate_stock_signals returns: no name/sector, no Bean Score."""
+    rec = {k: v for k, v in _stock(symbol, close).items()
+           if k not in ('name', 'sector', 'bean_score_data')}
+    rec['pct_from_wma'] = pct
+    rec['dislocation'] = {'yield_dislocation_z': None, 'drawdown_z': 0.4,
+                          'sector_relative_z': None, 'buyback_accel_pp': None,
+                          'insider_intensity_pct': None, 'fcf_yield_vs_hist_pp': None}
+    return rec
+
+
+def test_rescore_uses_saved_stats_and_leaves_other_records(tmp_path, monkeypatch):
+    index, shards = tmp_path / 'stocks.json', tmp_path / 'stocks'
+    universe = [dict(_stock(f'S{i:02d}', 10.0 + i), pct_from_wma=float(i - 10))
+                for i in range(20)]
+    stocks_store.write_stocks(_output(universe), index, shards, legacy=False)
+    before = {p.name: p.read_bytes() for p in shards.glob('*.json')}
+    # Saved by the weekly run: Tech pct_from_wma median 0, sd 5.
+    stats = {'sectors': {'Tech': {'n': 20, 'median': 0.0, 'sd': 5.0}}, 'insider_intensity': []}
+
+    monkeypatch.setattr(update_stocks, 'load_company_metadata',
+                        lambda: {'S03': {'name': 'S03 Inc', 'sector': 'Tech'}})
+    monkeypatch.setattr(update_stocks, 'fetch_spy_monthly', lambda: None)
+    monkeypatch.setattr(update_stocks, 'load_cross_sectional_stats', lambda: stats)
+    monkeypatch.setattr(update_stocks, 'calculate_stock_signals',
+                        lambda symbol, spy_monthly=None: _fresh(symbol, 99.0, -12.5))
+
+    assert update_stocks.rescore_stocks(['S03'], index) == ['S03']
+
+    after = stocks_store.load_stocks(index, with_details=True)
+    s03 = next(s for s in after['stocks'] if s['symbol'] == 'S03')
+    assert s03['close'] == 99.0
+    assert s03['dislocation']['sector_relative_z'] == 2.5        # -(-12.5 - 0) / 5
+    assert s03['bean_score_data'] == _stock('S03', 13.0)['bean_score_data']
+    assert after['generated_iso'] == '2026-01-01'
+    assert [s['symbol'] for s in after['stocks']][0] == 'S03'     # re-sorted
+    changed = {p.name for p in shards.glob('*.json') if p.read_bytes() != before.get(p.name)}
+    assert changed == {'S03.json'}
+
+
+def _random_tree(rng, depth=0):
+    if depth > 3 or rng.random() < 0.3:
+        return rng.choice([
+            float('nan'), float('inf'), -float('inf'), 1.5, 0.1 + 0.2, -0.0, 3, True, None,
+            'caf\u00e9 "NaN"', np.float64(np.nan), np.float64(2.25), np.float32(1.1),
+            np.float32(np.inf), np.int64(7), np.bool_(False), pd.Timestamp('2024-01-02')])
+    if rng.random() < 0.5:
+        return {f'k{i}': _random_tree(rng, depth + 1) for i in range(rng.randint(0, 5))}
+    return [_random_tree(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+
+
+def _reject_constant(constant):
+    raise AssertionError(f'non-JSON constant {constant} in output')
+
+
+def test_dumps_matches_sanitize_then_numpy_encoder():
+    """Same bytes as the pre-store path (sanitize_for_json + NumpyEncoder),
+    and always strict JSON."""
+    rng = random.Random(3)
+    for _ in range(2000):
+        tree = _random_tree(rng)
+        text = stocks_store._dumps(tree)
+        assert text == json.dumps(sanitize_for_json(tree), separators=(',', ':'),
+                                  cls=NumpyEncoder)
+        json.loads(text, parse_constant=_reject_constant)
+
+
+def test_dumps_nulls_non_finite_array_values():
+    # NumpyEncoder let these through as NaN; the store writes null.
+    tree = {'a': np.array([1.0, np.nan, np.inf]), 'b': (float('nan'), 2)}
+    assert stocks_store._dumps(tree) == '{"a":[1.0,null,null],"b":[null,2]}'
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
-"""Quick test: compare old vs new find_historical_touches on GME."""
+"""Quick test: compare old vs new find_historical_touches on GME.
+
+Also checks that the vectorized find_historical_touches in update_stocks.py
+finds exactly the same episodes as the loop version below.
+"""
+
+import time
 
 import pandas as pd
 import numpy as np
 import yfinance as yf
 
+from update_stocks import find_historical_touches
+
 
 def fetch_and_prep(symbol: str) -> pd.DataFrame:
     """Fetch weekly data and compute 200WMA + pct_from_wma."""
@@ -87,6 +95,19 @@ def new_find_historical_touches(df, recovery_weeks=2):
     return touches
 
 
+def check_parity(df, recovery_weeks=2):
+    """Vectorized update_stocks version vs the loop above. Returns mismatches."""
+    ref = new_find_historical_touches(df, recovery_weeks)
+    got = [{
+        'date': t['date'],
+        'recovery': t['recovery_date'] if not t['ongoing'] else 'ongoing',
+        'weeks': t['weeks_below'],
+        'max_depth': t['max_depth'],
+    } for t in find_historical_touches(df, recovery_weeks)]
+    return [(r, g) for r, g in zip(ref, got) if r != g] + (
+        [('count', (len(ref), len(got)))] if len(ref) != len(got) else [])
+
+
 if __name__ == '__main__':
     for symbol in ['GME', 'AAPL', 'MSFT']:
         print(f"\n{'='*50}")
@@ -105,3 +126,15 @@ if __name__ == '__main__':
         for t in new:
             print(f"    {t['date']:>8}  |  {t['weeks']:>3} weeks  |  "
                   f"depth {t['max_depth']:>5}%  |  recovered {t.get('recovery','?')}")
+
+        for rw in (1, 2, 3):
+            t0 = time.perf_counter()
+            new_find_historical_touches(df, rw)
+            t_loop = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            find_historical_touches(df, rw)
+            t_vec = time.perf_counter() - t0
+            diffs = check_parity(df, rw)
+            status = "✓ parity" if not diffs else f"✗ {len(diffs)} mismatches: {diffs[:3]}"
+            print(f"\n  recovery_weeks={rw}: {status}  "
+                  f"(loop {t_loop * 1000:.1f}ms, vectorized {t_vec * 1000:.1f}ms)")
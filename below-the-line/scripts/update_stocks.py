@@ -13,9 +13,14 @@ Fetches weekly price data from Yahoo Finance, calculates:
 - Share buyback/dilution tracking
 
 Run weekly on Saturday to capture Friday close data.
+
+`update_stocks.py --rescore SYM [SYM ...]` re-fetches a few tickers mid-week
+and scores them against the sector/insider distributions the last weekly
+run saved, leaving every other record as it was.
 """
 from __future__ import annotations
 
+import argparse
 import json
 import math
 import os
@@ -32,9 +37,16 @@ import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from fetch_engine import TokenBucket, run_bounded
+from price_store import get_weekly_history, split_signature
+import fundamentals_schedule
+import stocks_store
+from fundamentals_bundle import FundamentalsBundle, get_bundle
 from dislocation_scores import (
     compute_stock_dislocation,
     apply_cross_sectional_dislocation,
+    load_cross_sectional_stats,
+    save_cross_sectional_stats,
 )
 
 
@@ -86,6 +98,8 @@ def sanitize_for_json(obj):
     Python's json module serialises float('nan') as 'NaN' by default (allow_nan=True),
     which is not valid JSON per spec and causes Hugo's strict parser to reject the file.
     This pre-pass walks the entire output structure and converts those values to null.
+    stocks.json and the baseline go through stocks_store, which does the same
+    conversion itself.
     """
     if isinstance(obj, dict):
         return {k: sanitize_for_json(v) for k, v in obj.items()}
@@ -99,6 +113,11 @@ def sanitize_for_json(obj):
 OUTPUT_DIR = Path(__file__).parent.parent / 'assets' / 'data'
 COMPANIES_FILE = OUTPUT_DIR / 'companies.json'
 
+# Universe fetch concurrency. FETCH_RATE caps how many tickers per second
+# start across all workers combined (each ticker is ~8-10 Yahoo requests).
+FETCH_WORKERS = int(os.environ.get('FETCH_WORKERS', '8'))
+FETCH_RATE = float(os.environ.get('FETCH_RATE', '2'))
+
 
 def load_company_metadata():
     """Load company names, sectors, and IR URLs from reference file."""
@@ -326,10 +345,14 @@ STOCK_UNIVERSE = [
 
 
 def fetch_weekly_data(symbol: str) -> Optional[pd.DataFrame]:
-    """Fetch weekly price data from Yahoo Finance."""
+    """Fetch weekly price data from Yahoo Finance.
+
+    History comes through the local price store (price_store.py), which only
+    asks Yahoo for bars after the stored tail and refetches in full when a
+    split or dividend restatement shows up.
+    """
     try:
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period="max", interval="1wk")
+        df = get_weekly_history(symbol)
         
         if df.empty:
             print(f"  ✗ No data returned for {symbol}")
@@ -678,7 +701,7 @@ def get_health_metrics(ticker: yf.Ticker) -> dict:
         return empty
 
 
-def fetch_fundamental_data(symbol: str) -> dict:
+def fetch_fundamental_data(symbol: str, bundle: Optional[FundamentalsBundle] = None) -> dict:
     """
     Fetch fundamental data for quality screening.
     
@@ -688,9 +711,15 @@ def fetch_fundamental_data(symbol: str) -> dict:
     - Share buyback/dilution tracking
     - Dividend info
     - Free cash flow trend
+
+    Pass the symbol's bundle to share it with other fetches; without one a
+    bundle is opened (and flushed) for this call alone.
     """
+    if bundle is None:
+        with get_bundle(symbol) as bundle:
+            return fetch_fundamental_data(symbol, bundle)
     try:
-        ticker = yf.Ticker(symbol)
+        ticker = bundle
         info = ticker.info
         
         # Basic metrics
@@ -834,7 +863,7 @@ def fetch_fundamental_data(symbol: str) -> dict:
         }
 
 
-def fetch_insider_data(symbol: str) -> dict:
+def fetch_insider_data(symbol: str, bundle: Optional[FundamentalsBundle] = None) -> dict:
     """
     Fetch insider buying data from SEC Form 4 filings via yfinance.
     
@@ -854,8 +883,11 @@ def fetch_insider_data(symbol: str) -> dict:
         'insider_buy_total_12m': 0,
     }
     
+    if bundle is None:
+        with get_bundle(symbol) as bundle:
+            return fetch_insider_data(symbol, bundle)
     try:
-        ticker = yf.Ticker(symbol)
+        ticker = bundle
         
         # Get transaction history
         transactions = ticker.insider_transactions
@@ -1006,93 +1038,56 @@ def find_historical_touches(df: pd.DataFrame, recovery_weeks: int = 2) -> List[d
     - return_1yr: price return 1 year after the episode started
     - ongoing: True if the stock is still in this episode
     """
-    df = df.copy()
-    df['below'] = df['adjusted_close'] < df['WMA_200']
-    
+    close = df['adjusted_close'].to_numpy(dtype=float)
+    below = close < df['WMA_200'].to_numpy(dtype=float)   # NaN line -> False
+    pct = df['pct_from_wma'].to_numpy(dtype=float)
+    n = len(below)
+    if n == 0 or not below.any():
+        return []
+
+    # Run-length encode the above/below series. An episode ends at the first
+    # above-run at least `recovery_weeks` long, so those qualifying runs split
+    # the history into segments; each segment holding a below week is one
+    # episode, starting at its first below week. Shorter bounces stay inside.
+    change = np.flatnonzero(below[1:] != below[:-1]) + 1
+    run_starts = np.concatenate(([0], change))
+    run_ends = np.concatenate((change, [n]))
+    recovered = ~below[run_starts] & (run_ends - run_starts >= recovery_weeks)
+    seg_lo = np.concatenate(([0], run_ends[recovered]))
+    seg_hi = np.concatenate((run_starts[recovered], [n]))
+
+    below_pos = np.flatnonzero(below)
+    first = np.searchsorted(below_pos, seg_lo)
+    has_episode = first < len(below_pos)
+    has_episode[has_episode] = below_pos[first[has_episode]] < seg_hi[has_episode]
+
     touches = []
-    i = 0
-    n = len(df)
-    
-    while i < n:
-        # Scan forward until we find a week that's below the line
-        if not df.iloc[i]['below']:
-            i += 1
-            continue
-        
-        # Found the start of an episode
-        episode_start = i
-        
-        # Now scan forward to find the end of the episode.
-        # The episode ends when we see `recovery_weeks` consecutive
-        # weeks ABOVE the line. Until then, brief bounces above
-        # are still part of this episode.
-        j = i + 1
-        consecutive_above = 0
-        episode_end = None  # will be set to first week of the sustained recovery
-        
-        while j < n:
-            if not df.iloc[j]['below']:
-                consecutive_above += 1
-                if consecutive_above >= recovery_weeks:
-                    # Recovery is real — episode ended at start of this above-streak
-                    episode_end = j - consecutive_above + 1
-                    break
-            else:
-                consecutive_above = 0
-            j += 1
-        
-        # Gather episode data
+    for k in np.flatnonzero(has_episode):
+        episode_start = int(below_pos[first[k]])
+        ongoing = k == len(seg_hi) - 1
+        episode_end = n if ongoing else int(seg_hi[k])
         start_date = df.index[episode_start]
-        
-        if episode_end is not None:
-            # Completed episode
-            episode_data = df.iloc[episode_start:episode_end]
-            weeks_below = len(episode_data)
-            min_pct = episode_data['pct_from_wma'].min()
-            max_depth = abs(min_pct)
-            recovery_date = df.index[episode_end].strftime('%b %Y')
-            
+        max_depth = abs(np.fmin.reduce(pct[episode_start:episode_end]))
+
+        return_1yr = None
+        if not ongoing:
             # 1-year return from episode start
             one_year_later_idx = episode_start + 52
             if one_year_later_idx < n:
-                entry_price = df.iloc[episode_start]['adjusted_close']
-                exit_price = df.iloc[one_year_later_idx]['adjusted_close']
+                entry_price = close[episode_start]
+                exit_price = close[one_year_later_idx]
                 return_1yr = ((exit_price - entry_price) / entry_price) * 100
-            else:
-                return_1yr = None
-            
-            touches.append({
-                'date': start_date.strftime('%b %Y'),
-                'date_iso': start_date.strftime('%Y-%m-%d'),
-                'recovery_date': recovery_date,
-                'weeks_below': int(weeks_below),
-                'max_depth': round(float(max_depth), 1),
-                'return_1yr': round(float(return_1yr), 1) if return_1yr is not None else None,
-                'ongoing': False
-            })
-            
-            # Jump past the episode
-            i = episode_end
-        else:
-            # Ongoing episode (hasn't recovered yet)
-            episode_data = df.iloc[episode_start:]
-            weeks_below = len(episode_data)
-            min_pct = episode_data['pct_from_wma'].min()
-            max_depth = abs(min_pct)
-            
-            touches.append({
-                'date': start_date.strftime('%b %Y'),
-                'date_iso': start_date.strftime('%Y-%m-%d'),
-                'recovery_date': None,
-                'weeks_below': int(weeks_below),
-                'max_depth': round(float(max_depth), 1),
-                'return_1yr': None,
-                'ongoing': True
-            })
-            
-            # We've reached the end of the data
-            break
-    
+
+        touches.append({
+            'date': start_date.strftime('%b %Y'),
+            'date_iso': start_date.strftime('%Y-%m-%d'),
+            'recovery_date': None if ongoing else df.index[episode_end].strftime('%b %Y'),
+            'weeks_below': int(episode_end - episode_start),
+            'max_depth': round(float(max_depth), 1),
+            'return_1yr': round(float(return_1yr), 1) if return_1yr is not None else None,
+            'ongoing': bool(ongoing)
+        })
+
     return touches
 
 
@@ -1112,8 +1107,32 @@ def fetch_spy_monthly() -> pd.Series:
     return series
 
 
+def _period_ordinal(date_iso: str) -> int:
+    """'YYYY-MM-DD' -> monthly Period ordinal (months since 1970-01)."""
+    return (int(date_iso[:4]) - 1970) * 12 + int(date_iso[5:7]) - 1
+
+
+def align_monthly(df: pd.DataFrame, spy_monthly: pd.Series) -> dict:
+    """Month-end closes for the stock and SPY as NumPy arrays, computed once
+    per ticker and shared by both chart builders.
+
+    Months are Period ordinals (months since 1970-01), so touch dates map to
+    positions with searchsorted instead of walking a PeriodIndex.
+    """
+    monthly = df['adjusted_close'].resample('MS').last().dropna()
+    if monthly.index.tz is not None:
+        monthly.index = monthly.index.tz_localize(None)
+    monthly.index = monthly.index.to_period('M')
+    return {
+        'stock_ord': monthly.index.asi8,
+        'stock': monthly.to_numpy(dtype=float),
+        'spy_ord': spy_monthly.index.asi8,
+        'spy': spy_monthly.to_numpy(dtype=float),
+    }
+
+
 def build_growth_chart(df: pd.DataFrame, spy_monthly: pd.Series,
-                       touches: List[dict]) -> Optional[dict]:
+                       touches: List[dict], aligned: Optional[dict] = None) -> Optional[dict]:
     """Build normalized $100 growth chart data for stock vs SPY.
     
     Returns compact dict:
@@ -1123,63 +1142,48 @@ def build_growth_chart(df: pd.DataFrame, spy_monthly: pd.Series,
       t: [36, 182, ...]  monthly indices where touches occurred
     """
     try:
-        # Resample stock to monthly (last close per month)
-        monthly = df['adjusted_close'].resample('MS').last().dropna()
-        if len(monthly) < 12:
+        if aligned is None:
+            aligned = align_monthly(df, spy_monthly)
+        if len(aligned['stock']) < 12:
             return None
         
-        if monthly.index.tz is not None:
-            monthly.index = monthly.index.tz_localize(None)
-        monthly.index = monthly.index.to_period('M')
-        
-        # Find overlapping date range with SPY
-        common_start = max(monthly.index.min(), spy_monthly.index.min())
-        common_end = min(monthly.index.max(), spy_monthly.index.max())
-        
-        stock_aligned = monthly[(monthly.index >= common_start) & (monthly.index <= common_end)]
-        spy_aligned = spy_monthly[(spy_monthly.index >= common_start) & (spy_monthly.index <= common_end)]
-        
         # Use only months present in both
-        common_periods = stock_aligned.index.intersection(spy_aligned.index)
-        if len(common_periods) < 12:
+        common, si, bi = np.intersect1d(aligned['stock_ord'], aligned['spy_ord'],
+                                        return_indices=True)
+        if len(common) < 12:
             return None
         
-        stock_aligned = stock_aligned[common_periods]
-        spy_aligned = spy_aligned[common_periods]
-        
         # Normalize to $100
-        stock_norm = (stock_aligned / stock_aligned.iloc[0]) * 100
-        spy_norm = (spy_aligned / spy_aligned.iloc[0]) * 100
+        stock_aligned = aligned['stock'][si]
+        spy_aligned = aligned['spy'][bi]
+        stock_norm = (stock_aligned / stock_aligned[0]) * 100
+        spy_norm = (spy_aligned / spy_aligned[0]) * 100
         
         # Round to integers for compact JSON
-        stock_values = [int(round(v)) for v in stock_norm.values]
-        spy_values = [int(round(v)) for v in spy_norm.values]
+        stock_values = [int(v) for v in np.rint(stock_norm)]
+        spy_values = [int(v) for v in np.rint(spy_norm)]
         
-        # Map touch dates to monthly indices
-        touch_indices = []
-        period_list = list(common_periods)
+        # Map touch dates to monthly indices (first common month on/after)
+        touch_ords = []
         for touch in touches:
             try:
-                touch_period = pd.Period(touch['date_iso'][:7], freq='M')
-                # Find closest month
-                for idx, p in enumerate(period_list):
-                    if p >= touch_period:
-                        touch_indices.append(idx)
-                        break
-            except (ValueError, KeyError):
+                touch_ords.append(_period_ordinal(touch['date_iso']))
+            except (ValueError, KeyError, TypeError):
                 continue
+        pos = np.searchsorted(common, np.asarray(touch_ords, dtype=np.int64), side='left')
+        touch_indices = [int(i) for i in pos if i < len(common)]
         
         # Total return comparison for prose
-        stock_total_return = round(((stock_norm.iloc[-1] / 100) - 1) * 100, 1)
-        spy_total_return = round(((spy_norm.iloc[-1] / 100) - 1) * 100, 1)
-        years = len(common_periods) / 12
+        stock_total_return = round(((stock_norm[-1] / 100) - 1) * 100, 1)
+        spy_total_return = round(((spy_norm[-1] / 100) - 1) * 100, 1)
+        years = len(common) / 12
         
         # Annualized returns
-        stock_annual = round(((stock_norm.iloc[-1] / 100) ** (1 / years) - 1) * 100, 1) if years > 0 else None
-        spy_annual = round(((spy_norm.iloc[-1] / 100) ** (1 / years) - 1) * 100, 1) if years > 0 else None
+        stock_annual = round(((stock_norm[-1] / 100) ** (1 / years) - 1) * 100, 1) if years > 0 else None
+        spy_annual = round(((spy_norm[-1] / 100) ** (1 / years) - 1) * 100, 1) if years > 0 else None
         
         return {
-            'start': str(common_periods[0]),
+            'start': str(pd.Period(ordinal=int(common[0]), freq='M')),
             's': stock_values,
             'b': spy_values,
             't': touch_indices,
@@ -1197,7 +1201,8 @@ def build_growth_chart(df: pd.DataFrame, spy_monthly: pd.Series,
 
 def build_touch_overlay_chart(df: pd.DataFrame, spy_monthly: pd.Series,
                                touches: List[dict], months: int = 24,
-                               max_chart_episodes: int = 10) -> Optional[dict]:
+                               max_chart_episodes: int = 10,
+                               aligned: Optional[dict] = None) -> Optional[dict]:
     """Build overlaid touch chart: what happened after each 200WMA crossing.
     
     Each touch is normalized to $100 at crossing date.
@@ -1214,95 +1219,91 @@ def build_touch_overlay_chart(df: pd.DataFrame, spy_monthly: pd.Series,
       avg_return_24m, median_return_24m, pct_positive_24m
     """
     try:
-        # Resample stock to monthly
-        monthly = df['adjusted_close'].resample('MS').last().dropna()
-        if len(monthly) < 12:
+        if aligned is None:
+            aligned = align_monthly(df, spy_monthly)
+        stock_ord, stock_px = aligned['stock_ord'], aligned['stock']
+        spy_ord, spy_px = aligned['spy_ord'], aligned['spy']
+        if len(stock_px) < 12:
             return None
-        if monthly.index.tz is not None:
-            monthly.index = monthly.index.tz_localize(None)
-        monthly.index = monthly.index.to_period('M')
         
+        width = months + 1
         episodes = []
-        all_stock_arrays = []
-        all_spy_arrays = []
+        stock_rows = []
+        spy_rows = []
         
         for touch in touches:
             try:
-                start_period = pd.Period(touch['date_iso'][:7], freq='M')
-            except (ValueError, KeyError):
+                start = _period_ordinal(touch['date_iso'])
+            except (ValueError, KeyError, TypeError):
                 continue
             
-            # Get up to months+1 data points starting from touch month
-            stock_slice = monthly[monthly.index >= start_period].head(months + 1)
-            spy_slice = spy_monthly[spy_monthly.index >= start_period].head(months + 1)
-            
-            if len(stock_slice) < 3 or len(spy_slice) < 3:
+            # Up to months+1 points from the touch month in each series,
+            # then the months present in both
+            s0 = np.searchsorted(stock_ord, start)
+            b0 = np.searchsorted(spy_ord, start)
+            if len(stock_ord) - s0 < 3 or len(spy_ord) - b0 < 3:
                 continue
-            
-            # Align to common periods
-            common = stock_slice.index.intersection(spy_slice.index)
-            if len(common) < 3:
+            _, si, bi = np.intersect1d(stock_ord[s0:s0 + width], spy_ord[b0:b0 + width],
+                                       return_indices=True)
+            if len(si) < 3:
                 continue
             
-            stock_vals = stock_slice[common]
-            spy_vals = spy_slice[common]
+            stock_vals = stock_px[s0 + si]
+            spy_vals = spy_px[b0 + bi]
             
             # Normalize to $100
-            stock_norm = [int(round((v / stock_vals.iloc[0]) * 100))
-                          for v in stock_vals.values]
-            spy_norm = [int(round((v / spy_vals.iloc[0]) * 100))
-                        for v in spy_vals.values]
+            stock_norm = np.rint((stock_vals / stock_vals[0]) * 100)
+            spy_norm = np.rint((spy_vals / spy_vals[0]) * 100)
             
-            ep = {
+            episodes.append({
                 'date': touch['date'],
-                's': stock_norm,
+                's': [int(v) for v in stock_norm],
                 'months': len(stock_norm) - 1,
-            }
-            episodes.append(ep)
-            all_stock_arrays.append(stock_norm)
-            all_spy_arrays.append(spy_norm)
+            })
+            stock_rows.append(stock_norm)
+            spy_rows.append(spy_norm)
         
         if not episodes:
             return None
         
-        # Average lines across all episodes (handles varying lengths)
-        max_len = min(months + 1, max(len(a) for a in all_stock_arrays))
+        # Episodes x months, NaN-padded where an episode has fewer months
+        def as_matrix(rows):
+            m = np.full((len(rows), width), np.nan)
+            for k, r in enumerate(rows):
+                m[k, :len(r)] = r
+            return m
         
-        def avg_line(arrays, length):
-            result = []
-            for i in range(length):
-                vals = [a[i] for a in arrays if i < len(a)]
-                if vals:
-                    result.append(int(round(sum(vals) / len(vals))))
-            return result
+        stock_m = as_matrix(stock_rows)
+        spy_m = as_matrix(spy_rows)
         
-        stock_avg = avg_line(all_stock_arrays, max_len)
-        spy_avg = avg_line(all_spy_arrays, max_len)
+        # Average lines across all episodes (handles varying lengths)
+        max_len = min(width, max(len(r) for r in stock_rows))
         
-        # Stats at 12-month and 24-month marks across ALL episodes
-        def get_returns_at(arrays, month_idx):
-            """Get return (value - 100) at a given month index."""
-            return [a[month_idx] - 100 for a in arrays if len(a) > month_idx]
+        def avg_line(m, length):
+            counts = np.sum(~np.isnan(m[:, :length]), axis=0)
+            sums = np.nansum(m[:, :length], axis=0)
+            return [int(v) for v in np.rint(sums[counts > 0] / counts[counts > 0])]
         
-        returns_12m = get_returns_at(all_stock_arrays, 12)
-        returns_24m = get_returns_at(all_stock_arrays, 24)
-        spy_returns_12m = get_returns_at(all_spy_arrays, 12)
-        spy_returns_24m = get_returns_at(all_spy_arrays, 24)
+        stock_avg = avg_line(stock_m, max_len)
+        spy_avg = avg_line(spy_m, max_len)
         
-        def stat_block(returns):
-            if not returns:
+        # Stats at 12-month and 24-month marks across ALL episodes
+        def stat_block(m, month_idx):
+            """Return stats of (value - 100) at a given month index."""
+            col = m[:, month_idx] if month_idx < width else np.empty(0)
+            r = np.sort(col[~np.isnan(col)]) - 100
+            if len(r) == 0:
                 return {'avg': None, 'median': None, 'pct_positive': None}
-            s = sorted(returns)
             return {
-                'avg': round(sum(s) / len(s), 1),
-                'median': round(s[len(s) // 2], 1),
-                'pct_positive': round(sum(1 for r in s if r > 0) / len(s) * 100, 0),
+                'avg': round(float(r.sum()) / len(r), 1),
+                'median': int(r[len(r) // 2]),
+                'pct_positive': round(int(np.count_nonzero(r > 0)) / len(r) * 100, 0),
             }
         
-        stats_12m = stat_block(returns_12m)
-        stats_24m = stat_block(returns_24m)
-        spy_stats_12m = stat_block(spy_returns_12m)
-        spy_stats_24m = stat_block(spy_returns_24m)
+        stats_12m = stat_block(stock_m, 12)
+        stats_24m = stat_block(stock_m, 24)
+        spy_stats_12m = stat_block(spy_m, 12)
+        spy_stats_24m = stat_block(spy_m, 24)
         
         # Cap chart episodes to most recent N
         shown = episodes[-max_chart_episodes:] if len(episodes) > max_chart_episodes else episodes
@@ -1329,19 +1330,8 @@ def build_touch_overlay_chart(df: pd.DataFrame, spy_monthly: pd.Series,
         return None
 
 
-def calculate_stock_signals(symbol: str, spy_monthly: pd.Series = None) -> Optional[dict]:
-    """Calculate all signals for a stock including quality metrics."""
-    print(f"  Processing {symbol}...")
-    
-    df = fetch_weekly_data(symbol)
-    if df is None:
-        return None
-    
-    if len(df) < 200:
-        print(f"  ✗ {symbol}: Only {len(df)} weeks of data (need 200+)")
-        if len(df) < 50:
-            return None
-    
+def add_weekly_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the 200WMA, RSI and volume columns in place; returns df."""
     df['WMA_200'] = df['adjusted_close'].rolling(window=200, min_periods=50).mean()
     df['pct_from_wma'] = ((df['adjusted_close'] - df['WMA_200']) / df['WMA_200']) * 100
     df['wow_change'] = df['pct_from_wma'] - df['pct_from_wma'].shift(1)
@@ -1354,6 +1344,33 @@ def calculate_stock_signals(symbol: str, spy_monthly: pd.Series = None) -> Optio
     
     # Accumulation Ratio: avg volume on up-weeks / avg volume on down-weeks (14-week window)
     df['week_green'] = df['close'] > df['close'].shift(1)  # Close > prior week's close
+    return df
+
+
+def calculate_stock_signals(symbol: str, spy_monthly: pd.Series = None,
+                            df: Optional[pd.DataFrame] = None,
+                            fundamentals: Optional[dict] = None,
+                            insider: Optional[dict] = None) -> Optional[dict]:
+    """Calculate all signals for a stock including quality metrics.
+
+    df / fundamentals / insider are fetched from Yahoo unless passed in
+    (bench_pipeline.py replays recorded fixtures this way, offline).
+    """
+    print(f"  Processing {symbol}...")
+    
+    if df is None:
+        df = fetch_weekly_data(symbol)
+        if df is None:
+            return None
+    else:
+        df = df.copy()
+    
+    if len(df) < 200:
+        print(f"  ✗ {symbol}: Only {len(df)} weeks of data (need 200+)")
+        if len(df) < 50:
+            return None
+    
+    add_weekly_indicators(df)
     
     df_complete = df.dropna(subset=['WMA_200'])
     if len(df_complete) == 0:
@@ -1366,9 +1383,11 @@ def calculate_stock_signals(symbol: str, spy_monthly: pd.Series = None) -> Optio
     growth_chart = None
     touch_chart = None
     if spy_monthly is not None and not spy_monthly.empty:
-        growth_chart = build_growth_chart(df_complete, spy_monthly, historical_touches)
+        aligned = align_monthly(df_complete, spy_monthly)
+        growth_chart = build_growth_chart(df_complete, spy_monthly, historical_touches, aligned)
         if historical_touches:
-            touch_chart = build_touch_overlay_chart(df_complete, spy_monthly, historical_touches)
+            touch_chart = build_touch_overlay_chart(df_complete, spy_monthly, historical_touches,
+                                                    aligned=aligned)
     
     # Add return_to_now for each historical touch
     current_price = float(df_complete.iloc[-1]['adjusted_close'])
@@ -1388,8 +1407,13 @@ def calculate_stock_signals(symbol: str, spy_monthly: pd.Series = None) -> Optio
         except Exception:
             touch['return_to_now'] = None
     
-    fundamentals = fetch_fundamental_data(symbol)
-    insider = fetch_insider_data(symbol)
+    if fundamentals is None or insider is None:
+        # One bundle for both, written to disk once for the symbol.
+        with get_bundle(symbol) as bundle:
+            if fundamentals is None:
+                fundamentals = fetch_fundamental_data(symbol, bundle)
+            if insider is None:
+                insider = fetch_insider_data(symbol, bundle)
 
     # Bean Score-adjacent dislocation signals (per-stock portion; the
     # cross-sectional fields are filled in a post-pass in main()).
@@ -1561,7 +1585,7 @@ def _slim_stock(stock: dict) -> dict:
     approaching, rsi_14, avg_return_after_touch). Dropping the chart/history
     data from summary lists saves ~9 MB in stocks.json.
     """
-    heavy_fields = {'growth_chart', 'touch_chart', 'health_chart', 'historical_touches', 'insider_buys'}
+    heavy_fields = set(stocks_store.DETAIL_FIELDS) | {'historical_touches'}
     return {k: v for k, v in stock.items() if k not in heavy_fields}
 
 
@@ -1781,6 +1805,87 @@ description: "Weekly updates on stocks crossing their 200-week moving average."
     return post_file
 
 
+def load_previous_records(path: Path) -> dict:
+    """symbol -> the previous run's full record (index entry plus its detail
+    shard), or {} when there is no previous stocks.json."""
+    if not path.exists():
+        return {}
+    previous = stocks_store.load_stocks(path, with_details=True)
+    return {s['symbol']: s for s in previous.get('stocks', [])}
+
+
+def carry_forward_stale(all_stocks: list, errors: list, previous: dict) -> list:
+    """Append the previous record, flagged stale, for every symbol in
+    `errors` that has one and is not already in `all_stocks`. Returns the
+    symbols carried."""
+    current = {s['symbol'] for s in all_stocks}
+    carried = []
+    for symbol in errors:
+        rec = previous.get(symbol)
+        if rec and symbol not in current:
+            rec = dict(rec)
+            rec['stale'] = True
+            rec.setdefault('stale_since', time.strftime('%Y-%m-%d'))
+            all_stocks.append(rec)
+            carried.append(symbol)
+    return carried
+
+
+def rescore_stocks(symbols: List[str], output_file: Path = OUTPUT_DIR / 'stocks.json') -> list:
+    """Re-fetch `symbols` and write them into the existing stocks.json.
+
+    Each fresh record is merged over the symbol's last full record, so fields
+    added by later passes (Bean Score data, split flags) survive. Sector and
+    insider context come from the distributions the last weekly run saved;
+    without them the re-scored records are ranked against the whole file.
+    Returns the symbols re-scored.
+    """
+    if not output_file.exists():
+        print(f"  ✗ No {output_file.name} to re-score into; run the weekly pipeline first")
+        return []
+    current = stocks_store.load_stocks(output_file, with_details=True)
+    previous = {s['symbol']: s for s in current.get('stocks', [])}
+    company_metadata = load_company_metadata()
+    spy_monthly = fetch_spy_monthly()
+
+    fresh = []
+    for symbol in symbols:
+        try:
+            result = retry_on_rate_limit(calculate_stock_signals, symbol, spy_monthly=spy_monthly)
+        except Exception as e:
+            print(f"  ✗ {symbol}: Unexpected error - {e}")
+            result = None
+        if not result:
+            print(f"  ✗ {symbol}: record left as it was")
+            continue
+        meta = company_metadata.get(symbol, {})
+        result['name'] = meta.get('name', '')
+        result['sector'] = meta.get('sector', '')
+        result['ir_url'] = meta.get('ir_url', '')
+        record = {**previous.get(symbol, {}), **result}
+        record.pop('stale', None)
+        record.pop('stale_since', None)
+        fresh.append(record)
+    if not fresh:
+        return []
+
+    stats = load_cross_sectional_stats()
+    rescored = {s['symbol'] for s in fresh}
+    all_stocks = [s for sym, s in previous.items() if sym not in rescored] + fresh
+    if stats is None:
+        print("  ⚠ No saved dislocation stats; scoring against the current stocks.json")
+        apply_cross_sectional_dislocation(all_stocks)
+    else:
+        apply_cross_sectional_dislocation(fresh, stats=stats)
+    all_stocks.sort(key=lambda x: x['pct_from_wma'])
+
+    # Still the weekly run's file: keep its generated date.
+    output = {**current, 'summary': generate_landing_page_data(all_stocks), 'stocks': all_stocks}
+    stocks_store.rewrite_stocks(output, output_file)
+    print(f"  ✓ Re-scored {len(fresh)}: " + ", ".join(sorted(rescored)))
+    return [s['symbol'] for s in fresh]
+
+
 def main():
     """Main pipeline."""
     print("=" * 60)
@@ -1802,54 +1907,60 @@ def main():
     all_stocks = []
     errors = []
     
+    # Fetch the universe on a bounded thread pool. One shared token bucket
+    # caps the ticker start rate across all workers (this replaces the old
+    # fixed pause every 50 symbols); retry_on_rate_limit still wraps each
+    # ticker so a 429 only backs off that one symbol. Outcomes come back in
+    # STOCK_UNIVERSE order so stocks.json stays stable week to week.
     total = len(STOCK_UNIVERSE)
-    for i, symbol in enumerate(STOCK_UNIVERSE):
-        print(f"\n[{i+1}/{total}]", end="")
-
-        # Batch pause every 50 tickers to avoid rate limits
-        if i > 0 and i % 50 == 0:
-            pause = 5 + random.uniform(0, 3)
-            print(f"\n  -- Batch pause ({pause:.0f}s) --")
-            time.sleep(pause)
-
-        try:
-            result = retry_on_rate_limit(
-                calculate_stock_signals, symbol, spy_monthly=spy_monthly
-            )
-            if result:
-                # Merge company metadata (name, sector, ir_url)
-                meta = company_metadata.get(symbol, {})
-                result['name'] = meta.get('name', '')
-                result['sector'] = meta.get('sector', '')
-                result['ir_url'] = meta.get('ir_url', '')
-                all_stocks.append(result)
-            else:
-                errors.append(symbol)
-        except Exception as e:
-            print(f"  ✗ {symbol}: Unexpected error - {e}")
+    limiter = TokenBucket(rate=FETCH_RATE, burst=FETCH_WORKERS)
+    print(f"\nFetching {total} tickers ({FETCH_WORKERS} workers, {FETCH_RATE:g} tickers/s)")
+    fetch_start = time.time()
+    done = [0]
+
+    def _progress(i, symbol, result, error):
+        done[0] += 1
+        if done[0] % 50 == 0 or done[0] == total:
+            elapsed = time.time() - fetch_start
+            print(f"\n  -- [{done[0]}/{total}] fetched in {elapsed:.0f}s --")
+
+    outcomes = run_bounded(
+        lambda symbol: retry_on_rate_limit(
+            calculate_stock_signals, symbol, spy_monthly=spy_monthly
+        ),
+        STOCK_UNIVERSE,
+        workers=FETCH_WORKERS,
+        limiter=limiter,
+        on_done=_progress,
+    )
+
+    for symbol, (result, error) in zip(STOCK_UNIVERSE, outcomes):
+        if error is not None:
+            print(f"  ✗ {symbol}: Unexpected error - {error}")
             errors.append(symbol)
+        elif result:
+            # Merge company metadata (name, sector, ir_url)
+            meta = company_metadata.get(symbol, {})
+            result['name'] = meta.get('name', '')
+            result['sector'] = meta.get('sector', '')
+            result['ir_url'] = meta.get('ir_url', '')
+            all_stocks.append(result)
+        else:
+            errors.append(symbol)
+
+    fundamentals_schedule.print_summary()
 
     # Carry forward last-known records for tickers that failed this run, so a
     # transient fetch failure (or a Yahoo history reset after a corporate
     # action) cannot silently remove a stock from the site. Carried records
     # are flagged stale and refresh automatically the first week the fetch
     # succeeds again.
+    # The previous run's records are read with their detail shards joined
+    # back in, so a carried record keeps its charts when it is split again.
+    _prev_full = {}
     try:
-        _prev_full = {}
-        _pf = OUTPUT_DIR / 'stocks.json'
-        if _pf.exists():
-            with open(_pf) as _fh:
-                _prev_full = {s['symbol']: s for s in json.load(_fh).get('stocks', [])}
-        _cur_syms = {s['symbol'] for s in all_stocks}
-        _carried = []
-        for _sym in errors:
-            _rec = _prev_full.get(_sym)
-            if _rec and _sym not in _cur_syms:
-                _rec = dict(_rec)
-                _rec['stale'] = True
-                _rec.setdefault('stale_since', time.strftime('%Y-%m-%d'))
-                all_stocks.append(_rec)
-                _carried.append(_sym)
+        _prev_full = load_previous_records(OUTPUT_DIR / 'stocks.json')
+        _carried = carry_forward_stale(all_stocks, errors, _prev_full)
         if _carried:
             print(f"\n  Carried forward {len(_carried)} stale records: " + ", ".join(sorted(_carried)))
     except Exception as e:
@@ -1878,9 +1989,9 @@ def main():
     # real decline of the same size drags the line with it, because the new bar
     # enters the mean. Monster on 15 Aug 2026: price -48.2%, line +0.02%.
     # Leslie's the same week: price -45.3%, line -1.53%, and that one was real.
+    # Thresholds live in price_store.split_signature, which the price store
+    # also uses to decide when a ticker's stored history needs a full refetch.
     try:
-        _CRASH = -0.35       # weekly move beyond which a flat line is suspect
-        _FLAT = 0.005        # line movement small enough to call unmoved
         flagged = []
         for s in all_stocks:
             prev = _prev_full.get(s['symbol'])
@@ -1888,12 +1999,9 @@ def main():
                 continue
             pc, cc = prev.get('close'), s.get('close')
             pw, cw = prev.get('wma_200'), s.get('wma_200')
-            if not (pc and cc and pw and cw) or pc <= 0 or pw <= 0:
-                continue
-            px_chg = cc / pc - 1
-            line_chg = abs(cw / pw - 1)
-            if px_chg <= _CRASH and line_chg < _FLAT:
-                implied = pc / cc
+            sig = split_signature(pc, cc, pw, cw)
+            if sig:
+                px_chg, line_chg, implied = sig
                 s['suspect_split'] = True
                 s['suspect_split_note'] = (
                     f"price {px_chg * 100:+.1f}% with the 200-week line unmoved "
@@ -1917,9 +2025,11 @@ def main():
 
     # Cross-sectional dislocation scores (sector-relative z, insider
     # intensity percentile, signal stack). Needs sector metadata, which was
-    # merged above. Mutates stocks in place; never fatal.
+    # merged above. Mutates stocks in place; never fatal. The universe
+    # distributions are saved so partial re-scores can reuse them.
     try:
-        apply_cross_sectional_dislocation(all_stocks)
+        disl_stats = apply_cross_sectional_dislocation(all_stocks)
+        save_cross_sectional_stats(disl_stats)
         stacked = sum(1 for s in all_stocks
                       if (s.get('dislocation') or {}).get('dislocation_stack', 0) >= 2)
         print(f"\n  Dislocation scores computed; {stacked} stocks with 2+ stacked signals")
@@ -1936,8 +2046,11 @@ def main():
     }
     
     output_file = OUTPUT_DIR / 'stocks.json'
-    with open(output_file, 'w') as f:
-        json.dump(sanitize_for_json(output), f, separators=(',', ':'), cls=NumpyEncoder)
+    stats = stocks_store.write_stocks(output, output_file)
+    if not stocks_store.legacy_format():
+        print(f"\n  💾 Wrote stocks.json index + detail shards "
+              f"({stats['shards_written']} written, {stats['shards_unchanged']} unchanged, "
+              f"{stats['shards_removed']} removed)")
 
     # Read flags early so we can gate the baseline snapshot below
     skip_blog = os.environ.get('SKIP_BLOG', 'false').lower() == 'true'
@@ -1972,8 +2085,9 @@ def main():
     # report to miss stocks that crossed earlier in the week.
     if not skip_blog:
         baseline_file = OUTPUT_DIR / 'stocks_baseline.json'
-        with open(baseline_file, 'w') as f:
-            json.dump(sanitize_for_json(output), f, separators=(',', ':'), cls=NumpyEncoder)
+        # Same bytes as the stocks.json written above (crossing detection
+        # only reads index fields); nothing is encoded twice.
+        stocks_store.copy_index(baseline_file, output_file)
         print(f"  📊 Updated stocks_baseline.json ({len(all_stocks)} stocks)")
 
     # ── Write crossings.json for the email workflow ──
@@ -2047,9 +2161,9 @@ def main():
             'generated_readable': datetime.now().strftime('%B %d, %Y'),
             'generated_iso': datetime.now().strftime('%Y-%m-%d')
         }
-        with open(output_file, 'w') as f:
-            json.dump(sanitize_for_json(output), f, separators=(',', ':'), cls=NumpyEncoder)
-        print(f"  🫘 Re-wrote stocks.json with Bean Score data")
+        stats = stocks_store.write_stocks(output, output_file)
+        print(f"  🫘 Re-wrote stocks.json with Bean Score data "
+              f"({stats['shards_written']} detail shards changed)")
     except Exception as e:
         print(f"  🫘 Bean Score levels error (non-fatal): {e}")
 
@@ -2077,4 +2191,11 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    ap = argparse.ArgumentParser(description='Below The Line weekly stock pipeline')
+    ap.add_argument('--rescore', nargs='+', metavar='SYMBOL',
+                    help='re-score just these tickers against the saved weekly stats')
+    args = ap.parse_args()
+    if args.rescore:
+        rescore_stocks([s.upper() for s in args.rescore])
+    else:
+        main()